@@ -1,13 +1,9 @@
-from typing import TypeAlias, Union
+from __future__ import annotations
 
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from pptx.shapes.autoshape import Shape as AutoShape
-from pptx.shapes.base import BaseShape
-from pptx.shapes.connector import Connector
-from pptx.shapes.graphfrm import GraphicFrame
-from pptx.shapes.group import GroupShape
-from pptx.shapes.picture import Movie, Picture
-from pptx.shapes.placeholder import BasePlaceholder
+from functools import cache
+from typing import TYPE_CHECKING, Iterable, TypeAlias, Union
+
+from aesthetic_code.shape_types import Shape
 
 from .shape_extractors import (
     BaseAutoShapeExtractor,
@@ -21,6 +17,9 @@ from .shape_extractors import (
     PlaceholderExtractor,
 )
 
+if TYPE_CHECKING:
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
 ShapeExtractor: TypeAlias = Union[
     BaseShapeExtractor,
     BaseAutoShapeExtractor,
@@ -32,44 +31,112 @@ ShapeExtractor: TypeAlias = Union[
     PlaceholderExtractor,
 ]
 
-Shape: TypeAlias = Union[
-    BaseShape,
-    AutoShape,
-    Connector,
-    GraphicFrame,
-    GroupShape,
-    Picture,
-    Movie,
-    BasePlaceholder,
-]
 
-SHAPE_EXTRACTOR_MAP = {
-    # Auto Shape
-    MSO_SHAPE_TYPE.AUTO_SHAPE: BaseAutoShapeExtractor,
-    MSO_SHAPE_TYPE.TEXT_BOX: BaseAutoShapeExtractor,
-    MSO_SHAPE_TYPE.FREEFORM: FreeformExtractor,
-    MSO_SHAPE_TYPE.PLACEHOLDER: PlaceholderExtractor,
-    # Graphic Frame
-    MSO_SHAPE_TYPE.CHART: GraphicFrameExtractor,
-    MSO_SHAPE_TYPE.TABLE: GraphicFrameExtractor,
-    MSO_SHAPE_TYPE.LINKED_OLE_OBJECT: GraphicFrameExtractor,
-    MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT: GraphicFrameExtractor,
-    # Picture
-    MSO_SHAPE_TYPE.PICTURE: PictureExtractor,
-    MSO_SHAPE_TYPE.MEDIA: MovieExtractor,
-    # Connector
-    MSO_SHAPE_TYPE.LINE: ConnectorExtractor,
-    # Group Shape
-    MSO_SHAPE_TYPE.GROUP: GroupShapeExtractor,
-}
+@cache
+def get_shape_extractor_map() -> dict:
+    """
+    Maps MSO_SHAPE_TYPE members to extractor classes. Built on first use so that
+    importing the extractors does not import python-pptx.
+    """
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+    return {
+        # Auto Shape
+        MSO_SHAPE_TYPE.AUTO_SHAPE: BaseAutoShapeExtractor,
+        MSO_SHAPE_TYPE.TEXT_BOX: BaseAutoShapeExtractor,
+        MSO_SHAPE_TYPE.FREEFORM: FreeformExtractor,
+        MSO_SHAPE_TYPE.PLACEHOLDER: PlaceholderExtractor,
+        # Graphic Frame
+        MSO_SHAPE_TYPE.CHART: GraphicFrameExtractor,
+        MSO_SHAPE_TYPE.TABLE: GraphicFrameExtractor,
+        MSO_SHAPE_TYPE.LINKED_OLE_OBJECT: GraphicFrameExtractor,
+        MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT: GraphicFrameExtractor,
+        # Picture
+        MSO_SHAPE_TYPE.PICTURE: PictureExtractor,
+        MSO_SHAPE_TYPE.MEDIA: MovieExtractor,
+        # Connector
+        MSO_SHAPE_TYPE.LINE: ConnectorExtractor,
+        # Group Shape
+        MSO_SHAPE_TYPE.GROUP: GroupShapeExtractor,
+    }
+
 
 DEFAULT_EXTRACTOR = BaseShapeExtractor
 
+# Shape classes whose `shape_type` does not depend on the shape, mapped to it
+_class_shape_types: dict[type, MSO_SHAPE_TYPE | None] = {}
+
+
+@cache
+def _xml_dependent_shape_types() -> tuple:
+    """
+    The `shape_type` properties that inspect the shape's XML: auto shapes can be
+    freeforms, text boxes or placeholders, graphic frames charts, tables or OLE
+    objects. Every other class returns the same type for all its instances.
+    """
+    from pptx.shapes.autoshape import Shape as AutoShape
+    from pptx.shapes.graphfrm import GraphicFrame
+
+    return (AutoShape.shape_type, GraphicFrame.shape_type)
+
+
+def resolve_shape_type(shape: Shape) -> MSO_SHAPE_TYPE | None:
+    """
+    Returns the shape type of a shape, read once per class for the classes
+    whose type is fixed and from the XML only for the others.
+    """
+    shape_class = type(shape)
+    if shape_class in _class_shape_types:
+        return _class_shape_types[shape_class]
+    shape_type = shape.shape_type
+    if getattr(shape_class, "shape_type", None) not in _xml_dependent_shape_types():
+        _class_shape_types[shape_class] = shape_type
+    return shape_type
+
 
 def shape_extractor_factory(
     shape: Shape, measurement_unit: str = "pt"
 ) -> ShapeExtractor:
     """Factory function to create a shape extractor based on the shape type."""
-    shape_type = shape.shape_type
-    extractor = SHAPE_EXTRACTOR_MAP.get(shape_type, DEFAULT_EXTRACTOR)
-    return extractor(shape, measurement_unit)
+    shape_type = resolve_shape_type(shape)
+    extractor = get_shape_extractor_map().get(shape_type, DEFAULT_EXTRACTOR)
+    return extractor(shape, measurement_unit).bind(shape, shape_type)
+
+
+class ShapeExtractorDispatcher:
+    """
+    Extracts many shapes with one extractor instance per extractor class,
+    rebound to each shape in turn, instead of a new extractor per shape.
+
+    The extractor returned by `extractor_for` is only valid until the next call.
+    """
+
+    def __init__(self, measurement_unit: str = "pt"):
+        self._measurement_unit = measurement_unit
+        self._extractors: dict[type, ShapeExtractor] = {}
+
+    def extractor_for(self, shape: Shape) -> ShapeExtractor:
+        shape_type = resolve_shape_type(shape)
+        extractor_class = get_shape_extractor_map().get(shape_type, DEFAULT_EXTRACTOR)
+        extractor = self._extractors.get(extractor_class)
+        if extractor is None:
+            extractor = extractor_class(shape, self._measurement_unit)
+            self._extractors[extractor_class] = extractor
+        return extractor.bind(shape, shape_type)
+
+    def extract_many(self, shapes: Iterable[Shape]) -> list[dict]:
+        return [self.extractor_for(shape).extract_shape() for shape in shapes]
+
+
+def extract_many(shapes: Iterable[Shape], measurement_unit: str = "pt") -> list[dict]:
+    """
+    Extracts the data of every shape, as `extract_shape` on each shape's
+    extractor would.
+    """
+    return ShapeExtractorDispatcher(measurement_unit).extract_many(shapes)
+
+
+def __getattr__(name: str):
+    if name == "SHAPE_EXTRACTOR_MAP":
+        return get_shape_extractor_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
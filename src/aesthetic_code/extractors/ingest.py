@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import zipfile
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import IO, TYPE_CHECKING, Iterator, NamedTuple, TypeAlias, Union, cast
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+
+
+class SharedDeckHandle(NamedTuple):
+    """
+    Picklable reference to a deck placed in shared memory by `SharedDeck`.
+    The size is kept because shared memory blocks are rounded up to whole pages.
+    """
+
+    name: str
+    size: int
+
+
+# Package members holding image, audio and video bytes, plus embedded documents
+MEDIA_PREFIXES = ("ppt/media/", "ppt/embeddings/")
+
+DeckSource: TypeAlias = Union[str, bytes, bytearray, memoryview, SharedDeckHandle]
+
+
+class MemoryViewReader(io.RawIOBase):
+    """
+    Seekable, read-only file object over a buffer, for handing a deck held in
+    memory to zipfile without first copying it into a BytesIO.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        size = min(len(target), len(self._view) - self._position)
+        if size <= 0:
+            return 0
+        target[:size] = self._view[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            # Lets the owner of the buffer (e.g. a SharedMemory block) close it
+            self._view.release()
+        super().close()
+
+
+class SharedDeck:
+    """
+    Copies a deck into a shared memory block once, so that any number of worker
+    processes can parse it from the `handle` without receiving their own copy.
+    The creator owns the block and unlinks it on `close`.
+
+    Usage:
+        with SharedDeck(deck) as shared_deck:
+            executor.submit(score_slides, shared_deck.handle, slide_indices)
+    """
+
+    def __init__(self, deck: bytes | bytearray | memoryview):
+        view = memoryview(deck).cast("B")
+        shared_memory = SharedMemory(create=True, size=max(len(view), 1))
+        shared_memory.buf[: len(view)] = view  # type: ignore[index]
+        self._shared_memory: SharedMemory | None = shared_memory
+        self.handle = SharedDeckHandle(shared_memory.name, len(view))
+
+    def __enter__(self) -> SharedDeck:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._shared_memory is None:
+            return
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+        self._shared_memory = None
+
+
+@contextmanager
+def _deck_file(source: DeckSource) -> Iterator[str | IO[bytes]]:
+    """
+    Yields the path or an in-place file object for a deck source.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+    if not isinstance(source, SharedDeckHandle):
+        with MemoryViewReader(source) as reader:
+            yield cast(IO[bytes], reader)
+        return
+
+    shared_memory = SharedMemory(name=source.name)
+    view = shared_memory.buf[: source.size]  # type: ignore[index]
+    try:
+        with MemoryViewReader(view) as reader:
+            yield cast(IO[bytes], reader)
+    finally:
+        view.release()
+        shared_memory.close()
+
+
+def is_media_member(name: str) -> bool:
+    return name.startswith(MEDIA_PREFIXES)
+
+
+def strip_media(deck_file: str | IO[bytes]) -> bytes:
+    """
+    Returns a copy of a .pptx package whose media members are empty.
+
+    Media members are skipped without being decompressed. The other members
+    are stored uncompressed, as they are decompressed on opening anyway.
+    """
+    output = io.BytesIO()
+    with (
+        zipfile.ZipFile(deck_file) as source,
+        zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as target,
+    ):
+        for info in source.infolist():
+            data = b"" if is_media_member(info.filename) else source.read(info)
+            target.writestr(info.filename, data)
+    return output.getvalue()
+
+
+def hash_media(
+    deck_file: str | IO[bytes], chunk_size: int = 1024 * 1024
+) -> dict[str, str]:
+    """
+    Returns the SHA-256 of every media member, keyed by partname (as in the
+    "media_partname" of extracted pictures and movies). Members are hashed as
+    they are decompressed, so at most one chunk is held in memory.
+    """
+    hashes = {}
+    with zipfile.ZipFile(deck_file) as source:
+        for info in source.infolist():
+            if not is_media_member(info.filename):
+                continue
+            digest = hashlib.sha256()
+            with source.open(info) as member:
+                while chunk := member.read(chunk_size):
+                    digest.update(chunk)
+            hashes[f"/{info.filename}"] = digest.hexdigest()
+    return hashes
+
+
+def open_presentation(source: DeckSource, skip_media: bool = False) -> Presentation:
+    """
+    Opens a deck from a file path, from the bytes of a .pptx file or from a
+    `SharedDeckHandle`, reading in-memory decks in place.
+
+    python-pptx reads every part when the deck is opened, so the buffer is no
+    longer needed once this returns and shared memory is detached right away.
+    With `skip_media`, media parts are loaded empty: geometry, names and media
+    partnames can still be extracted, but image and video bytes cannot.
+    """
+    from pptx import Presentation
+
+    with _deck_file(source) as deck_file:
+        if skip_media:
+            with MemoryViewReader(strip_media(deck_file)) as reader:
+                return Presentation(reader)  # type: ignore[arg-type]
+        return Presentation(deck_file)
+
+
+def media_hashes(source: DeckSource, chunk_size: int = 1024 * 1024) -> dict[str, str]:
+    """
+    `hash_media` for any deck source, to deduplicate images across decks opened
+    with `skip_media`.
+    """
+    with _deck_file(source) as deck_file:
+        return hash_media(deck_file, chunk_size)
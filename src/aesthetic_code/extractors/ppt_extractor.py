@@ -1,14 +1,36 @@
-from pptx.presentation import Presentation
-from pptx.slide import Slide
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from aesthetic_code.segmenter.fingerprint import layout_fingerprint
 from aesthetic_code.utils import unit_conversion
 
-from .factories import shape_extractor_factory
+from .factories import ShapeExtractorDispatcher
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+    from pptx.slide import Slide
 
 
 class SlideShapeExtractor:
-    def __init__(self, slide: Slide):
+    def __init__(
+        self,
+        slide: Slide,
+        measurement_unit: str = "pt",
+        dispatcher: ShapeExtractorDispatcher | None = None,
+    ):
+        """
+        Args:
+            dispatcher (ShapeExtractorDispatcher | None): shares extractors
+                across slides, see `PowerPointShapeExtractor`.
+        """
         self._slide = slide
+        self._measurement_unit = measurement_unit
+        self._dispatcher = (
+            ShapeExtractorDispatcher(measurement_unit)
+            if dispatcher is None
+            else dispatcher
+        )
 
     def extract_slide_metadate(self) -> dict:
         return {
@@ -17,14 +39,10 @@ class SlideShapeExtractor:
         }
 
     def extract_shapes(self) -> list:
-        shapes = []
-        for shape in self._slide.shapes:
-            shapes.append(self._extract_shape(shape))
-        return shapes
+        return self._dispatcher.extract_many(self._slide.shapes)
 
     def _extract_shape(self, shape) -> dict:
-        extractor = shape_extractor_factory(shape)
-        return extractor.extract_shape()
+        return self._dispatcher.extractor_for(shape).extract_shape()
 
     def extract_slide(self) -> dict:
         slide_data = self.extract_slide_metadate()
@@ -50,10 +68,24 @@ class PowerPointShapeExtractor:
         }
 
     def extract_slides(self) -> list:
+        slide_width = self.extract_slide_width()
+        slide_height = self.extract_slide_height()
+        dispatcher = ShapeExtractorDispatcher(self._measurement_unit)
         slides = []
         for slide in self._ppt.slides:
-            slide_extractor = SlideShapeExtractor(slide)
-            slides.append(slide_extractor.extract_slide())
+            slide_extractor = SlideShapeExtractor(
+                slide, self._measurement_unit, dispatcher
+            )
+            slide_data = slide_extractor.extract_slide()
+            slide_data["layout_fingerprint"] = layout_fingerprint(
+                [
+                    (shape["left"], shape["top"], shape["width"], shape["height"])
+                    for shape in slide_data["shapes"]
+                ],
+                slide_width,
+                slide_height,
+            )
+            slides.append(slide_data)
         return slides
 
     def extract_ppt(self) -> dict:
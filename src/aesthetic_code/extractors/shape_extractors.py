@@ -1,22 +1,48 @@
-from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, MSO_SHAPE_TYPE, PP_PLACEHOLDER_TYPE
-from pptx.shapes.autoshape import Shape as AutoShape
-from pptx.shapes.base import BaseShape
-from pptx.shapes.connector import Connector
-from pptx.shapes.graphfrm import GraphicFrame
-from pptx.shapes.group import GroupShape
-from pptx.shapes.picture import Movie, Picture
-from pptx.shapes.placeholder import BasePlaceholder
+from __future__ import annotations
 
+import posixpath
+from typing import TYPE_CHECKING
+
+from aesthetic_code.extractors.text_metrics import text_metrics, text_metrics_dict
 from aesthetic_code.utils import unit_conversion
 
+if TYPE_CHECKING:
+    from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, MSO_SHAPE_TYPE
+    from pptx.shapes.autoshape import Shape as AutoShape
+    from pptx.shapes.base import BaseShape
+    from pptx.shapes.connector import Connector
+    from pptx.shapes.graphfrm import GraphicFrame
+    from pptx.shapes.group import GroupShape
+    from pptx.shapes.picture import Movie, Picture
+    from pptx.shapes.placeholder import BasePlaceholder
+
+    from aesthetic_code.extractors.text_styles import TextStyleCache
+
 
 class BaseShapeExtractor:
     def __init__(self, shape: BaseShape, measurement_unit: str = "pt"):
         self._shape = shape
         self._measurement_unit = measurement_unit
+        self._shape_type: MSO_SHAPE_TYPE | None = None
+
+    def bind(
+        self, shape: BaseShape, shape_type: MSO_SHAPE_TYPE | None = None
+    ) -> BaseShapeExtractor:
+        """
+        Points the extractor at another shape, so that one instance serves every
+        shape of its kind. `shape_type`, when already resolved, is not read from
+        the shape's XML again.
+        """
+        self._shape = shape
+        self._shape_type = shape_type
+        return self
 
     def extract_shape_type(self) -> str:
-        shape_type = self._shape.shape_type
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+        shape_type = self._shape_type
+        if shape_type is None:
+            shape_type = self._shape.shape_type
         # Check if the shape type is a valid MSO_SHAPE_TYPE enum member
         if isinstance(shape_type, MSO_SHAPE_TYPE):
             return shape_type.name  # Returns the name of the enum member
@@ -34,8 +60,21 @@ class BaseShapeExtractor:
     def extract_top(self) -> int | float:
         return unit_conversion(self._shape.top, self.measurement_unit)
 
+    @property
+    def measurement_unit(self) -> str:
+        return self._measurement_unit
+
+    def _related_partname(self, rId: str | None) -> str | None:
+        # Follows the relationship only, so the target part's blob is never read
+        if not rId:
+            return None
+        relationship = self._shape.part.rels[rId]
+        if relationship.is_external:
+            return None
+        return str(relationship.target_partname)
+
     def set_measurement_unit(self, unit: str) -> None:
-        self.measurement_unit = unit
+        self._measurement_unit = unit
 
     def extract_shape(self) -> dict:
         return {
@@ -59,6 +98,12 @@ class BaseAutoShapeExtractor(BaseShapeExtractor):
             return self._shape.text  # type: ignore[attr-defined]
         raise AttributeError("Shape does not have a text frame")
 
+    def extract_text_metrics(self, text_styles: TextStyleCache | None = None) -> dict:
+        metrics = text_metrics(self._shape, text_styles)
+        if metrics is None:
+            raise AttributeError("Shape does not have a text frame")
+        return text_metrics_dict(metrics, self.measurement_unit)
+
     def extract_shape(self) -> dict:
         shape_data = super().extract_shape()
         if self._shape.has_text_frame:
@@ -78,7 +123,9 @@ class PlaceholderExtractor(BaseAutoShapeExtractor):
     #     raise AttributeError("Unknown placeholder type")
 
     def extract_placeholder_format(self) -> str:
-        placeholder_format = self._shape.placeholder_format
+        from pptx.enum.shapes import PP_PLACEHOLDER_TYPE
+
+        placeholder_format = self._shape.placeholder_format.type  # type: ignore[attr-defined]
         # Check if the placeholder format is a valid PP_PLACEHOLDER_TYPE enum member
         if isinstance(placeholder_format, PP_PLACEHOLDER_TYPE):
             return placeholder_format.name
@@ -127,8 +174,13 @@ class PictureExtractor(BaseShapeExtractor):
     def extract_auto_shape_type(self) -> MSO_AUTO_SHAPE_TYPE | None:
         return self._shape.auto_shape_type  # type: ignore[attr-defined]
 
+    def extract_media_partname(self) -> str | None:
+        return self._related_partname(self._shape._element.blip_rId)  # type: ignore[attr-defined]
+
     def extract_filename(self) -> str | None:
-        return self._shape.image.filename  # type: ignore[attr-defined]
+        # Taken from the image partname, as going through `image` loads the blob
+        partname = self.extract_media_partname()
+        return posixpath.basename(partname) if partname else None
 
     # def _extract_blob_str(self) -> str:
     #     blob = self._shape.image.blob  # type: ignore[attr-defined]
@@ -138,6 +190,7 @@ class PictureExtractor(BaseShapeExtractor):
         shape_data = super().extract_shape()
         if self.extract_auto_shape_type() is not None:
             shape_data["auto_shape_type"] = self.extract_auto_shape_type()
+        shape_data["media_partname"] = self.extract_media_partname()
         # shape_data["blob_str"] = self._extract_blob_str()
         return shape_data
 
@@ -146,6 +199,15 @@ class MovieExtractor(BaseShapeExtractor):
     def __init__(self, shape: Movie, measurement_unit: str = "pt"):
         super().__init__(shape, measurement_unit)
 
+    def extract_media_partname(self) -> str | None:
+        rIds = self._shape._element.xpath("./p:nvPicPr/p:nvPr/a:videoFile/@r:link")
+        return self._related_partname(rIds[0] if rIds else None)
+
+    def extract_shape(self) -> dict:
+        shape_data = super().extract_shape()
+        shape_data["media_partname"] = self.extract_media_partname()
+        return shape_data
+
 
 class GraphicFrameExtractor(BaseShapeExtractor):
     def __init__(self, shape: GraphicFrame, measurement_unit: str = "pt"):
@@ -163,15 +225,7 @@ class GroupShapeExtractor(BaseShapeExtractor):
         super().__init__(shape, measurement_unit)
 
     def extract_group_shapes(self) -> list:
-        from .factories import (
-            shape_extractor_factory,  # Local import to avoid circular import
-        )
-
-        group_shape_data = []
-
-        for nested_shape in self._shape.shapes:  # type: ignore[attr-defined]
-            extractor = shape_extractor_factory(nested_shape, self.measurement_unit)
-            shape_data = extractor.extract_shape()
-            group_shape_data.append(shape_data)
+        from .factories import extract_many  # Local import to avoid circular import
 
-        return group_shape_data
+        # A dispatcher of its own, so nested groups do not rebind this extractor
+        return extract_many(self._shape.shapes, self.measurement_unit)  # type: ignore[attr-defined]
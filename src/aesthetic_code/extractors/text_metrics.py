@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+from aesthetic_code.extractors.text_styles import (
+    TextStyleCache,
+    resolve_inherited_font_size,
+)
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.util import Length
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+# Sizes are in EMU: 12700 per point
+_EMU_PER_CENTIPOINT = 127
+DEFAULT_FONT_SIZE = 18 * 12700
+# PowerPoint's default text box insets
+DEFAULT_INSETS = {"lIns": 91440, "rIns": 91440, "tIns": 45720, "bIns": 45720}
+# Rough proportions of an average glyph and a line, relative to the font size
+AVERAGE_CHARACTER_WIDTH = 0.5
+LINE_SPACING = 1.2
+
+
+class TextBody(NamedTuple):
+    """
+    What one walk over a shape's text body collects: the counts, the effective
+    sizes of the non-empty runs and, per paragraph, the (text width, line
+    breaks, line size) that line and fill estimates are made from, in EMU.
+    """
+
+    paragraph_count: int
+    run_count: int
+    character_count: int
+    run_font_sizes: tuple[Length, ...]
+    paragraphs: tuple[tuple[float, int, float], ...]
+    insets: dict[str, int]
+
+
+class TextMetrics(NamedTuple):
+    """
+    Text statistics of a shape. `run_font_sizes` are the effective sizes of the
+    non-empty runs, as in `effective_run_font_sizes`. `line_count` and
+    `fill_ratio`, the estimated height of the text over the height inside the
+    insets, assume average glyph widths and single line spacing.
+    """
+
+    paragraph_count: int
+    run_count: int
+    line_count: int
+    character_count: int
+    run_font_sizes: tuple[Length, ...]
+    fill_ratio: float
+
+
+def _size_attribute(element) -> int | None:
+    if element is None:
+        return None
+    size = element.get("sz")
+    return None if size is None else int(size) * _EMU_PER_CENTIPOINT
+
+
+def read_text_body(shape, text_styles: TextStyleCache | None = None) -> TextBody | None:
+    """
+    Walks a shape's text body XML once, or returns None if the shape has no
+    text frame. Sizes neither the run nor the paragraph set are inherited from
+    the layout and master styles, looked up in `text_styles` when given.
+    """
+    from pptx.util import Emu
+
+    if not shape.has_text_frame:
+        return None
+    text_body = shape.element.find(f"{_P}txBody")
+    if text_body is None:
+        return TextBody(0, 0, 0, (), (), DEFAULT_INSETS)
+
+    body_properties = text_body.find(f"{_A}bodyPr")
+    insets = DEFAULT_INSETS
+    font_scale = 1.0
+    if body_properties is not None:
+        insets = {
+            name: int(body_properties.get(name, default))
+            for name, default in DEFAULT_INSETS.items()
+        }
+        autofit = body_properties.find(f"{_A}normAutofit")
+        if autofit is not None:
+            font_scale = int(autofit.get("fontScale", 100000)) / 100000
+
+    inherited_sizes: dict[int, Length | None] = {}
+
+    def inherited_size(level: int) -> Length | None:
+        if level not in inherited_sizes:
+            inherited_sizes[level] = (
+                text_styles.inherited_font_size(shape, level)
+                if text_styles is not None
+                else resolve_inherited_font_size(shape, level)
+            )
+        return inherited_sizes[level]
+
+    run_count = character_count = 0
+    run_font_sizes: list[Length] = []
+    paragraphs = []
+    for paragraph in text_body.iterfind(f"{_A}p"):
+        paragraph_properties = paragraph.find(f"{_A}pPr")
+        level = 0
+        paragraph_size = None
+        if paragraph_properties is not None:
+            level = int(paragraph_properties.get("lvl", 0))
+            paragraph_size = _size_attribute(paragraph_properties.find(f"{_A}defRPr"))
+
+        line_breaks = 0
+        text_width = 0.0
+        line_size = 0.0
+        for child in paragraph:
+            if child.tag == f"{_A}br":
+                line_breaks += 1
+                continue
+            if child.tag not in (f"{_A}r", f"{_A}fld"):
+                continue
+            text = child.findtext(f"{_A}t") or ""
+            size = _size_attribute(child.find(f"{_A}rPr")) or paragraph_size
+            if size is None:
+                size = inherited_size(level)
+            if child.tag == f"{_A}r":
+                run_count += 1
+                if text.strip() and size is not None:
+                    run_font_sizes.append(Emu(size))
+            rendered_size = (size or DEFAULT_FONT_SIZE) * font_scale
+            text_width += len(text) * AVERAGE_CHARACTER_WIDTH * rendered_size
+            line_size = max(line_size, rendered_size)
+            character_count += len(text)
+
+        if line_size == 0:
+            # An empty paragraph still takes a line at its own size
+            line_size = (paragraph_size or DEFAULT_FONT_SIZE) * font_scale
+        paragraphs.append((text_width, line_breaks, line_size))
+
+    return TextBody(
+        paragraph_count=len(paragraphs),
+        run_count=run_count,
+        character_count=character_count,
+        run_font_sizes=tuple(run_font_sizes),
+        paragraphs=tuple(paragraphs),
+        insets=insets,
+    )
+
+
+def text_metrics(
+    shape, text_styles: TextStyleCache | None = None
+) -> TextMetrics | None:
+    """
+    Returns the text metrics of a shape from a single `read_text_body` walk,
+    or None if the shape has no text frame.
+    """
+    body = read_text_body(shape, text_styles)
+    if body is None:
+        return None
+    if body.character_count == 0:
+        return TextMetrics(
+            body.paragraph_count, body.run_count, 0, 0, body.run_font_sizes, 0.0
+        )
+
+    insets = body.insets
+    inner_width = max(shape.width - insets["lIns"] - insets["rIns"], 1)
+    inner_height = max(shape.height - insets["tIns"] - insets["bIns"], 1)
+    line_count = 0
+    text_height = 0.0
+    for text_width, line_breaks, line_size in body.paragraphs:
+        lines = max(1, math.ceil(text_width / inner_width)) + line_breaks
+        line_count += lines
+        text_height += lines * LINE_SPACING * line_size
+
+    return TextMetrics(
+        paragraph_count=body.paragraph_count,
+        run_count=body.run_count,
+        line_count=line_count,
+        character_count=body.character_count,
+        run_font_sizes=body.run_font_sizes,
+        fill_ratio=text_height / inner_height,
+    )
+
+
+def text_metrics_dict(metrics: TextMetrics, measurement_unit: str = "pt") -> dict:
+    """
+    Returns text metrics as a dict, with the font sizes in `measurement_unit`.
+    """
+    return {
+        **metrics._asdict(),
+        "run_font_sizes": [
+            unit_conversion(size, measurement_unit) for size in metrics.run_font_sizes
+        ],
+    }
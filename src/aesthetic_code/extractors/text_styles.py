@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pptx.enum.shapes import PP_PLACEHOLDER_TYPE
+    from pptx.util import Length
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+
+@cache
+def _placeholder_roles() -> dict[PP_PLACEHOLDER_TYPE, str]:
+    from pptx.enum.shapes import PP_PLACEHOLDER_TYPE
+
+    return {
+        PP_PLACEHOLDER_TYPE.TITLE: "title",
+        PP_PLACEHOLDER_TYPE.CENTER_TITLE: "title",
+        PP_PLACEHOLDER_TYPE.VERTICAL_TITLE: "title",
+        PP_PLACEHOLDER_TYPE.SUBTITLE: "subtitle",
+        PP_PLACEHOLDER_TYPE.BODY: "body",
+        PP_PLACEHOLDER_TYPE.OBJECT: "body",
+        PP_PLACEHOLDER_TYPE.VERTICAL_BODY: "body",
+        PP_PLACEHOLDER_TYPE.VERTICAL_OBJECT: "body",
+    }
+
+
+def placeholder_role(placeholder_type: PP_PLACEHOLDER_TYPE | None) -> str | None:
+    """
+    Returns the text role ("title", "subtitle" or "body") of a placeholder type,
+    or None for placeholders outside the text hierarchy (dates, footers, ...).
+    """
+    return _placeholder_roles().get(placeholder_type)  # type: ignore[arg-type]
+
+
+def master_style_tag(placeholder_type: PP_PLACEHOLDER_TYPE | None) -> str:
+    """
+    Returns the slide master text style (under p:txStyles) a shape falls back to.
+    """
+    role = placeholder_role(placeholder_type)
+    if role == "title":
+        return f"{_P}titleStyle"
+    if role is not None:
+        return f"{_P}bodyStyle"
+    return f"{_P}otherStyle"
+
+
+def level_size_from_list_style(list_style, level: int) -> Length | None:
+    """
+    Returns the default run size of a paragraph level in a list style element
+    (a:lstStyle, p:titleStyle, p:bodyStyle, ...), or None if it is not set.
+    """
+    from pptx.util import Centipoints
+
+    if list_style is None:
+        return None
+    level_properties = list_style.find(f"{_A}lvl{level + 1}pPr")
+    if level_properties is None:
+        return None
+    default_run_properties = level_properties.find(f"{_A}defRPr")
+    if default_run_properties is None:
+        return None
+    size = default_run_properties.get("sz")
+    if size is None:
+        return None
+    return Centipoints(int(size))
+
+
+def shape_list_style(shape_element):
+    """
+    Returns the a:lstStyle element of a shape's text body, if any.
+    """
+    text_body = shape_element.find(f"{_P}txBody")
+    if text_body is None:
+        return None
+    return text_body.find(f"{_A}lstStyle")
+
+
+def layout_placeholder(shape):
+    """
+    Returns the slide layout placeholder a slide placeholder inherits from.
+    """
+    if not shape.is_placeholder:
+        return None
+    slide_layout = shape.part.slide.slide_layout
+    return slide_layout.placeholders.get(idx=shape.placeholder_format.idx)
+
+
+def master_placeholder(layout_shape):
+    """
+    Returns the slide master placeholder a layout placeholder inherits from.
+    """
+    if layout_shape is None:
+        return None
+    try:
+        return layout_shape._base_placeholder
+    except KeyError:  # placeholder types without a master counterpart
+        return None
+
+
+def resolve_base_font_size(shape, level: int = 0) -> Length | None:
+    """
+    Resolves the font size a paragraph at `level` of `shape` inherits from outside
+    the shape itself: the layout placeholder, the master placeholder, the master
+    text styles and finally the presentation default text style.
+    """
+    placeholder_type = None
+    if shape.is_placeholder:
+        placeholder_type = shape.placeholder_format.type
+        layout_shape = layout_placeholder(shape)
+        for base_shape in (layout_shape, master_placeholder(layout_shape)):
+            if base_shape is None:
+                continue
+            size = level_size_from_list_style(
+                shape_list_style(base_shape.element), level
+            )
+            if size is not None:
+                return size
+
+    slide_master = shape.part.slide.slide_layout.slide_master
+    text_styles = slide_master.element.find(f"{_P}txStyles")
+    if text_styles is not None:
+        size = level_size_from_list_style(
+            text_styles.find(master_style_tag(placeholder_type)), level
+        )
+        if size is not None:
+            return size
+
+    presentation_element = shape.part.package.presentation_part.presentation.element
+    return level_size_from_list_style(
+        presentation_element.find(f"{_P}defaultTextStyle"), level
+    )
+
+
+def resolve_inherited_font_size(shape, level: int = 0) -> Length | None:
+    """
+    Resolves the font size a paragraph at `level` of `shape` inherits when neither
+    the run nor the paragraph sets it explicitly.
+
+    The lookup order follows PowerPoint: the shape's own list style, then the
+    styles described in `resolve_base_font_size`.
+    """
+    size = level_size_from_list_style(shape_list_style(shape.element), level)
+    if size is not None:
+        return size
+    return resolve_base_font_size(shape, level)
+
+
+class TextStyleCache:
+    """
+    Per-presentation cache of the font sizes shapes inherit from slide layouts
+    and masters.
+
+    Decks usually share a handful of layouts and a single master, so the sizes are
+    resolved once per (layout, placeholder idx, level) and every other paragraph
+    is a dictionary lookup.
+    """
+
+    def __init__(self):
+        self._base_font_sizes: dict[tuple[str, int | None, int], Length | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._base_font_sizes)
+
+    def clear(self) -> None:
+        self._base_font_sizes.clear()
+
+    def _cache_key(self, shape, level: int) -> tuple[str, int | None, int]:
+        slide_layout = shape.part.slide.slide_layout
+        placeholder_idx = shape.placeholder_format.idx if shape.is_placeholder else None
+        return (str(slide_layout.part.partname), placeholder_idx, level)
+
+    def inherited_font_size(self, shape, level: int = 0) -> Length | None:
+        """
+        Cached equivalent of `resolve_inherited_font_size`.
+        """
+        # The shape's own list style is specific to the shape and cannot be shared
+        size = level_size_from_list_style(shape_list_style(shape.element), level)
+        if size is not None:
+            return size
+
+        key = self._cache_key(shape, level)
+        if key not in self._base_font_sizes:
+            self._base_font_sizes[key] = resolve_base_font_size(shape, level)
+        return self._base_font_sizes[key]
+
+
+def effective_run_font_sizes(
+    shape, text_styles: TextStyleCache | None = None
+) -> list[Length]:
+    """
+    Returns the effective font size of every non-empty run in a shape's text frame,
+    falling back from the run to the paragraph and then to the inherited styles,
+    which are looked up in `text_styles` when given.
+    """
+    from .text_metrics import read_text_body  # Local import to avoid circular import
+
+    body = read_text_body(shape, text_styles)
+    return [] if body is None else list(body.run_font_sizes)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Mapping
+
+import numpy as np
+
+from aesthetic_code.render.thumbnail import THUMBNAIL_SIZE, ThumbnailCompositor
+from aesthetic_code.storage.embedding_cache import EmbeddingCache
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+
+# Maps (n, height, width, 3) uint8 RGB thumbnails to (n, dim) embeddings
+EmbedFunction = Callable[[np.ndarray], np.ndarray]
+
+
+def clip_embed_function(model_name: str = "ViT-B/32") -> EmbedFunction:
+    """
+    Returns an `EmbedFunction` running a CLIP image encoder on CPU, with
+    unit-length embeddings. torch and CLIP are only imported here.
+    """
+    import clip
+    import PIL.Image
+    import torch
+
+    model, preprocess = clip.load(model_name, device="cpu")
+    model.eval()
+
+    def embed(thumbnails: np.ndarray) -> np.ndarray:
+        batch = torch.stack(
+            [preprocess(PIL.Image.fromarray(thumbnail)) for thumbnail in thumbnails]
+        )
+        with torch.no_grad():
+            embeddings = model.encode_image(batch).float()
+        embeddings /= embeddings.norm(dim=-1, keepdim=True)
+        return embeddings.numpy()
+
+    return embed
+
+
+class ThumbnailEmbedder:
+    """
+    Embeds slide thumbnails from `ThumbnailCompositor`, rendering and embedding
+    only the thumbnails whose key is not in the cache yet, once per unique key
+    and in batches.
+
+    Cache keys are the thumbnail keys prefixed with `embedder_id`, so that
+    embedders sharing a cache never read each other's embeddings.
+    """
+
+    def __init__(
+        self,
+        embed: EmbedFunction,
+        embedder_id: str,
+        cache: EmbeddingCache | None = None,
+        size: int = THUMBNAIL_SIZE,
+        batch_size: int = 32,
+    ):
+        """
+        Args:
+            embedder_id (str): names the embedding `embed` computes, e.g. the
+                CLIP model name given to `clip_embed_function`.
+        """
+        if not embedder_id:
+            raise ValueError("Embedder id must not be empty")
+        self._embed = embed
+        self._embedder_id = embedder_id
+        self._cache = EmbeddingCache() if cache is None else cache
+        self._size = size
+        self._batch_size = batch_size
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        return self._cache
+
+    @property
+    def embedder_id(self) -> str:
+        return self._embedder_id
+
+    def embed_presentation(
+        self,
+        presentation: Presentation,
+        image_hashes: Mapping[str, str] | None = None,
+    ) -> np.ndarray:
+        """
+        Returns the (n_slides, dim) thumbnail embeddings of a presentation, in
+        slide order.
+
+        Args:
+            image_hashes (Mapping[str, str] | None): image hashes by partname,
+                from `media_hashes`, so that pictures are not hashed again.
+        """
+        slide_width, slide_height = presentation.slide_width, presentation.slide_height
+        if slide_width is None or slide_height is None:
+            raise ValueError("Presentation has no slide size")
+        slides = list(presentation.slides)
+        if not slides:
+            return np.empty((0, 0), dtype=np.float32)
+        compositor = ThumbnailCompositor(slide_width, slide_height, self._size)
+
+        keys = [
+            f"{self._embedder_id}:{compositor.thumbnail_key(slide, image_hashes)}"
+            for slide in slides
+        ]
+        embeddings = self._cache.get_many(keys)
+        # One slide per key not cached yet, all slides of a key look the same
+        missing = {
+            key: slide for key, slide in zip(keys, slides) if key not in embeddings
+        }
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self._batch_size):
+            batch = missing_keys[start : start + self._batch_size]
+            thumbnails = np.stack(
+                [compositor.render(missing[key], image_hashes) for key in batch]
+            )
+            computed = dict(zip(batch, self._embed(thumbnails)))
+            self._cache.put_many(computed)
+            embeddings.update(computed)
+        return np.stack([np.asarray(embeddings[key], dtype=np.float32) for key in keys])
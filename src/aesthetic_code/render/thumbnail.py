@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Mapping
+
+import numpy as np
+
+from aesthetic_code.extractors.shape_extractors import PictureExtractor
+from aesthetic_code.segmenter.fingerprint import slide_fingerprint
+from aesthetic_code.shape_types import Shape
+
+if TYPE_CHECKING:
+    from pptx.opc.package import Part
+    from pptx.slide import Slide
+    from pptx.util import Length
+
+# Length of the long side of a thumbnail, in pixels
+THUMBNAIL_SIZE = 224
+
+BACKGROUND_COLOR = (255, 255, 255)
+OUTLINE_COLOR = (64, 64, 64)
+SHAPE_KIND_COLORS = {
+    "picture": (96, 160, 96),
+    "media": (160, 96, 160),
+    "table": (96, 128, 192),
+    "chart": (192, 128, 64),
+    "graphic": (160, 160, 96),
+    "group": (200, 200, 200),
+    "text": (32, 32, 32),
+    "shape": (176, 208, 232),
+}
+
+
+def shape_kind(shape: Shape) -> str:
+    """
+    Returns the key of `SHAPE_KIND_COLORS` a shape is drawn with.
+    """
+    from pptx.enum.shapes import MSO_SHAPE_TYPE
+    from pptx.shapes.graphfrm import GraphicFrame
+    from pptx.shapes.group import GroupShape
+    from pptx.shapes.picture import Picture
+
+    if shape.shape_type == MSO_SHAPE_TYPE.MEDIA:
+        return "media"
+    if isinstance(shape, Picture):
+        return "picture"
+    if isinstance(shape, GraphicFrame):
+        if shape.has_table:
+            return "table"
+        return "chart" if shape.has_chart else "graphic"
+    if isinstance(shape, GroupShape):
+        return "group"
+    text_frame = shape.text_frame if shape.has_text_frame else None  # type: ignore[attr-defined]
+    if text_frame is not None and text_frame.text.strip():
+        return "text"
+    return "shape"
+
+
+def _image_part(picture: Shape) -> Part | None:
+    # None for a linked image, which has no part in the package
+    rId = picture._element.blip_rId  # type: ignore[attr-defined]
+    if not rId or picture.part.rels[rId].is_external:
+        return None
+    return picture.part.related_part(rId)
+
+
+def picture_blob(picture: Shape) -> bytes:
+    """
+    Returns the image bytes of a picture, empty if the deck was opened with
+    `skip_media` or the image is linked rather than embedded.
+    """
+    part = _image_part(picture)
+    return b"" if part is None else part.blob
+
+
+class ThumbnailCompositor:
+    """
+    Draws a low-resolution proxy of a slide from its geometry alone, with no
+    rendering engine: every top-level shape is a box coloured by its kind, in
+    z-order, and embedded pictures are decoded and downscaled into their box
+    with OpenCV. Pictures whose bytes were not loaded are drawn as boxes.
+
+    The proxy is a stable input for image embeddings such as CLIP's, and
+    `thumbnail_key` identifies everything it is drawn from, so embeddings can
+    be cached across slides and decks.
+    """
+
+    def __init__(
+        self,
+        slide_width: Length,
+        slide_height: Length,
+        size: int = THUMBNAIL_SIZE,
+        picture_cache_size: int = 256,
+    ):
+        self._slide_width = slide_width
+        self._slide_height = slide_height
+        self._size = size
+        self._scale = size / max(slide_width, slide_height)
+        self._width = max(1, round(slide_width * self._scale))
+        self._height = max(1, round(slide_height * self._scale))
+        # Downscaled pictures by image hash and size, least recently used first,
+        # as logos and backgrounds repeat across slides
+        self._pictures: OrderedDict[tuple[str, int, int], np.ndarray | None] = (
+            OrderedDict()
+        )
+        self._picture_cache_size = picture_cache_size
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """
+        Shape of the (height, width, RGB) arrays returned by `render`.
+        """
+        return self._height, self._width, 3
+
+    def _pixel_box(self, shape: Shape) -> tuple[int, int, int, int] | None:
+        if None in (shape.left, shape.top, shape.width, shape.height):
+            return None
+        left = round(shape.left * self._scale)
+        top = round(shape.top * self._scale)
+        right = max(left + 1, round((shape.left + shape.width) * self._scale))
+        bottom = max(top + 1, round((shape.top + shape.height) * self._scale))
+        return left, top, right, bottom
+
+    def _picture(
+        self, picture: Shape, image_hash: str, width: int, height: int
+    ) -> np.ndarray | None:
+        key = (image_hash, width, height)
+        if key in self._pictures:
+            self._pictures.move_to_end(key)
+            return self._pictures[key]
+
+        import cv2
+
+        blob = picture_blob(picture)
+        image = cv2.imdecode(np.frombuffer(blob, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is not None:
+            # INTER_AREA averages source pixels, the right filter for shrinking
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # Formats OpenCV cannot decode, e.g. EMF or SVG, are remembered as None
+        self._pictures[key] = image
+        if len(self._pictures) > self._picture_cache_size:
+            self._pictures.popitem(last=False)
+        return image
+
+    def _picture_hash(
+        self, picture: Shape, image_hashes: Mapping[str, str] | None
+    ) -> str:
+        """
+        Returns the hash of a picture's image, empty if its bytes were not
+        loaded. The bytes are only read and hashed when `image_hashes` lacks
+        the picture.
+        """
+        part = _image_part(picture)
+        # A part loaded empty, as with `skip_media`, is drawn as a box
+        if part is None or not len(part.blob):
+            return ""
+        if image_hashes:
+            partname = PictureExtractor(picture).extract_media_partname()  # type: ignore[arg-type]
+            if partname is not None and partname in image_hashes:
+                return image_hashes[partname]
+        return hashlib.sha256(picture_blob(picture)).hexdigest()
+
+    def render(
+        self, slide: Slide, image_hashes: Mapping[str, str] | None = None
+    ) -> np.ndarray:
+        """
+        Returns the thumbnail of a slide as a (height, width, 3) uint8 RGB array.
+
+        Args:
+            image_hashes (Mapping[str, str] | None): image hashes by partname,
+                from `media_hashes`, so that pictures are not hashed again.
+        """
+        canvas = np.empty(self.shape, dtype=np.uint8)
+        canvas[...] = BACKGROUND_COLOR
+        for shape in slide.shapes:
+            box = self._pixel_box(shape)
+            if box is None:
+                continue
+            left, top, right, bottom = box
+            # The box may run off the slide, so it is clipped to the canvas
+            x0, y0 = max(left, 0), max(top, 0)
+            x1, y1 = min(right, self._width), min(bottom, self._height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+
+            kind = shape_kind(shape)
+            image = None
+            if kind == "picture":
+                image_hash = self._picture_hash(shape, image_hashes)
+                if image_hash:
+                    image = self._picture(shape, image_hash, right - left, bottom - top)
+            if image is not None:
+                canvas[y0:y1, x0:x1] = image[y0 - top : y1 - top, x0 - left : x1 - left]
+                continue
+
+            canvas[y0:y1, x0:x1] = SHAPE_KIND_COLORS[kind]
+            canvas[y0, x0:x1] = canvas[y1 - 1, x0:x1] = OUTLINE_COLOR
+            canvas[y0:y1, x0] = canvas[y0:y1, x1 - 1] = OUTLINE_COLOR
+        return canvas
+
+    def thumbnail_key(
+        self, slide: Slide, image_hashes: Mapping[str, str] | None = None
+    ) -> str:
+        """
+        Returns a digest of everything `render` draws a slide from: the layout
+        fingerprint, the kind of each shape and the hash of each loaded picture.
+        Slides with the same key have the same thumbnail.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            slide_fingerprint(slide, self._slide_width, self._slide_height).encode()
+        )
+        digest.update(str(self._size).encode())
+        for shape in slide.shapes:
+            kind = shape_kind(shape)
+            digest.update(f"|{kind}".encode())
+            if kind == "picture":
+                digest.update(self._picture_hash(shape, image_hashes).encode())
+        return digest.hexdigest()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+from aesthetic_code.scorer.graded_scoring import BOTTOM, LEFT, RIGHT, TOP
+
+# Box edges that can line up; the first three are x positions, the rest y
+EDGES = ("left", "right", "center_x", "top", "bottom", "center_y")
+
+
+def box_edges(boxes: np.ndarray) -> np.ndarray:
+    """
+    Returns the (n, len(EDGES)) edge positions of (n, 4) boxes of
+    (left, top, right, bottom).
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    return np.stack(
+        [
+            boxes[:, LEFT],
+            boxes[:, RIGHT],
+            (boxes[:, LEFT] + boxes[:, RIGHT]) / 2,
+            boxes[:, TOP],
+            boxes[:, BOTTOM],
+            (boxes[:, TOP] + boxes[:, BOTTOM]) / 2,
+        ],
+        axis=1,
+    )
+
+
+class AlignmentLine(NamedTuple):
+    """
+    Boxes sharing an edge: `position` is the mean position of the edge over the
+    `members`, given as box indices.
+    """
+
+    edge: str
+    position: float
+    members: tuple[int, ...]
+
+
+class AlignmentIndex:
+    """
+    Buckets every edge of a set of boxes into alignment lines, one sort per edge
+    so O(n log n) in the number of boxes.
+
+    After sorting, a bucket starts at the first edge not yet bucketed and takes
+    every edge at most `tolerance` beyond it, so the edges of a bucket are never
+    further apart than the tolerance, however many there are, and with
+    `tolerance=0` buckets hold exactly equal edges. Two edges within the
+    tolerance of each other can still fall on either side of a bucket's end.
+    """
+
+    def __init__(self, boxes: np.ndarray, tolerance: float = 0.0):
+        """
+        Args:
+            boxes (np.ndarray): (n, 4) boxes of (left, top, right, bottom).
+            tolerance (float): largest gap between aligned edges, in the units
+                of the boxes.
+        """
+        if tolerance < 0:
+            raise ValueError("Alignment tolerance must not be negative")
+        self._edges = box_edges(boxes)
+        self._tolerance = tolerance
+        n_boxes = len(self._edges)
+        order = np.argsort(self._edges, axis=0, kind="stable")
+        self._order = order
+        # Bucket ids per edge and box, each bucket spanning at most the tolerance
+        self._buckets = np.empty((n_boxes, len(EDGES)), dtype=np.int64)
+        for column in range(len(EDGES)):
+            ordered = self._edges[order[:, column], column]
+            ids = np.empty(n_boxes, dtype=np.int64)
+            start = bucket = 0
+            while start < n_boxes:
+                end = int(
+                    np.searchsorted(ordered, ordered[start] + tolerance, side="right")
+                )
+                ids[start:end] = bucket
+                start, bucket = end, bucket + 1
+            self._buckets[order[:, column], column] = ids
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    @property
+    def tolerance(self) -> float:
+        return self._tolerance
+
+    def buckets(self, edge: str) -> np.ndarray:
+        """
+        Returns the bucket id of one edge of every box; boxes with the same id
+        are aligned on that edge.
+        """
+        return self._buckets[:, self._column(edge)]
+
+    def aligned(
+        self, indices1: np.ndarray, indices2: np.ndarray, edge: str
+    ) -> np.ndarray:
+        """
+        Returns whether the boxes at `indices1` and `indices2` share an edge.
+        """
+        buckets = self.buckets(edge)
+        return buckets[np.asarray(indices1)] == buckets[np.asarray(indices2)]
+
+    def within(
+        self, indices1: np.ndarray, indices2: np.ndarray, edge: str
+    ) -> np.ndarray:
+        """
+        Returns whether an edge of the boxes at `indices1` and `indices2` is at
+        most `tolerance` apart. Unlike `aligned`, this does not depend on the
+        other boxes of the index, which place the ends of the buckets.
+        """
+        column = self._column(edge)
+        offsets = (
+            self._edges[np.asarray(indices1), column]
+            - self._edges[np.asarray(indices2), column]
+        )
+        return np.abs(offsets) <= self._tolerance
+
+    def aligned_with(self, index: int, edge: str) -> list[int]:
+        """
+        Returns the other boxes sharing an edge with a box.
+        """
+        buckets = self.buckets(edge)
+        return [int(i) for i in np.flatnonzero(buckets == buckets[index]) if i != index]
+
+    def shared_edges(self, index1: int, index2: int) -> tuple[str, ...]:
+        return tuple(
+            edge
+            for column, edge in enumerate(EDGES)
+            if self._buckets[index1, column] == self._buckets[index2, column]
+        )
+
+    def lines(
+        self, edge: str | None = None, min_members: int = 2
+    ) -> list[AlignmentLine]:
+        """
+        Returns the alignment lines of one edge, or of every edge, with at least
+        `min_members` boxes, sorted by edge and position.
+        """
+        lines = []
+        for name in EDGES if edge is None else (edge,):
+            column = self._column(name)
+            order = self._order[:, column]
+            buckets = self._buckets[order, column]
+            # Buckets are contiguous runs of the sorted order
+            bounds = np.flatnonzero(np.diff(buckets)) + 1
+            for run in np.split(order, bounds):
+                if len(run) >= min_members:
+                    lines.append(
+                        AlignmentLine(
+                            name,
+                            float(self._edges[run, column].mean()),
+                            tuple(sorted(int(i) for i in run)),
+                        )
+                    )
+        return lines
+
+    def _column(self, edge: str) -> int:
+        if edge not in EDGES:
+            raise ValueError(f"Invalid edge: {edge}")
+        return EDGES.index(edge)
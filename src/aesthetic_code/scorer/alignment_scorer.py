@@ -1,4 +1,36 @@
-from aesthetic_code.segmenter.segmenter import SegmentTreeNode
+from typing import Iterable, cast
+
+import numpy as np
+
+from aesthetic_code.scorer.alignment_index import AlignmentIndex, AlignmentLine
+from aesthetic_code.scorer.config import ScoringPlan
+from aesthetic_code.scorer.graded_scoring import (
+    alignment_scores,
+    bounding_box_array,
+    check_scoring_mode,
+)
+from aesthetic_code.segmenter.segmenter import (
+    LayoutBox,
+    NeighborPair,
+    SegmentTreeNode,
+    iter_neighbor_pairs,
+)
+from aesthetic_code.utils import unit_conversion
+
+
+def shape_box(shape, measurement_unit: str = "pt") -> np.ndarray:
+    """
+    Returns the (left, top, right, bottom) box of a shape in `measurement_unit`;
+    a `LayoutBox` is already in the unit.
+    """
+    if isinstance(shape, LayoutBox):
+        left, top, width, height = shape.left, shape.top, shape.width, shape.height
+    else:
+        left = unit_conversion(shape.left, measurement_unit)
+        top = unit_conversion(shape.top, measurement_unit)
+        width = unit_conversion(shape.width, measurement_unit)
+        height = unit_conversion(shape.height, measurement_unit)
+    return np.array([left, top, left + width, top + height], dtype=float)
 
 
 class AlignmentScorer:
@@ -6,14 +38,33 @@ class AlignmentScorer:
         self,
         segment_node1: SegmentTreeNode,
         segment_node2: SegmentTreeNode,
+        mode: str = "discrete",
+        tolerance: float = 0.05,
     ):
+        """
+        Args:
+            mode (str): "discrete" requires exactly equal edges, "graded" scores
+                near-equal edges smoothly.
+            tolerance (float): graded falloff width, relative to the mean extent
+                of the two nodes.
+        """
         self._segment_node1 = segment_node1
         self._segment_node2 = segment_node2
+        self._mode = check_scoring_mode(mode)
+        self._tolerance = tolerance
 
     def score(self) -> float:
         """
         Returns a score for the alignment of two segment nodes.
         """
+        if self._mode == "graded":
+            return float(
+                alignment_scores(
+                    bounding_box_array(self._segment_node1.bounding_box),
+                    bounding_box_array(self._segment_node2.bounding_box),
+                    self._tolerance,
+                )
+            )
         return self._score_alignment(self._segment_node1, self._segment_node2)
 
     def _score_alignment(
@@ -47,3 +98,157 @@ class AlignmentScorer:
             score += 1.0
 
         return score
+
+
+class SlideAlignmentScorer:
+    """
+    Scores the alignment of a whole segment tree through one `AlignmentIndex`
+    over the boxes of all its nodes and of the shapes inside its multi-shape
+    leaves, instead of comparing edges pair by pair.
+
+    A neighbour pair is aligned, as in `AlignmentScorer`'s discrete mode, when
+    both boxes share their top and bottom edges or their left and right edges,
+    here up to `tolerance`. With `tolerance=0` `score` equals the mean of the
+    discrete `AlignmentScorer` over the neighbour pairs. Given a plan, pairs
+    are scored as `score_alignment` scores them, as in `SlideReportBuilder` and
+    `CandidateScorer`.
+
+    Alignment lines are made of the slide's elements: the single-shape leaves
+    and the shapes of the multi-shape leaves.
+    """
+
+    def __init__(
+        self,
+        segment_tree: SegmentTreeNode,
+        tolerance: float = 0.0,
+        neighbor_pairs: Iterable[NeighborPair] | None = None,
+        measurement_unit: str = "pt",
+        plan: ScoringPlan | None = None,
+    ):
+        """
+        Args:
+            tolerance (float): largest gap between aligned edges, in the unit of
+                the segment tree; see `ScoringPlan.alignment_snap`.
+            neighbor_pairs (Iterable[NeighborPair] | None): `iter_neighbor_pairs`
+                of the tree, if already computed; consumed once.
+            measurement_unit (str): unit of the segment tree, to measure the
+                shapes of multi-shape leaves in.
+            plan (ScoringPlan | None): overrides `tolerance` with its alignment
+                snap and grades the pairs by its alignment tolerance.
+        """
+        if plan is not None:
+            tolerance = float(plan.alignment_snap)
+        self._graded_tolerance = (
+            0.0 if plan is None else float(plan.alignment_tolerance)
+        )
+        if neighbor_pairs is None:
+            neighbor_pairs = iter_neighbor_pairs(segment_tree)
+        # Every node but the root is the first member of its belongs_to pair
+        nodes: dict[int, SegmentTreeNode] = {0: segment_tree}
+        pairs = []
+        for pair in neighbor_pairs:
+            nodes[pair.first_index] = cast(SegmentTreeNode, pair.first)
+            pairs.append((pair.first_index, pair.second_index))
+        self._nodes = [nodes[i] for i in sorted(nodes)]
+        positions = {index: i for i, index in enumerate(sorted(nodes))}
+
+        # A single-shape leaf stands for its shape, whose box it shares
+        self._shapes: list = []
+        self._elements: list[int] = []
+        for i, node in enumerate(self._nodes):
+            if not node.is_leaf():
+                continue
+            if len(node.subregions) > 1:
+                for shape in node.subregions:
+                    self._elements.append(len(self._nodes) + len(self._shapes))
+                    self._shapes.append(shape)
+            else:
+                self._elements.append(i)
+
+        boxes = [bounding_box_array(node.bounding_box) for node in self._nodes]
+        boxes.extend(shape_box(shape, measurement_unit) for shape in self._shapes)
+        self._boxes = np.array(boxes).reshape(-1, 4)
+        self._index = AlignmentIndex(self._boxes, tolerance)
+        self._pairs = np.array(
+            [[positions[first], positions[second]] for first, second in pairs],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+
+    @property
+    def index(self) -> AlignmentIndex:
+        return self._index
+
+    @property
+    def nodes(self) -> list[SegmentTreeNode]:
+        """
+        The tree nodes, the first boxes of the index.
+        """
+        return self._nodes
+
+    @property
+    def shapes(self) -> list:
+        """
+        The shapes of the multi-shape leaves, the index's boxes after the nodes.
+        """
+        return self._shapes
+
+    @property
+    def elements(self) -> list[int]:
+        """
+        Index positions of the slide's elements, the members of alignment lines.
+        """
+        return self._elements
+
+    def pair_scores(self) -> np.ndarray:
+        """
+        Returns 1 for each neighbour pair sharing edges up to the tolerance,
+        and its graded alignment score, if any, otherwise.
+        """
+        first, second = self._pairs[:, 0], self._pairs[:, 1]
+
+        def shared(*edges: str) -> np.ndarray:
+            # Pairwise, so that a pair's score does not depend on the other boxes
+            return np.logical_and.reduce(
+                [self._index.within(first, second, edge) for edge in edges]
+            )
+
+        scores = (shared("top", "bottom") | shared("left", "right")).astype(float)
+        if self._graded_tolerance > 0:
+            scores = np.maximum(
+                scores,
+                alignment_scores(
+                    self._boxes[first], self._boxes[second], self._graded_tolerance
+                ),
+            )
+        return scores
+
+    def score(self) -> float:
+        """
+        Returns the mean neighbour pair score, NaN for a tree without pairs.
+        """
+        if not len(self._pairs):
+            return float("nan")
+        return float(self.pair_scores().mean())
+
+    def lines(self, min_members: int = 2) -> list[AlignmentLine]:
+        """
+        Returns the alignment lines shared by at least `min_members` elements,
+        with members given as positions in the index, see `elements`.
+        """
+        elements = set(self._elements)
+        lines = []
+        for line in self._index.lines(min_members=min_members):
+            members = tuple(i for i in line.members if i in elements)
+            if len(members) >= min_members:
+                lines.append(line._replace(members=members))
+        return lines
+
+    def global_score(self) -> float:
+        """
+        Returns the share of elements lying on at least one alignment line with
+        another element, NaN for a slide with a single element.
+        """
+        if len(self._elements) < 2:
+            return float("nan")
+        aligned = {i for line in self.lines() for i in line.members}
+        return len(aligned) / len(self._elements)
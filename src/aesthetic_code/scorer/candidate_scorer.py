@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from aesthetic_code.scorer.config import ScoringConfig, score_margins, score_pairs
+from aesthetic_code.scorer.graded_scoring import bounding_box_array, check_scoring_mode
+from aesthetic_code.segmenter.segmenter import (
+    BoxSegmenter,
+    LayoutBox,
+    SegmentTreeNode,
+    iter_neighbor_pairs,
+)
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.slide import Slide
+    from pptx.util import Length
+
+GEOMETRIC_SCORES = ("group_spacing", "alignment", "size_comparison", "white_space")
+
+
+class CandidateLayoutScorer:
+    """
+    Scores many candidate layouts of one slide at once.
+
+    A candidate is the slide's shapes moved to new boxes, given as an
+    (n_candidates, n_shapes, 4) array of (left, top, right, bottom) in the
+    measurement unit, with shapes in `slide.shapes` order. Each candidate is
+    segmented from plain boxes and all neighbour pairs of all candidates are
+    scored together, so no pptx objects are created along the way.
+    """
+
+    def __init__(
+        self,
+        slide: Slide,
+        slide_width: Length,
+        slide_height: Length,
+        measurement_unit: str = "pt",
+        mode: str = "discrete",
+        tolerances: dict[str, float] | None = None,
+        spacing_threshold: list[float] = [0.1, 0.3],
+        size_thresholds: tuple = (0.25, 4),
+        margin_threshold: tuple = (0.1, 0.3),
+    ):
+        self._slide = slide
+        self._measurement_unit = measurement_unit
+        self._width = unit_conversion(slide_width, measurement_unit)
+        self._height = unit_conversion(slide_height, measurement_unit)
+        self._mode = check_scoring_mode(mode)
+        self._plan = ScoringConfig.from_mode(
+            mode,
+            tolerances,
+            spacing_threshold=spacing_threshold,
+            size_thresholds=size_thresholds,
+            margin_threshold=margin_threshold,
+        ).plan(self._width, self._height)
+        self._shapes = list(slide.shapes)
+        if not self._shapes:
+            raise ValueError("Slide has no shapes to lay out")
+
+    @property
+    def base_boxes(self) -> np.ndarray:
+        """
+        Returns the (n_shapes, 4) boxes of the slide as it currently is.
+        """
+        boxes = []
+        for shape in self._shapes:
+            left = unit_conversion(shape.left, self._measurement_unit)
+            top = unit_conversion(shape.top, self._measurement_unit)
+            width = unit_conversion(shape.width, self._measurement_unit)
+            height = unit_conversion(shape.height, self._measurement_unit)
+            boxes.append([left, top, left + width, top + height])
+        return np.array(boxes, dtype=float)
+
+    def _layout_boxes(self, boxes: np.ndarray) -> list[LayoutBox]:
+        return [
+            LayoutBox(
+                left=box[0],
+                top=box[1],
+                width=box[2] - box[0],
+                height=box[3] - box[1],
+                name=shape.name,
+                shape_id=shape.shape_id,
+                shape_type=shape.shape_type,
+            )
+            for shape, box in zip(self._shapes, boxes.tolist())
+        ]
+
+    def segment(self, boxes: np.ndarray) -> SegmentTreeNode:
+        """
+        Segments a single candidate layout of (n_shapes, 4) boxes.
+        """
+        return BoxSegmenter(
+            self._layout_boxes(np.asarray(boxes, dtype=float)),
+            self._width,
+            self._height,
+            self._measurement_unit,
+        ).segment()
+
+    def _check_candidates(self, candidate_boxes: np.ndarray) -> np.ndarray:
+        candidate_boxes = np.asarray(candidate_boxes, dtype=float)
+        if candidate_boxes.ndim == 2:
+            candidate_boxes = candidate_boxes[np.newaxis]
+        if candidate_boxes.shape[1:] != (len(self._shapes), 4):
+            raise ValueError(
+                f"Expected candidate boxes of shape (n, {len(self._shapes)}, 4), "
+                f"got {candidate_boxes.shape}"
+            )
+        return candidate_boxes
+
+    def _collect_pairs(
+        self, candidate_boxes: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Segments every candidate and gathers the neighbour pairs of all of them
+        into flat arrays, along with the candidate each pair belongs to.
+        """
+        boxes1, boxes2, pair_kinds, candidate_indices = [], [], [], []
+        for index, boxes in enumerate(candidate_boxes):
+            for pair in iter_neighbor_pairs(self.segment(boxes)):
+                boxes1.append(self._subregion_box(pair.first))
+                boxes2.append(self._subregion_box(pair.second))
+                pair_kinds.append(pair.kind)
+                candidate_indices.append(index)
+        return (
+            np.array(boxes1, dtype=float).reshape(-1, 4),
+            np.array(boxes2, dtype=float).reshape(-1, 4),
+            np.array(pair_kinds, dtype=int),
+            np.array(candidate_indices, dtype=int),
+        )
+
+    def _subregion_box(self, subregion) -> np.ndarray:
+        if isinstance(subregion, SegmentTreeNode):
+            return bounding_box_array(subregion.bounding_box)
+        return np.array(
+            [
+                subregion.left,
+                subregion.top,
+                subregion.left + subregion.width,
+                subregion.top + subregion.height,
+            ]
+        )
+
+    def score_components(self, candidate_boxes: np.ndarray) -> np.ndarray:
+        """
+        Returns an (n_candidates, 4) array with the group spacing, alignment,
+        size comparison and white space scores of every candidate, see
+        `GEOMETRIC_SCORES`. Pair-based scores are NaN for candidates whose
+        segment tree has no neighbour pairs.
+        """
+        candidate_boxes = self._check_candidates(candidate_boxes)
+        n_candidates = len(candidate_boxes)
+        boxes1, boxes2, pair_kinds, candidate_indices = self._collect_pairs(
+            candidate_boxes
+        )
+
+        pair_scores = score_pairs(self._plan, boxes1, boxes2, pair_kinds)
+        pair_counts = np.bincount(candidate_indices, minlength=n_candidates)
+
+        components = np.empty((n_candidates, len(GEOMETRIC_SCORES)))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for column, name in enumerate(GEOMETRIC_SCORES[:3]):
+                components[:, column] = (
+                    np.bincount(
+                        candidate_indices,
+                        weights=pair_scores[name],
+                        minlength=n_candidates,
+                    )
+                    / pair_counts
+                )
+
+        # Same global bounding box as MarginWhiteSpaceScorer
+        bounding_boxes = np.stack(
+            [
+                np.minimum(candidate_boxes[..., 0].min(axis=1), self._width),
+                np.minimum(candidate_boxes[..., 1].min(axis=1), self._height),
+                np.maximum(candidate_boxes[..., 2].max(axis=1), 0.0),
+                np.maximum(candidate_boxes[..., 3].max(axis=1), 0.0),
+            ],
+            axis=-1,
+        )
+        components[:, 3] = score_margins(self._plan, bounding_boxes)
+        return components
+
+    def score(
+        self, candidate_boxes: np.ndarray, weights: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Returns the (n_candidates,) weighted mean of the geometric scores of every
+        candidate, ignoring scores that are NaN.
+        """
+        components = self.score_components(candidate_boxes)
+        if weights is None:
+            weights = np.ones(len(GEOMETRIC_SCORES))
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), components.shape)
+        present = ~np.isnan(components)
+        weighted_sum = np.where(present, components * weights, 0.0).sum(axis=1)
+        return weighted_sum / np.where(present, weights, 0.0).sum(axis=1)
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+
+from aesthetic_code.scorer.graded_scoring import (
+    alignment_scores,
+    gap_scores,
+    margin_band_scores,
+    size_comparison_scores,
+    snapped_alignment_scores,
+)
+
+DEFAULT_GRADED_TOLERANCES = {
+    "group_spacing": 0.05,
+    "alignment": 0.05,
+    "size_comparison": 0.1,
+    "white_space": 0.05,
+}
+
+
+class ScoringConfig(NamedTuple):
+    """
+    Thresholds and graded tolerances of the geometric scorers, relative to the
+    slide size where they are lengths. All-zero tolerances give the discrete
+    scores. Being a tuple, a config is hashable and pickles cheaply to workers.
+
+    `alignment_snap` is the largest gap, relative to the smaller side of the
+    slide, between edges that the alignment index counts as aligned; unlike
+    the graded tolerances it applies in discrete mode too.
+    """
+
+    spacing_threshold: tuple[float, float] = (0.1, 0.3)
+    size_thresholds: tuple[float, float] = (0.25, 4.0)
+    margin_threshold: tuple[float, float] = (0.1, 0.3)
+    spacing_tolerance: float = 0.0
+    alignment_tolerance: float = 0.0
+    size_tolerance: float = 0.0
+    margin_tolerance: float = 0.0
+    alignment_snap: float = 0.005
+
+    @classmethod
+    def from_mode(
+        cls,
+        mode: str = "discrete",
+        tolerances: dict[str, float] | None = None,
+        **kwargs: Any,
+    ) -> ScoringConfig:
+        """
+        Builds a config the way the scorers' `mode` and `tolerances` arguments
+        do: graded mode starts from `DEFAULT_GRADED_TOLERANCES`. Other fields
+        are passed as keyword arguments, thresholds as any sequence.
+        """
+        resolved = {name: 0.0 for name in DEFAULT_GRADED_TOLERANCES}
+        if mode == "graded":
+            resolved.update(DEFAULT_GRADED_TOLERANCES)
+            resolved.update(tolerances or {})
+        elif mode != "discrete":
+            raise ValueError(f"Invalid scoring mode: {mode}")
+        fields: dict[str, Any] = {
+            name: tuple(value) if isinstance(value, Sequence) else value
+            for name, value in kwargs.items()
+        }
+        return cls(
+            spacing_tolerance=resolved["group_spacing"],
+            alignment_tolerance=resolved["alignment"],
+            size_tolerance=resolved["size_comparison"],
+            margin_tolerance=resolved["white_space"],
+            **fields,
+        )
+
+    @classmethod
+    def from_dict(cls, fields: dict[str, Any]) -> ScoringConfig:
+        """
+        Rebuilds a config from its `_asdict()`, also after a JSON round trip
+        turned its thresholds into lists. Missing fields take their default.
+        """
+        values: dict[str, Any] = {
+            name: tuple(value) if isinstance(value, list) else value
+            for name, value in fields.items()
+        }
+        return cls(**values)
+
+    def plan(self, slide_width: float, slide_height: float) -> ScoringPlan:
+        return resolve_plan(self, float(slide_width), float(slide_height))
+
+
+class ScoringPlan(NamedTuple):
+    """
+    A `ScoringConfig` resolved for one slide size: spacing and margin bands and
+    their tolerances are absolute lengths in the slide's measurement unit.
+
+    The fields are floats for a single config, or (n_configs, 1) arrays for a
+    stack of configs from `stack_plans`, which then score every config at once.
+    """
+
+    slide_width: float
+    slide_height: float
+    horizontal_spacing: tuple
+    vertical_spacing: tuple
+    horizontal_spacing_tolerance: float | np.ndarray
+    vertical_spacing_tolerance: float | np.ndarray
+    size_thresholds: tuple
+    size_tolerance: float | np.ndarray
+    alignment_tolerance: float | np.ndarray
+    alignment_snap: float | np.ndarray
+    horizontal_margin: tuple
+    vertical_margin: tuple
+    horizontal_margin_tolerance: float | np.ndarray
+    vertical_margin_tolerance: float | np.ndarray
+
+
+@lru_cache(maxsize=1024)
+def resolve_plan(
+    config: ScoringConfig, slide_width: float, slide_height: float
+) -> ScoringPlan:
+    """
+    Resolves a config for a slide size, cached so that every slide and scorer
+    with the same size and config share one plan.
+    """
+    spacing_low, spacing_high = config.spacing_threshold
+    margin_low, margin_high = config.margin_threshold
+    return ScoringPlan(
+        slide_width=slide_width,
+        slide_height=slide_height,
+        horizontal_spacing=(spacing_low * slide_width, spacing_high * slide_width),
+        vertical_spacing=(spacing_low * slide_height, spacing_high * slide_height),
+        horizontal_spacing_tolerance=config.spacing_tolerance * slide_width,
+        vertical_spacing_tolerance=config.spacing_tolerance * slide_height,
+        size_thresholds=tuple(config.size_thresholds),
+        size_tolerance=config.size_tolerance,
+        alignment_tolerance=config.alignment_tolerance,
+        alignment_snap=config.alignment_snap * min(slide_width, slide_height),
+        horizontal_margin=(margin_low * slide_width, margin_high * slide_width),
+        vertical_margin=(margin_low * slide_height, margin_high * slide_height),
+        horizontal_margin_tolerance=config.margin_tolerance * slide_width,
+        vertical_margin_tolerance=config.margin_tolerance * slide_height,
+    )
+
+
+def stack_plans(plans: Sequence[ScoringPlan]) -> ScoringPlan:
+    """
+    Stacks the plans of several configs for the same slide size into one plan
+    of (n_configs, 1) arrays, which broadcast against (n,) per-pair or per-slide
+    values to give (n_configs, n) scores.
+    """
+    if len({(plan.slide_width, plan.slide_height) for plan in plans}) != 1:
+        raise ValueError("Stacked plans must share one slide size")
+
+    def column(values) -> np.ndarray:
+        return np.array(values, dtype=float).reshape(-1, 1)
+
+    fields = {}
+    for name, value in plans[0]._asdict().items():
+        if name in ("slide_width", "slide_height"):
+            fields[name] = value
+        elif isinstance(value, tuple):
+            fields[name] = tuple(
+                column([getattr(plan, name)[i] for plan in plans])
+                for i in range(len(value))
+            )
+        else:
+            fields[name] = column([getattr(plan, name) for plan in plans])
+    return ScoringPlan(**fields)
+
+
+def score_pairs(
+    plan: ScoringPlan,
+    boxes1: np.ndarray,
+    boxes2: np.ndarray,
+    pair_kinds: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Returns the group spacing, alignment and size comparison scores of neighbour
+    pairs of boxes (see `spacing_scores`), shaped (n_pairs,) for a plan and
+    (n_configs, n_pairs) for stacked plans.
+    """
+    return {
+        "group_spacing": gap_scores(
+            boxes1,
+            boxes2,
+            pair_kinds,
+            plan.horizontal_spacing,
+            plan.vertical_spacing,
+            plan.horizontal_spacing_tolerance,
+            plan.vertical_spacing_tolerance,
+        ),
+        "alignment": score_alignment(plan, boxes1, boxes2),
+        "size_comparison": size_comparison_scores(
+            boxes1, boxes2, plan.size_thresholds, plan.size_tolerance
+        ),
+    }
+
+
+def score_alignment(
+    plan: ScoringPlan, boxes1: np.ndarray, boxes2: np.ndarray
+) -> np.ndarray:
+    """
+    Returns the alignment scores of pairs of boxes: 1 for edges within the
+    alignment snap of each other, as `SlideAlignmentScorer` finds them, and
+    the graded `alignment_scores` otherwise.
+    """
+    return np.maximum(
+        snapped_alignment_scores(boxes1, boxes2, plan.alignment_snap),
+        alignment_scores(boxes1, boxes2, plan.alignment_tolerance),
+    )
+
+
+def score_margins(plan: ScoringPlan, bounding_boxes: np.ndarray) -> np.ndarray:
+    """
+    Returns the white space score of the global bounding boxes of layouts, see
+    `margin_scores`.
+    """
+    return margin_band_scores(
+        bounding_boxes,
+        plan.slide_width,
+        plan.slide_height,
+        plan.horizontal_margin,
+        plan.vertical_margin,
+        plan.horizontal_margin_tolerance,
+        plan.vertical_margin_tolerance,
+    )
+
+
+def sweep_pair_scores(
+    configs: Sequence[ScoringConfig],
+    boxes1: np.ndarray,
+    boxes2: np.ndarray,
+    pair_kinds: np.ndarray,
+    slide_width: float,
+    slide_height: float,
+) -> dict[str, np.ndarray]:
+    """
+    Scores the same neighbour pairs under every config in one vectorised pass,
+    returning (n_configs, n_pairs) arrays.
+
+    Every threshold is relative to the slide size or scale-free, so pairs from
+    slides of different sizes can be swept together by dividing their boxes by
+    their slide size and passing a 1 x 1 slide.
+    """
+    plan = stack_plans([config.plan(slide_width, slide_height) for config in configs])
+    return score_pairs(plan, boxes1, boxes2, pair_kinds)
+
+
+def sweep_margin_scores(
+    configs: Sequence[ScoringConfig],
+    bounding_boxes: np.ndarray,
+    slide_width: float,
+    slide_height: float,
+) -> np.ndarray:
+    """
+    Scores the same bounding boxes under every config, as (n_configs, n_boxes).
+    """
+    plan = stack_plans([config.plan(slide_width, slide_height) for config in configs])
+    return score_margins(plan, bounding_boxes)
@@ -1,33 +1,36 @@
-from typing import TypeAlias, Union
-
-from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER_TYPE
-from pptx.shapes.autoshape import Shape as AutoShape
-from pptx.shapes.base import BaseShape
-from pptx.shapes.connector import Connector
-from pptx.shapes.graphfrm import GraphicFrame
-from pptx.shapes.group import GroupShape
-from pptx.shapes.picture import Movie, Picture
-from pptx.shapes.placeholder import BasePlaceholder
-from pptx.text.text import Font, TextFrame
-from pptx.util import Length
-
-Shape: TypeAlias = Union[
-    BaseShape,
-    AutoShape,
-    Connector,
-    GraphicFrame,
-    GroupShape,
-    Picture,
-    Movie,
-    BasePlaceholder,
-]
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from aesthetic_code.extractors.text_styles import (
+    TextStyleCache,
+    effective_run_font_sizes,
+    placeholder_role,
+)
+from aesthetic_code.shape_types import Shape
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+    from pptx.slide import Slide
+    from pptx.text.text import Font, TextFrame
+    from pptx.util import Length
 
 
 class FontHierarchyScorer:
-    def __init__(self):
-        self._title_node = None
-        self._subtitle_node = None
-        self._body_node = None
+    def __init__(self, text_styles: TextStyleCache | None = None):
+        """
+        Args:
+            text_styles (TextStyleCache | None): when given, font sizes inherited
+                from the slide layout and master are resolved through this cache
+                instead of being ignored.
+        """
+        self._text_styles = text_styles
+        self._title_node: Shape | None = None
+        self._subtitle_node: Shape | None = None
+        self._body_node: Shape | None = None
 
     @property
     def title_node(self):
@@ -35,7 +38,10 @@ class FontHierarchyScorer:
 
     @title_node.setter
     def title_node(self, title_node):
-        if not isinstance(title_node, Shape):  # type: ignore[misc]
+        from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER_TYPE
+        from pptx.shapes.base import BaseShape
+
+        if not isinstance(title_node, BaseShape):
             raise ValueError("title_node must be a Shape object")
         if title_node.shape_type != MSO_SHAPE_TYPE.PLACEHOLDER:
             raise ValueError("title_node must be a placeholder shape")
@@ -51,7 +57,10 @@ class FontHierarchyScorer:
 
     @subtitle_node.setter
     def subtitle_node(self, subtitle_node):
-        if not isinstance(subtitle_node, Shape):  # type: ignore[misc]
+        from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER_TYPE
+        from pptx.shapes.base import BaseShape
+
+        if not isinstance(subtitle_node, BaseShape):
             raise ValueError("subtitle_node must be a Shape object")
         if subtitle_node.shape_type != MSO_SHAPE_TYPE.PLACEHOLDER:
             raise ValueError("subtitle_node must be a placeholder shape")
@@ -67,7 +76,9 @@ class FontHierarchyScorer:
 
     @body_node.setter
     def body_node(self, body_node):
-        if not isinstance(body_node, Shape):  # type: ignore[misc]
+        from pptx.shapes.base import BaseShape
+
+        if not isinstance(body_node, BaseShape):
             raise ValueError("body_node must be a Shape object")
         if not body_node.has_text_frame:
             raise ValueError("body_node must have a text frame")
@@ -87,22 +98,22 @@ class FontHierarchyScorer:
     def _get_font_sizes(self, font_objects: list[Font]) -> list[Length]:
         return [font.size for font in font_objects if font.size is not None]
 
+    def _get_node_font_sizes(self, node: Shape | None) -> list[Length]:
+        if node is None:
+            raise ValueError("Node must be provided")
+        if self._text_styles is not None:
+            return effective_run_font_sizes(node, self._text_styles)
+        text_frame = self._get_text_frame(node)
+        return self._get_font_sizes(self._get_font_objects(text_frame))
+
     def score(self) -> float:
         return self._score_font_hierarchy()
 
     def _score_font_hierarchy(self) -> float:
         if all([self._title_node, self._subtitle_node, self._body_node]):
-            title_text_frame = self._get_text_frame(self._title_node)
-            subtitle_text_frame = self._get_text_frame(self._subtitle_node)
-            body_text_frame = self._get_text_frame(self._body_node)
-
-            title_font_objects = self._get_font_objects(title_text_frame)
-            subtitle_font_objects = self._get_font_objects(subtitle_text_frame)
-            body_font_objects = self._get_font_objects(body_text_frame)
-
-            title_font_sizes = self._get_font_sizes(title_font_objects)
-            subtitle_font_sizes = self._get_font_sizes(subtitle_font_objects)
-            body_font_sizes = self._get_font_sizes(body_font_objects)
+            title_font_sizes = self._get_node_font_sizes(self._title_node)
+            subtitle_font_sizes = self._get_node_font_sizes(self._subtitle_node)
+            body_font_sizes = self._get_node_font_sizes(self._body_node)
 
             title_font_size = sum(title_font_sizes) / len(title_font_sizes)
             subtitle_font_size = sum(subtitle_font_sizes) / len(subtitle_font_sizes)
@@ -112,14 +123,8 @@ class FontHierarchyScorer:
                 return 1.0
             return 0.0
         elif all([self._title_node, self._subtitle_node]):
-            title_text_frame = self._get_text_frame(self._title_node)
-            subtitle_text_frame = self._get_text_frame(self._subtitle_node)
-
-            title_font_objects = self._get_font_objects(title_text_frame)
-            subtitle_font_objects = self._get_font_objects(subtitle_text_frame)
-
-            title_font_sizes = self._get_font_sizes(title_font_objects)
-            subtitle_font_sizes = self._get_font_sizes(subtitle_font_objects)
+            title_font_sizes = self._get_node_font_sizes(self._title_node)
+            subtitle_font_sizes = self._get_node_font_sizes(self._subtitle_node)
 
             title_font_size = sum(title_font_sizes) / len(title_font_sizes)
             subtitle_font_size = sum(subtitle_font_sizes) / len(subtitle_font_sizes)
@@ -128,14 +133,8 @@ class FontHierarchyScorer:
                 return 1.0
             return 0.0
         elif all([self._title_node, self._body_node]):
-            title_text_frame = self._get_text_frame(self._title_node)
-            body_text_frame = self._get_text_frame(self._body_node)
-
-            title_font_objects = self._get_font_objects(title_text_frame)
-            body_font_objects = self._get_font_objects(body_text_frame)
-
-            title_font_sizes = self._get_font_sizes(title_font_objects)
-            body_font_sizes = self._get_font_sizes(body_font_objects)
+            title_font_sizes = self._get_node_font_sizes(self._title_node)
+            body_font_sizes = self._get_node_font_sizes(self._body_node)
 
             title_font_size = sum(title_font_sizes) / len(title_font_sizes)
             body_font_size = sum(body_font_sizes) / len(body_font_sizes)
@@ -144,14 +143,8 @@ class FontHierarchyScorer:
                 return 1.0
             return 0.0
         elif all([self._subtitle_node, self._body_node]):
-            subtitle_text_frame = self._get_text_frame(self._subtitle_node)
-            body_text_frame = self._get_text_frame(self._body_node)
-
-            subtitle_font_objects = self._get_font_objects(subtitle_text_frame)
-            body_font_objects = self._get_font_objects(body_text_frame)
-
-            subtitle_font_sizes = self._get_font_sizes(subtitle_font_objects)
-            body_font_sizes = self._get_font_sizes(body_font_objects)
+            subtitle_font_sizes = self._get_node_font_sizes(self._subtitle_node)
+            body_font_sizes = self._get_node_font_sizes(self._body_node)
 
             subtitle_font_size = sum(subtitle_font_sizes) / len(subtitle_font_sizes)
             body_font_size = sum(body_font_sizes) / len(body_font_sizes)
@@ -161,3 +154,108 @@ class FontHierarchyScorer:
             return 0.0
         else:
             raise ValueError("Two of the three nodes must be provided")
+
+
+FONT_ROLES = ("title", "subtitle", "body")
+
+
+def score_font_sizes(font_sizes: np.ndarray) -> np.ndarray:
+    """
+    Scores the font hierarchy of many slides at once.
+
+    Args:
+        font_sizes (np.ndarray): (n_slides, 3) array of the title, subtitle and
+            body font sizes, with NaN for roles missing on a slide.
+
+    Returns:
+        np.ndarray: 1.0 where the present roles strictly decrease in size,
+            0.0 where they do not and NaN where fewer than two roles are present.
+    """
+    font_sizes = np.asarray(font_sizes, dtype=float)
+    title, subtitle, body = font_sizes[:, 0], font_sizes[:, 1], font_sizes[:, 2]
+    has_title, has_subtitle, has_body = ~np.isnan(font_sizes).T
+
+    with np.errstate(invalid="ignore"):
+        title_over_subtitle = np.where(has_title & has_subtitle, title > subtitle, True)
+        subtitle_over_body = np.where(has_subtitle & has_body, subtitle > body, True)
+        title_over_body = np.where(
+            has_title & has_body & ~has_subtitle, title > body, True
+        )
+
+    scores = (title_over_subtitle & subtitle_over_body & title_over_body).astype(float)
+    role_count = has_title.astype(int) + has_subtitle + has_body
+    scores[role_count < 2] = np.nan
+    return scores
+
+
+class PowerPointFontHierarchyScorer:
+    """
+    Scores the font hierarchy of every slide in a presentation, detecting the
+    title, subtitle and body placeholders of each slide automatically.
+    """
+
+    def __init__(self, presentation: Presentation, measurement_unit: str = "pt"):
+        self._presentation = presentation
+        self._measurement_unit = measurement_unit
+        self._text_styles = TextStyleCache()
+
+    @property
+    def text_styles(self) -> TextStyleCache:
+        return self._text_styles
+
+    def detect_roles(self, slide: Slide) -> dict[str, list[Shape]]:
+        """
+        Groups the text placeholders of a slide by their role in the hierarchy.
+        Placeholders without any text are ignored.
+        """
+        roles: dict[str, list[Shape]] = {role: [] for role in FONT_ROLES}
+        for shape in slide.placeholders:
+            if not shape.has_text_frame or not shape.text_frame.text.strip():
+                continue
+            role = placeholder_role(shape.placeholder_format.type)
+            if role is not None:
+                roles[role].append(shape)
+        return roles
+
+    def _extract_slide_font_sizes(self, slide: Slide) -> list[float]:
+        font_sizes = []
+        for shapes in self.detect_roles(slide).values():
+            sizes = [
+                unit_conversion(size, self._measurement_unit)
+                for shape in shapes
+                for size in effective_run_font_sizes(shape, self._text_styles)
+            ]
+            font_sizes.append(sum(sizes) / len(sizes) if sizes else np.nan)
+        return font_sizes
+
+    def extract_slide_font_sizes(self, slide_index: int) -> list[float]:
+        """
+        Returns the mean title, subtitle and body font sizes of a slide, NaN for
+        roles missing on it.
+        """
+        return self._extract_slide_font_sizes(self._presentation.slides[slide_index])
+
+    def extract_font_sizes(self) -> np.ndarray:
+        """
+        Returns a (n_slides, 3) array of the mean title, subtitle and body font
+        sizes of every slide, with NaN for roles missing on a slide.
+        """
+        font_sizes = [
+            self._extract_slide_font_sizes(slide) for slide in self._presentation.slides
+        ]
+        return np.array(font_sizes, dtype=float).reshape(-1, len(FONT_ROLES))
+
+    def score_all(self) -> np.ndarray:
+        """
+        Returns the font hierarchy score of every slide, see `score_font_sizes`.
+        """
+        return score_font_sizes(self.extract_font_sizes())
+
+    def score_slide(self, slide_index: int) -> float:
+        """
+        Returns the font hierarchy score of a single slide, NaN if it has fewer
+        than two roles.
+        """
+        slide = self._presentation.slides[slide_index]
+        font_sizes = np.array([self._extract_slide_font_sizes(slide)], dtype=float)
+        return float(score_font_sizes(font_sizes)[0])
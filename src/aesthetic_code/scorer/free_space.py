@@ -0,0 +1,157 @@
+"""
+Free space of a slide: maximal empty rectangles and a coarse occupancy grid.
+
+Boxes are (n, 4) arrays of (left, top, right, bottom) in the slide's unit, as
+in `graded_scoring`. Boxes are clipped to the slide.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+import numpy as np
+
+from aesthetic_code.scorer.graded_scoring import BOTTOM, LEFT, RIGHT, TOP
+
+
+def clip_boxes(boxes: np.ndarray, width: float, height: float) -> np.ndarray:
+    """
+    Clips boxes to the slide and drops the ones left with no area.
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    clipped = np.clip(boxes, 0.0, [width, height, width, height])
+    keep = (clipped[:, RIGHT] > clipped[:, LEFT]) & (
+        clipped[:, BOTTOM] > clipped[:, TOP]
+    )
+    return clipped[keep]
+
+
+def maximal_empty_rectangles(
+    boxes: np.ndarray, width: float, height: float, min_size: float = 0.0
+) -> np.ndarray:
+    """
+    Returns the (k, 4) maximal empty rectangles of a slide: rectangles that
+    overlap no box and cannot grow in any direction, sorted by decreasing area.
+    Rectangles narrower or shorter than `min_size` are left out.
+
+    The top edge of a maximal rectangle lies on the slide's top edge or on a
+    box's bottom edge. From each such support, a sweep down over the boxes,
+    sorted once by top edge, narrows the free interval under the support at
+    every box it meets, emitting the rectangle that ends there and continuing
+    on each side of the box that still touches the support.
+
+    The boxes below a support are the ones spanning its height, kept in an
+    active set as the supports move down, followed by the ones starting below
+    it, found by bisection. Each sweep still walks those boxes until its free
+    intervals close, so over the n + 1 supports the worst case is O(n²), as is
+    the number of maximal empty rectangles a slide can have.
+    """
+    boxes = clip_boxes(boxes, width, height)
+    order = np.argsort(boxes[:, TOP], kind="stable")
+    obstacles = boxes[order].tolist()
+    tops = [box[TOP] for box in obstacles]
+
+    supports = [(0.0, 0.0, width)] + sorted(
+        {
+            (bottom, left, right)
+            for left, _, right, bottom in obstacles
+            if bottom < height
+        }
+    )
+    found: set[tuple[float, float, float, float]] = set()
+    # Boxes starting above the current support but reaching below it
+    active: list[list[float]] = []
+    started = 0
+    below: list[list[float]] = []
+    below_y0 = None
+    for y0, support_left, support_right in supports:
+        if y0 != below_y0:
+            # Boxes reaching below the support, in top edge order
+            start = bisect_left(tops, y0)
+            active.extend(obstacles[started:start])
+            started = start
+            active = [box for box in active if box[BOTTOM] > y0]
+            below = active + obstacles[start:]
+            below_y0 = y0
+        # (low, high, position, floor): a free interval, the next box to sweep
+        # and the height at which a box last narrowed the interval
+        stack = [(0.0, width, 0, y0)]
+        while stack:
+            low, high, position, floor = stack.pop()
+            while position < len(below):
+                left, top, right, _ = below[position]
+                position += 1
+                if right <= low or left >= high:
+                    continue
+                bottom = max(top, y0)
+                # Ending where the interval was narrowed, it would not be maximal
+                if bottom > floor:
+                    found.add((low, y0, high, bottom))
+                # Each side goes on only while it still touches the support
+                if left > low and left > support_left and low < support_right:
+                    stack.append((low, left, position, bottom))
+                if right < high and right < support_right and high > support_left:
+                    stack.append((right, high, position, bottom))
+                break
+            else:
+                if height > floor:
+                    found.add((low, y0, high, height))
+
+    if not found:
+        return np.empty((0, 4))
+    rectangles = np.array(sorted(found))
+    sizes = rectangles[:, 2:] - rectangles[:, :2]
+    rectangles = rectangles[(sizes >= min_size).all(axis=1)]
+    areas = np.prod(rectangles[:, 2:] - rectangles[:, :2], axis=1)
+    return rectangles[np.argsort(-areas, kind="stable")]
+
+
+def occupancy_grid(
+    boxes: np.ndarray, width: float, height: float, resolution: int = 100
+) -> np.ndarray:
+    """
+    Rasterises the union of the boxes onto a boolean grid with `resolution`
+    cells along the slide's long side.
+    """
+    scale = resolution / max(width, height)
+    rows, columns = max(1, round(height * scale)), max(1, round(width * scale))
+    grid = np.zeros((rows, columns), dtype=bool)
+    cells = np.rint(clip_boxes(boxes, width, height) * scale).astype(int)
+    for left, top, right, bottom in cells.tolist():
+        grid[top:bottom, left:right] = True
+    return grid
+
+
+def white_space_balance(grid: np.ndarray) -> float:
+    """
+    Scores how centred the free space of an occupancy grid is: 1 when its
+    centroid is the slide's centre, falling to 0 as it reaches an edge. The
+    horizontal and vertical offsets are averaged.
+    """
+    rows, columns = np.nonzero(~grid)
+    if len(rows) == 0:
+        return 0.0
+    height, width = grid.shape
+    offsets = [
+        abs((columns.mean() + 0.5) / width - 0.5),
+        abs((rows.mean() + 0.5) / height - 0.5),
+    ]
+    return float(1.0 - np.mean(offsets) * 2)
+
+
+def white_space_distribution(
+    grid: np.ndarray, regions: tuple[int, int] = (3, 3)
+) -> float:
+    """
+    Scores how evenly the free space of an occupancy grid is spread over a
+    (rows, columns) split of the slide: 1 when every region is equally free,
+    0 when half the regions are empty and the other half full.
+    """
+    free = [
+        1.0 - block.mean()
+        for band in np.array_split(grid, regions[0], axis=0)
+        for block in np.array_split(band, regions[1], axis=1)
+        if block.size
+    ]
+    # The standard deviation of values in [0, 1] is at most 0.5
+    return float(1.0 - np.std(free) * 2)
@@ -0,0 +1,319 @@
+"""
+Vectorised scoring functions behind the scorers' "graded" mode.
+
+Boxes are arrays whose last axis holds (left, top, right, bottom), the order of
+`SegmentTreeNode.bounding_box`, and every function broadcasts over the leading
+axes, e.g. (n_candidates, n_pairs, 4). With `tolerance=0` the functions match the
+discrete thresholds; a positive tolerance replaces each threshold by a Gaussian
+falloff.
+"""
+
+import numpy as np
+
+from aesthetic_code.segmenter.segmenter import PairKind
+
+SCORING_MODES = ("discrete", "graded")
+
+# Pair kind strings of `get_all_neighbor_pairs` to `PairKind` values
+PAIR_KIND_CODES = {kind.label: int(kind) for kind in PairKind}
+
+LEFT, TOP, RIGHT, BOTTOM = 0, 1, 2, 3
+
+_EPSILON = 1e-9
+
+
+def check_scoring_mode(mode: str) -> str:
+    if mode not in SCORING_MODES:
+        raise ValueError(f"Invalid scoring mode: {mode}")
+    return mode
+
+
+def bounding_box_array(bounding_box: dict) -> np.ndarray:
+    return np.array(
+        [
+            bounding_box["left"],
+            bounding_box["top"],
+            bounding_box["right"],
+            bounding_box["bottom"],
+        ],
+        dtype=float,
+    )
+
+
+def band_scores(
+    values: np.ndarray,
+    low: float | np.ndarray,
+    high: float | np.ndarray,
+    tolerance: float | np.ndarray = 0.0,
+    inclusive: bool = True,
+) -> np.ndarray:
+    """
+    Scores how well values fall inside the band [low, high].
+
+    Args:
+        values (np.ndarray): values to score.
+        low, high: band limits, broadcast against `values`.
+        tolerance: width of the Gaussian falloff outside the band, in the units
+            of `values`. Zero gives a step function.
+        inclusive (bool): whether the band limits count as inside when
+            `tolerance` is zero.
+
+    Returns:
+        np.ndarray: scores in [0, 1].
+    """
+    values = np.asarray(values, dtype=float)
+    tolerance = np.asarray(tolerance, dtype=float)
+    if inclusive:
+        inside = (values >= low) & (values <= high)
+    else:
+        inside = (values > low) & (values < high)
+    steps = inside.astype(float)
+    if np.all(tolerance == 0):
+        return steps
+
+    distance = np.maximum(np.maximum(low - values, values - high), 0.0)
+    scale = np.maximum(tolerance, _EPSILON)
+    # Zero tolerances, e.g. in a sweep mixing discrete and graded settings, stay steps
+    return np.where(tolerance == 0, steps, np.exp(-0.5 * (distance / scale) ** 2))
+
+
+def closeness_scores(
+    values1: np.ndarray,
+    values2: np.ndarray,
+    scale: float | np.ndarray = 1.0,
+    tolerance: float | np.ndarray = 0.0,
+) -> np.ndarray:
+    """
+    Scores how close two arrays of values are, relative to `scale`.
+    With `tolerance=0` only exact equality scores 1.
+    """
+    values1 = np.asarray(values1, dtype=float)
+    values2 = np.asarray(values2, dtype=float)
+    tolerance = np.asarray(tolerance, dtype=float)
+    equal = (values1 == values2).astype(float)
+    if np.all(tolerance == 0):
+        return equal
+    difference = np.abs(values1 - values2) / np.maximum(scale * tolerance, _EPSILON)
+    return np.where(tolerance == 0, equal, np.exp(-0.5 * difference**2))
+
+
+def box_widths(boxes: np.ndarray) -> np.ndarray:
+    return boxes[..., RIGHT] - boxes[..., LEFT]
+
+
+def box_heights(boxes: np.ndarray) -> np.ndarray:
+    return boxes[..., BOTTOM] - boxes[..., TOP]
+
+
+def box_gaps(boxes1: np.ndarray, boxes2: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Signed gap between two boxes along an axis (0 for x, 1 for y).
+    Negative gaps are overlaps.
+    """
+    start, end = (LEFT, RIGHT) if axis == 0 else (TOP, BOTTOM)
+    return np.maximum(
+        boxes2[..., start] - boxes1[..., end], boxes1[..., start] - boxes2[..., end]
+    )
+
+
+def alignment_scores(
+    boxes1: np.ndarray, boxes2: np.ndarray, tolerance: float | np.ndarray = 0.0
+) -> np.ndarray:
+    """
+    Scores whether two boxes share both horizontal edges or both vertical edges.
+
+    The tolerance is relative to the mean extent of the two boxes along the
+    compared axis.
+    """
+    boxes1 = np.asarray(boxes1, dtype=float)
+    boxes2 = np.asarray(boxes2, dtype=float)
+    height_scale = (box_heights(boxes1) + box_heights(boxes2)) / 2
+    width_scale = (box_widths(boxes1) + box_widths(boxes2)) / 2
+
+    rows = closeness_scores(
+        boxes1[..., TOP], boxes2[..., TOP], height_scale, tolerance
+    ) * closeness_scores(
+        boxes1[..., BOTTOM], boxes2[..., BOTTOM], height_scale, tolerance
+    )
+    columns = closeness_scores(
+        boxes1[..., LEFT], boxes2[..., LEFT], width_scale, tolerance
+    ) * closeness_scores(boxes1[..., RIGHT], boxes2[..., RIGHT], width_scale, tolerance)
+    return np.maximum(rows, columns)
+
+
+def snapped_alignment_scores(
+    boxes1: np.ndarray, boxes2: np.ndarray, snap: float | np.ndarray = 0.0
+) -> np.ndarray:
+    """
+    Returns 1 where two boxes share both horizontal edges or both vertical
+    edges up to `snap`, an absolute length in the boxes' unit, and 0 elsewhere.
+    """
+    offsets = np.abs(np.asarray(boxes1, dtype=float) - np.asarray(boxes2, dtype=float))
+    rows = (offsets[..., TOP] <= snap) & (offsets[..., BOTTOM] <= snap)
+    columns = (offsets[..., LEFT] <= snap) & (offsets[..., RIGHT] <= snap)
+    return (rows | columns).astype(float)
+
+
+def size_ratios(
+    sizes1: float | np.ndarray, sizes2: float | np.ndarray, epsilon: float = _EPSILON
+) -> np.ndarray:
+    """
+    Returns sizes1 / sizes2 with sizes below `epsilon` clamped to it, so lines
+    and connectors never divide by zero: two zero sizes have a ratio of 1, and
+    a zero size against a positive one a ratio near 0 or infinity.
+    """
+    return np.maximum(sizes1, epsilon) / np.maximum(sizes2, epsilon)
+
+
+def size_comparison_scores(
+    boxes1: np.ndarray,
+    boxes2: np.ndarray,
+    thresholds: tuple = (0.25, 4),
+    tolerance: float | np.ndarray = 0.0,
+) -> np.ndarray:
+    """
+    Scores whether the width and height ratios of two boxes fall within
+    `thresholds`, 0.5 per axis. The tolerance is expressed in natural-log ratio
+    units, so 0.1 is roughly a 10% size difference outside the thresholds.
+    Zero widths and heights are compared through `size_ratios`.
+    """
+    boxes1 = np.asarray(boxes1, dtype=float)
+    boxes2 = np.asarray(boxes2, dtype=float)
+    low, high = np.log(thresholds[0]), np.log(thresholds[1])
+    width_ratios = np.log(size_ratios(box_widths(boxes1), box_widths(boxes2)))
+    height_ratios = np.log(size_ratios(box_heights(boxes1), box_heights(boxes2)))
+    return 0.5 * band_scores(width_ratios, low, high, tolerance) + 0.5 * band_scores(
+        height_ratios, low, high, tolerance
+    )
+
+
+def gap_scores(
+    boxes1: np.ndarray,
+    boxes2: np.ndarray,
+    pair_kinds: np.ndarray,
+    horizontal_band: tuple,
+    vertical_band: tuple,
+    horizontal_tolerance: float | np.ndarray = 0.0,
+    vertical_tolerance: float | np.ndarray = 0.0,
+) -> np.ndarray:
+    """
+    `spacing_scores` with the bands of acceptable gaps and the falloff widths
+    given as absolute lengths in the boxes' unit.
+    """
+    boxes1 = np.asarray(boxes1, dtype=float)
+    boxes2 = np.asarray(boxes2, dtype=float)
+    pair_kinds = np.asarray(pair_kinds)
+
+    horizontal_gaps = box_gaps(boxes1, boxes2, axis=0)
+    vertical_gaps = box_gaps(boxes1, boxes2, axis=1)
+
+    def score_horizontal(gaps: np.ndarray) -> np.ndarray:
+        low, high = horizontal_band
+        return band_scores(gaps, low, high, horizontal_tolerance, False)
+
+    def score_vertical(gaps: np.ndarray) -> np.ndarray:
+        low, high = vertical_band
+        return band_scores(gaps, low, high, vertical_tolerance, False)
+
+    # belongs_to pairs count overlapping axes as a zero gap
+    segment_scores = 0.5 * score_horizontal(
+        np.maximum(horizontal_gaps, 0.0)
+    ) + 0.5 * score_vertical(np.maximum(vertical_gaps, 0.0))
+
+    return np.select(
+        [
+            pair_kinds == PAIR_KIND_CODES["vertical"],
+            pair_kinds == PAIR_KIND_CODES["horizontal"],
+        ],
+        [score_horizontal(horizontal_gaps), score_vertical(vertical_gaps)],
+        default=segment_scores,
+    )
+
+
+def spacing_scores(
+    boxes1: np.ndarray,
+    boxes2: np.ndarray,
+    pair_kinds: np.ndarray,
+    slide_width: float,
+    slide_height: float,
+    spacing_threshold: tuple | list = (0.1, 0.3),
+    tolerance: float = 0.0,
+) -> np.ndarray:
+    """
+    Scores the spacing of neighbour pairs as `GroupSpacingScorer` does.
+
+    Args:
+        boxes1, boxes2 (np.ndarray): boxes of the two members of each pair.
+        pair_kinds (np.ndarray): `PAIR_KIND_CODES` of each pair. Horizontal pairs
+            are scored on their vertical gap, vertical pairs on their horizontal
+            gap and belongs_to pairs on both, 0.5 per axis. Overlapping
+            horizontal and vertical pairs score 0 instead of raising.
+        slide_width, slide_height (float): slide size in the boxes' unit.
+        spacing_threshold: band of acceptable gaps relative to the slide size.
+        tolerance (float): falloff width relative to the slide size.
+    """
+    low, high = spacing_threshold
+    return gap_scores(
+        boxes1,
+        boxes2,
+        pair_kinds,
+        (low * slide_width, high * slide_width),
+        (low * slide_height, high * slide_height),
+        tolerance * slide_width,
+        tolerance * slide_height,
+    )
+
+
+def margin_band_scores(
+    bounding_boxes: np.ndarray,
+    slide_width: float,
+    slide_height: float,
+    horizontal_band: tuple,
+    vertical_band: tuple,
+    horizontal_tolerance: float | np.ndarray = 0.0,
+    vertical_tolerance: float | np.ndarray = 0.0,
+) -> np.ndarray:
+    """
+    `margin_scores` with the bands of acceptable margins and the falloff widths
+    given as absolute lengths.
+    """
+    bounding_boxes = np.asarray(bounding_boxes, dtype=float)
+    horizontal_low, horizontal_high = horizontal_band
+    vertical_low, vertical_high = vertical_band
+    scores = np.zeros(())
+    for margin in (bounding_boxes[..., LEFT], slide_width - bounding_boxes[..., RIGHT]):
+        scores = scores + band_scores(
+            margin, horizontal_low, horizontal_high, horizontal_tolerance
+        )
+    for margin in (
+        bounding_boxes[..., TOP],
+        slide_height - bounding_boxes[..., BOTTOM],
+    ):
+        scores = scores + band_scores(
+            margin, vertical_low, vertical_high, vertical_tolerance
+        )
+    return scores / 4
+
+
+def margin_scores(
+    bounding_boxes: np.ndarray,
+    slide_width: float,
+    slide_height: float,
+    margin_threshold: tuple = (0.1, 0.3),
+    tolerance: float = 0.0,
+) -> np.ndarray:
+    """
+    Scores the four margins around the global bounding boxes of layouts as
+    `MarginWhiteSpaceScorer` does, 0.25 per margin. The tolerance is relative
+    to the slide size.
+    """
+    low, high = margin_threshold
+    return margin_band_scores(
+        bounding_boxes,
+        slide_width,
+        slide_height,
+        (low * slide_width, high * slide_width),
+        (low * slide_height, high * slide_height),
+        tolerance * slide_width,
+        tolerance * slide_height,
+    )
@@ -1,29 +1,25 @@
-from typing import TypeAlias, Union, cast
-
-from pptx.shapes.autoshape import Shape as AutoShape
-from pptx.shapes.base import BaseShape
-from pptx.shapes.connector import Connector
-from pptx.shapes.graphfrm import GraphicFrame
-from pptx.shapes.group import GroupShape
-from pptx.shapes.picture import Movie, Picture
-from pptx.shapes.placeholder import BasePlaceholder
-from pptx.util import Length
-
-from aesthetic_code.segmenter.segmenter import SegmentTreeNode, get_all_neighbor_pairs
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+
+from aesthetic_code.scorer.config import ScoringConfig, ScoringPlan
+from aesthetic_code.scorer.graded_scoring import (
+    PAIR_KIND_CODES,
+    check_scoring_mode,
+    gap_scores,
+)
+from aesthetic_code.segmenter.segmenter import (
+    SegmentTreeNode,
+    Subregion,
+    get_all_neighbor_pairs,
+)
+from aesthetic_code.shape_types import Shape
 from aesthetic_code.utils import unit_conversion
 
-Shape: TypeAlias = Union[
-    BaseShape,
-    AutoShape,
-    Connector,
-    GraphicFrame,
-    GroupShape,
-    Picture,
-    Movie,
-    BasePlaceholder,
-]
-
-Subregion: TypeAlias = Union[Shape, "SegmentTreeNode"]
+if TYPE_CHECKING:
+    from pptx.util import Length
 
 
 class GroupSpacingScorer:
@@ -39,13 +35,46 @@ class GroupSpacingScorer:
         segment_tree: SegmentTreeNode,
         spacing_threshold: list[float] = [0.1, 0.3],
         unit_measurement: str = "pt",
+        mode: str = "discrete",
+        tolerance: float = 0.05,
+        plan: ScoringPlan | None = None,
     ):
+        """
+        Args:
+            mode (str): "discrete" scores spacings inside the thresholds as 1,
+                "graded" scores spacings outside them smoothly.
+            tolerance (float): graded falloff width, relative to the slide size.
+            plan (ScoringPlan | None): spacing bands and tolerances resolved for
+                the slide size, used instead of the thresholds, `mode` and
+                `tolerance`, and kept when the setters change them.
+        """
         self._segment_tree = segment_tree
+        self._mode = check_scoring_mode(mode)
+        self._tolerance = tolerance
         self._neighbor_pairs = get_all_neighbor_pairs(segment_tree)
         self._spacing_threshold = spacing_threshold
         self._unit_measurement = unit_measurement
         self._slide_width = slide_width
         self._slide_height = slide_height
+        self._given_plan = plan
+        self._plan: ScoringPlan | None = plan
+
+    @property
+    def plan(self) -> ScoringPlan:
+        """
+        Absolute spacing cutoffs for the slide size, resolved on first use and
+        again only after a setter changes the thresholds, unit or slide size.
+        """
+        if self._plan is None:
+            low, high = self._spacing_threshold
+            self._plan = ScoringConfig(
+                spacing_threshold=(low, high),
+                spacing_tolerance=self._tolerance,
+            ).plan(
+                unit_conversion(self._slide_width, self._unit_measurement),
+                unit_conversion(self._slide_height, self._unit_measurement),
+            )
+        return self._plan
 
     @property
     def spacing_threshold(self) -> list[float]:
@@ -54,6 +83,7 @@ class GroupSpacingScorer:
     @spacing_threshold.setter
     def spacing_threshold(self, value: list[float]):
         self._spacing_threshold = value
+        self._plan = self._given_plan
 
     @property
     def unit_measurement(self) -> str:
@@ -62,6 +92,7 @@ class GroupSpacingScorer:
     @unit_measurement.setter
     def unit_measurement(self, value: str):
         self._unit_measurement = value
+        self._plan = self._given_plan
 
     @property
     def slide_width(self) -> Length:
@@ -70,6 +101,7 @@ class GroupSpacingScorer:
     @slide_width.setter
     def slide_width(self, value: Length):
         self._slide_width = value
+        self._plan = self._given_plan
 
     @property
     def slide_height(self) -> Length:
@@ -78,18 +110,66 @@ class GroupSpacingScorer:
     @slide_height.setter
     def slide_height(self, value: Length):
         self._slide_height = value
+        self._plan = self._given_plan
 
     def score(self) -> float:
         """
         Calculate the overall white space score for the segment tree.
         The score is based on the spacing between the groups of shapes.
         """
+        # Zero plan tolerances give the discrete scores
+        if self._mode == "graded" or self._given_plan is not None:
+            return float(np.mean(self._score_pairs_graded()))
+
         scores = []
         for pair in self._neighbor_pairs:
             scores.append(self._score_pair(pair))
 
         return sum(scores) / len(scores)
 
+    def _get_subregion_box(self, subregion: Subregion) -> list[float]:
+        if isinstance(subregion, SegmentTreeNode):
+            bounding_box = subregion.bounding_box
+            return [
+                bounding_box["left"],
+                bounding_box["top"],
+                bounding_box["right"],
+                bounding_box["bottom"],
+            ]
+        shape = cast(Shape, subregion)
+        left = unit_conversion(shape.left, self._unit_measurement)
+        top = unit_conversion(shape.top, self._unit_measurement)
+        return [
+            left,
+            top,
+            left + unit_conversion(shape.width, self._unit_measurement),
+            top + unit_conversion(shape.height, self._unit_measurement),
+        ]
+
+    def _score_pairs_graded(self) -> np.ndarray:
+        """
+        Scores all neighbour pairs at once with `gap_scores`.
+        """
+        boxes1 = np.array(
+            [self._get_subregion_box(pair[1]) for pair in self._neighbor_pairs]
+        )
+        boxes2 = np.array(
+            [self._get_subregion_box(pair[2]) for pair in self._neighbor_pairs]
+        )
+        pair_kinds = np.array(
+            [PAIR_KIND_CODES[pair[0]] for pair in self._neighbor_pairs]
+        )
+        plan = self.plan
+        return gap_scores(
+            boxes1.reshape(-1, 4),
+            boxes2.reshape(-1, 4),
+            pair_kinds,
+            plan.horizontal_spacing,
+            plan.vertical_spacing,
+            plan.horizontal_spacing_tolerance,
+            plan.vertical_spacing_tolerance,
+        )
+
     def _score_pair(self, pair: tuple[str, Subregion, Subregion]) -> float:
         """
         Calculate the white space score between two subregions.
@@ -149,20 +229,14 @@ class GroupSpacingScorer:
 
         score = 0.0
 
-        if horizontal_spacing <= self._spacing_threshold[0] * unit_conversion(
-            self._slide_width, self._unit_measurement
-        ) or horizontal_spacing >= self._spacing_threshold[1] * unit_conversion(
-            self._slide_width, self._unit_measurement
-        ):
+        low, high = self.plan.horizontal_spacing
+        if horizontal_spacing <= low or horizontal_spacing >= high:
             score += 0.0
         else:
             score += 0.5
 
-        if vertical_spacing <= self._spacing_threshold[0] * unit_conversion(
-            self._slide_height, self._unit_measurement
-        ) or vertical_spacing >= self._spacing_threshold[1] * unit_conversion(
-            self._slide_height, self._unit_measurement
-        ):
+        low, high = self.plan.vertical_spacing
+        if vertical_spacing <= low or vertical_spacing >= high:
             score += 0.0
         else:
             score += 0.5
@@ -205,11 +279,8 @@ class GroupSpacingScorer:
         else:
             raise ValueError("Overlapping subregions in horizontal spacing calculation")
 
-        if spacing <= self._spacing_threshold[0] * unit_conversion(
-            self._slide_width, self._unit_measurement
-        ) or spacing >= self._spacing_threshold[1] * unit_conversion(
-            self._slide_width, self._unit_measurement
-        ):
+        low, high = self.plan.horizontal_spacing
+        if spacing <= low or spacing >= high:
             return 0.0
         else:
             return 1.0
@@ -250,11 +321,8 @@ class GroupSpacingScorer:
         else:
             raise ValueError("Overlapping subregions in vertical spacing calculation")
 
-        if spacing <= self._spacing_threshold[0] * unit_conversion(
-            self._slide_height, self._unit_measurement
-        ) or spacing >= self._spacing_threshold[1] * unit_conversion(
-            self._slide_height, self._unit_measurement
-        ):
+        low, high = self.plan.vertical_spacing
+        if spacing <= low or spacing >= high:
             return 0.0
         else:
             return 1.0
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Iterator
+
+import numpy as np
+
+from aesthetic_code.scorer.slide_scorer import SLIDE_SCORES
+
+if TYPE_CHECKING:
+    from aesthetic_code.storage.score_index import ScoreIndex
+
+# Each rule score is a value and a flag for whether it applied to the slide
+FEATURE_NAMES = (
+    *SLIDE_SCORES,
+    *(f"{name}_missing" for name in SLIDE_SCORES),
+    "log_shape_count",
+)
+
+
+def slide_features(results: list[dict]) -> np.ndarray:
+    """
+    Returns the (n_slides, len(FEATURE_NAMES)) feature matrix of slide results
+    as returned by `PowerPointScorer.score_slide` or stored in a `ScoreIndex`.
+    Scores that do not apply to a slide are 0 with their missing flag set.
+    """
+    scores = np.array(
+        [[result.get(name) for name in SLIDE_SCORES] for result in results],
+        dtype=float,
+    ).reshape(-1, len(SLIDE_SCORES))
+    missing = np.isnan(scores)
+    shape_counts = np.array(
+        [result.get("shape_count") or 0 for result in results], dtype=float
+    )
+    return np.hstack(
+        [
+            np.where(missing, 0.0, scores),
+            missing.astype(float),
+            np.log1p(shape_counts).reshape(-1, 1),
+        ]
+    )
+
+
+def _join_embeddings(
+    features: np.ndarray, embeddings: np.ndarray | None, embedding_dim: int
+) -> np.ndarray:
+    if embedding_dim == 0:
+        return features
+    if embeddings is None:
+        embeddings = np.zeros((len(features), embedding_dim))
+    embeddings = np.asarray(embeddings, dtype=float).reshape(len(features), -1)
+    if embeddings.shape[1] != embedding_dim:
+        raise ValueError(
+            f"Expected {embedding_dim}-dimensional embeddings, "
+            f"got {embeddings.shape[1]}"
+        )
+    # Slides without an image embedding get the average (zero) contribution
+    return np.hstack([features, np.nan_to_num(embeddings)])
+
+
+class PreferenceModel:
+    """
+    Logistic model of human preference over the rule scores of a slide and,
+    optionally, an image embedding such as CLIP's, as in Aesthetics++.
+
+    Inference is a single matrix product in numpy, so scoring needs neither
+    scikit-learn nor torch and runs on CPU at millions of slides per minute.
+    scikit-learn is only imported to fit a model.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: float = 0.0,
+        mean: np.ndarray | None = None,
+        scale: np.ndarray | None = None,
+        embedding_dim: int = 0,
+    ):
+        """
+        Args:
+            weights (np.ndarray): one weight per feature of `FEATURE_NAMES`,
+                followed by one per embedding dimension.
+            mean (np.ndarray | None), scale (np.ndarray | None): standardisation
+                of the rule features, applied before the weights.
+            embedding_dim (int): embedding length, 0 for rule scores only.
+        """
+        n_features = len(FEATURE_NAMES) + embedding_dim
+        self.weights = np.asarray(weights, dtype=float).reshape(n_features)
+        self.bias = float(bias)
+        self.mean = np.zeros(len(FEATURE_NAMES)) if mean is None else np.asarray(mean)
+        self.scale = np.ones(len(FEATURE_NAMES)) if scale is None else np.asarray(scale)
+        self.embedding_dim = embedding_dim
+
+    def decision_function(
+        self, features: np.ndarray, embeddings: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Returns the preference logits of an (n_slides, len(FEATURE_NAMES))
+        feature matrix and optional (n_slides, embedding_dim) embeddings.
+        """
+        features = (np.asarray(features, dtype=float) - self.mean) / self.scale
+        inputs = _join_embeddings(features, embeddings, self.embedding_dim)
+        return inputs @ self.weights + self.bias
+
+    def predict(
+        self,
+        features: np.ndarray,
+        embeddings: np.ndarray | None = None,
+        batch_size: int = 65536,
+    ) -> np.ndarray:
+        """
+        Returns the probability that each slide is preferred, computed in
+        batches of `batch_size` slides to bound memory.
+        """
+        features = np.asarray(features, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        scores = np.empty(len(features))
+        for start in range(0, len(features), batch_size):
+            stop = start + batch_size
+            logits = self.decision_function(
+                features[start:stop],
+                None if embeddings is None else embeddings[start:stop],
+            )
+            scores[start:stop] = 1.0 / (1.0 + np.exp(-logits))
+        return scores
+
+    def predict_results(
+        self, results: list[dict], embeddings: np.ndarray | None = None
+    ) -> np.ndarray:
+        return self.predict(slide_features(results), embeddings)
+
+    def score_index(
+        self,
+        index: ScoreIndex,
+        embed: Callable[[list[dict]], np.ndarray] | None = None,
+        batch_size: int = 10_000,
+    ) -> Iterator[tuple[str, int, float]]:
+        """
+        Yields (deck, slide_index, preference) for every slide of a score index.
+
+        The index holds the rule scores computed once per slide, so a corpus is
+        re-scored with a new model without reopening any deck.
+
+        Args:
+            embed (Callable | None): returns the (n, embedding_dim) embeddings
+                of a batch of index rows, typically from an embedding cache.
+        """
+        for rows in index.iter_batches(batch_size):
+            embeddings = None if embed is None else embed(rows)
+            scores = self.predict(slide_features(rows), embeddings, batch_size)
+            for row, score in zip(rows, scores.tolist()):
+                yield row["deck"], row["slide_index"], score
+
+    @classmethod
+    def fit(
+        cls,
+        features: np.ndarray,
+        labels: np.ndarray,
+        embeddings: np.ndarray | None = None,
+        regularization: float = 1.0,
+    ) -> PreferenceModel:
+        """
+        Fits a model to slides labelled 1 if people preferred them, else 0.
+        """
+        from sklearn.linear_model import LogisticRegression
+
+        features = np.asarray(features, dtype=float)
+        mean, scale = _standardisation(features)
+        embedding_dim = 0 if embeddings is None else np.shape(embeddings)[1]
+        inputs = _join_embeddings((features - mean) / scale, embeddings, embedding_dim)
+        classifier = LogisticRegression(C=regularization, max_iter=1000)
+        classifier.fit(inputs, np.asarray(labels))
+        return cls(
+            classifier.coef_[0], classifier.intercept_[0], mean, scale, embedding_dim
+        )
+
+    @classmethod
+    def fit_pairs(
+        cls,
+        preferred: np.ndarray,
+        rejected: np.ndarray,
+        preferred_embeddings: np.ndarray | None = None,
+        rejected_embeddings: np.ndarray | None = None,
+        regularization: float = 1.0,
+    ) -> PreferenceModel:
+        """
+        Fits a model to pairwise judgements, row i of `preferred` having been
+        chosen over row i of `rejected`, e.g. two refinements of one slide.
+        Only feature differences matter, so the model has no bias.
+        """
+        from sklearn.linear_model import LogisticRegression
+
+        preferred = np.asarray(preferred, dtype=float)
+        rejected = np.asarray(rejected, dtype=float)
+        mean, scale = _standardisation(np.vstack([preferred, rejected]))
+        embedding_dim = (
+            0 if preferred_embeddings is None else np.shape(preferred_embeddings)[1]
+        )
+        differences = _join_embeddings(
+            (preferred - rejected) / scale,
+            (
+                None
+                if preferred_embeddings is None or rejected_embeddings is None
+                else np.nan_to_num(preferred_embeddings)
+                - np.nan_to_num(rejected_embeddings)
+            ),
+            embedding_dim,
+        )
+        # Each judgement is shown both ways round so the classes are balanced
+        inputs = np.vstack([differences, -differences])
+        labels = np.repeat([1, 0], len(differences))
+        classifier = LogisticRegression(
+            C=regularization, fit_intercept=False, max_iter=1000
+        )
+        classifier.fit(inputs, labels)
+        return cls(classifier.coef_[0], 0.0, mean, scale, embedding_dim)
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            mean=self.mean,
+            scale=self.scale,
+            embedding_dim=self.embedding_dim,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> PreferenceModel:
+        with np.load(path) as data:
+            return cls(
+                data["weights"],
+                float(data["bias"]),
+                data["mean"],
+                data["scale"],
+                int(data["embedding_dim"]),
+            )
+
+
+def _standardisation(features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    mean = features.mean(axis=0)
+    scale = features.std(axis=0)
+    # Constant features, such as a score that always applies, are left unscaled
+    return mean, np.where(scale > 0, scale, 1.0)
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, NamedTuple, cast
+
+import numpy as np
+
+from aesthetic_code.scorer.config import ScoringConfig, score_margins, score_pairs
+from aesthetic_code.scorer.font_hierarchy_scorer import (
+    FONT_ROLES,
+    PowerPointFontHierarchyScorer,
+    score_font_sizes,
+)
+from aesthetic_code.scorer.graded_scoring import (
+    BOTTOM,
+    LEFT,
+    RIGHT,
+    TOP,
+    bounding_box_array,
+)
+from aesthetic_code.scorer.slide_scorer import SLIDE_SCORES
+from aesthetic_code.segmenter.segmenter import (
+    Segmenter,
+    SegmentTreeNode,
+    iter_neighbor_pairs,
+)
+from aesthetic_code.shape_types import Shape
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+
+PAIR_SCORES = ("group_spacing", "alignment", "size_comparison")
+
+
+class PairRecord(NamedTuple):
+    """
+    Scores of one neighbour pair of a segment tree, with the boxes they were
+    computed from as (left, top, right, bottom) and the names of the shapes
+    each member covers.
+    """
+
+    kind: str
+    shapes1: tuple[str, ...]
+    shapes2: tuple[str, ...]
+    box1: tuple[float, ...]
+    box2: tuple[float, ...]
+    group_spacing: float
+    alignment: float
+    size_comparison: float
+
+
+class SlideReport:
+    """
+    Everything the scorers computed for a slide: the five slide scores, every
+    neighbour pair's scores, the margins and the font sizes per role.
+    """
+
+    def __init__(
+        self,
+        slide_index: int,
+        slide_id: int,
+        shape_count: int,
+        scores: dict[str, float | None],
+        pairs: list[PairRecord],
+        margins: dict[str, float] | None,
+        font_sizes: dict[str, float | None],
+    ):
+        self.slide_index = slide_index
+        self.slide_id = slide_id
+        self.shape_count = shape_count
+        self.scores = scores
+        self.pairs = pairs
+        self.margins = margins
+        self.font_sizes = font_sizes
+
+    def worst_pairs(self, score: str, count: int = 5) -> list[PairRecord]:
+        """
+        Returns the `count` pairs with the lowest value of a pair score, see
+        `PAIR_SCORES`.
+        """
+        if score not in PAIR_SCORES:
+            raise ValueError(f"Invalid pair score: {score}")
+        return sorted(self.pairs, key=lambda pair: getattr(pair, score))[:count]
+
+    def to_dict(self) -> dict:
+        return {
+            "slide_index": self.slide_index,
+            "slide_id": self.slide_id,
+            "shape_count": self.shape_count,
+            **self.scores,
+            "pairs": [pair._asdict() for pair in self.pairs],
+            "margins": self.margins,
+            "font_sizes": self.font_sizes,
+        }
+
+
+class SlideReportBuilder:
+    """
+    Builds `SlideReport`s, scoring all neighbour pairs of a slide from a single
+    `iter_neighbor_pairs` traversal with the vectorised scoring functions.
+    With the default discrete mode the slide scores match `PowerPointScorer`,
+    except that overlapping neighbours score 0 instead of raising.
+    """
+
+    def __init__(
+        self,
+        presentation: Presentation,
+        measurement_unit: str = "pt",
+        mode: str = "discrete",
+        tolerances: dict[str, float] | None = None,
+        spacing_threshold: list[float] = [0.1, 0.3],
+        size_thresholds: tuple = (0.25, 4),
+        margin_threshold: tuple = (0.1, 0.3),
+    ):
+        slide_width, slide_height = presentation.slide_width, presentation.slide_height
+        if slide_width is None or slide_height is None:
+            raise ValueError("Presentation has no slide size")
+        self._presentation = presentation
+        self._measurement_unit = measurement_unit
+        self._slide_width = slide_width
+        self._slide_height = slide_height
+        self._width = unit_conversion(slide_width, measurement_unit)
+        self._height = unit_conversion(slide_height, measurement_unit)
+        self._plan = ScoringConfig.from_mode(
+            mode,
+            tolerances,
+            spacing_threshold=spacing_threshold,
+            size_thresholds=size_thresholds,
+            margin_threshold=margin_threshold,
+        ).plan(self._width, self._height)
+        self._font_hierarchy_scorer = PowerPointFontHierarchyScorer(
+            presentation, measurement_unit
+        )
+
+    def _shape_names(self, node: SegmentTreeNode, names: dict) -> tuple[str, ...]:
+        # Memoised by node, so each node's shapes are gathered once per slide
+        if id(node) not in names:
+            if node.is_leaf():
+                shapes = cast(list[Shape], node.subregions)
+                names[id(node)] = tuple(shape.name for shape in shapes)
+            else:
+                names[id(node)] = tuple(
+                    name
+                    for subregion in node.subregions
+                    for name in self._shape_names(
+                        cast(SegmentTreeNode, subregion), names
+                    )
+                )
+        return names[id(node)]
+
+    def _score_pairs(self, segment_tree: SegmentTreeNode) -> list[PairRecord]:
+        pairs = [
+            (
+                pair.kind,
+                cast(SegmentTreeNode, pair.first),
+                cast(SegmentTreeNode, pair.second),
+            )
+            for pair in iter_neighbor_pairs(segment_tree)
+        ]
+        if not pairs:
+            return []
+        boxes1 = np.array([bounding_box_array(pair[1].bounding_box) for pair in pairs])
+        boxes2 = np.array([bounding_box_array(pair[2].bounding_box) for pair in pairs])
+        pair_kinds = np.array([pair[0] for pair in pairs], dtype=np.int64)
+
+        pair_scores = score_pairs(self._plan, boxes1, boxes2, pair_kinds)
+
+        names: dict[int, tuple[str, ...]] = {}
+        return [
+            PairRecord(
+                kind=kind.label,
+                shapes1=self._shape_names(node1, names),
+                shapes2=self._shape_names(node2, names),
+                box1=tuple(box1),
+                box2=tuple(box2),
+                group_spacing=spacing,
+                alignment=aligned,
+                size_comparison=size,
+            )
+            for (kind, node1, node2), box1, box2, spacing, aligned, size in zip(
+                pairs,
+                boxes1.tolist(),
+                boxes2.tolist(),
+                pair_scores["group_spacing"].tolist(),
+                pair_scores["alignment"].tolist(),
+                pair_scores["size_comparison"].tolist(),
+            )
+        ]
+
+    def _margins(self, segment_tree: SegmentTreeNode) -> dict[str, float]:
+        # The root box covers every shape, clamped as in MarginWhiteSpaceScorer
+        box = bounding_box_array(segment_tree.bounding_box)
+        return {
+            "left": float(min(box[LEFT], self._width)),
+            "top": float(min(box[TOP], self._height)),
+            "right": float(self._width - max(box[RIGHT], 0.0)),
+            "bottom": float(self._height - max(box[BOTTOM], 0.0)),
+        }
+
+    def report(self, slide_index: int) -> SlideReport:
+        slide = self._presentation.slides[slide_index]
+        shapes = list(slide.shapes)
+        scores: dict[str, float | None] = {name: None for name in SLIDE_SCORES}
+        pairs: list[PairRecord] = []
+        margins = None
+        if shapes:
+            segment_tree = Segmenter(
+                shapes, self._slide_width, self._slide_height, self._measurement_unit
+            ).segment()
+            pairs = self._score_pairs(segment_tree)
+            for name in PAIR_SCORES:
+                if pairs:
+                    values = [getattr(pair, name) for pair in pairs]
+                    scores[name] = sum(values) / len(values)
+            margins = self._margins(segment_tree)
+            bounding_box = np.array(
+                [
+                    margins["left"],
+                    margins["top"],
+                    self._width - margins["right"],
+                    self._height - margins["bottom"],
+                ]
+            )
+            scores["white_space"] = float(score_margins(self._plan, bounding_box))
+
+        font_sizes = self._font_hierarchy_scorer.extract_slide_font_sizes(slide_index)
+        font_hierarchy = float(score_font_sizes(np.array([font_sizes]))[0])
+        scores["font_hierarchy"] = (
+            None if math.isnan(font_hierarchy) else font_hierarchy
+        )
+
+        return SlideReport(
+            slide_index=slide_index,
+            slide_id=slide.slide_id,
+            shape_count=len(shapes),
+            scores=scores,
+            pairs=pairs,
+            margins=margins,
+            font_sizes={
+                role: None if math.isnan(size) else size
+                for role, size in zip(FONT_ROLES, font_sizes)
+            },
+        )
+
+    def report_all(self) -> list[SlideReport]:
+        return [self.report(index) for index in range(len(self._presentation.slides))]
@@ -1,4 +1,20 @@
-from aesthetic_code.segmenter.segmenter import SegmentTreeNode
+from typing import Iterable
+
+import numpy as np
+
+from aesthetic_code.scorer.config import ScoringPlan
+from aesthetic_code.scorer.graded_scoring import (
+    PAIR_KIND_CODES,
+    bounding_box_array,
+    check_scoring_mode,
+    size_comparison_scores,
+    size_ratios,
+)
+from aesthetic_code.segmenter.segmenter import (
+    NeighborPair,
+    SegmentTreeNode,
+    iter_neighbor_pairs,
+)
 
 
 class SizeComparisonScorer:
@@ -7,10 +23,19 @@ class SizeComparisonScorer:
         segment_node1: SegmentTreeNode,
         segment_node2: SegmentTreeNode,
         thresholds: tuple = (0.25, 4),
+        mode: str = "discrete",
+        tolerance: float = 0.1,
     ):
+        """
+        Args:
+            mode (str): "discrete" or "graded", see `size_comparison_scores`.
+            tolerance (float): graded falloff width in natural-log ratio units.
+        """
         self._segment_node1 = segment_node1
         self._segment_node2 = segment_node2
         self._thresholds = thresholds
+        self._mode = check_scoring_mode(mode)
+        self._tolerance = tolerance
 
     def get_width(self, segment_node: SegmentTreeNode) -> float:
         return segment_node.bounding_box["right"] - segment_node.bounding_box["left"]
@@ -22,6 +47,15 @@ class SizeComparisonScorer:
         """
         Returns a score for the size comparison of two segment nodes.
         """
+        if self._mode == "graded":
+            return float(
+                size_comparison_scores(
+                    bounding_box_array(self._segment_node1.bounding_box),
+                    bounding_box_array(self._segment_node2.bounding_box),
+                    self._thresholds,
+                    self._tolerance,
+                )
+            )
         return self._score_size_comparison(self._segment_node1, self._segment_node2)
 
     def _score_size_comparison(
@@ -30,24 +64,82 @@ class SizeComparisonScorer:
         """
         Returns a score for the size comparison of two segment nodes.
         """
-        width_segment_node1 = self.get_width(segment_node1)
-        height_segment_node1 = self.get_height(segment_node1)
-
-        width_segment_node2 = self.get_width(segment_node2)
-        height_segment_node2 = self.get_height(segment_node2)
+        # Lines and connectors have a zero width or height
+        width_ratio = float(
+            size_ratios(self.get_width(segment_node1), self.get_width(segment_node2))
+        )
+        height_ratio = float(
+            size_ratios(self.get_height(segment_node1), self.get_height(segment_node2))
+        )
 
         score = 0.0
 
-        if (
-            width_segment_node1 / width_segment_node2 >= self._thresholds[0]
-            and width_segment_node1 / width_segment_node2 <= self._thresholds[1]
-        ):
+        if self._thresholds[0] <= width_ratio <= self._thresholds[1]:
             score += 0.5
 
-        if (
-            height_segment_node1 / height_segment_node2 >= self._thresholds[0]
-            and height_segment_node1 / height_segment_node2 <= self._thresholds[1]
-        ):
+        if self._thresholds[0] <= height_ratio <= self._thresholds[1]:
             score += 0.5
 
         return score
+
+
+class SlideSizeComparisonScorer:
+    """
+    Scores the size comparison of every neighbour pair of a segment tree in one
+    vectorised pass with `size_comparison_scores`, which compares log size
+    ratios and never divides by zero. With `tolerance=0` the pair scores equal
+    the discrete `SizeComparisonScorer`.
+    """
+
+    def __init__(
+        self,
+        segment_tree: SegmentTreeNode,
+        thresholds: tuple = (0.25, 4),
+        tolerance: float = 0.0,
+        neighbor_pairs: Iterable[NeighborPair] | None = None,
+        plan: ScoringPlan | None = None,
+    ):
+        """
+        Args:
+            tolerance (float): graded falloff width in natural-log ratio units.
+            neighbor_pairs (Iterable[NeighborPair] | None): `iter_neighbor_pairs`
+                of the tree, if already computed; consumed once.
+            plan (ScoringPlan | None): gives the thresholds and tolerance
+                instead, when scoring under a `ScoringConfig`.
+        """
+        if neighbor_pairs is None:
+            neighbor_pairs = iter_neighbor_pairs(segment_tree)
+        self._thresholds = thresholds if plan is None else plan.size_thresholds
+        self._tolerance = tolerance if plan is None else plan.size_tolerance
+        pair_kinds, boxes1, boxes2 = [], [], []
+        for pair in neighbor_pairs:
+            pair_kinds.append(pair.kind)
+            boxes1.append(bounding_box_array(pair.first.bounding_box))  # type: ignore[union-attr]
+            boxes2.append(bounding_box_array(pair.second.bounding_box))  # type: ignore[union-attr]
+        self._pair_kinds = np.array(pair_kinds, dtype=np.int64)
+        self._boxes1 = np.array(boxes1).reshape(-1, 4)
+        self._boxes2 = np.array(boxes2).reshape(-1, 4)
+
+    @property
+    def pair_kinds(self) -> np.ndarray:
+        """
+        The `PAIR_KIND_CODES` of the neighbour pairs, in `pair_scores` order.
+        """
+        return self._pair_kinds
+
+    def pair_scores(self) -> np.ndarray:
+        return size_comparison_scores(
+            self._boxes1, self._boxes2, self._thresholds, self._tolerance
+        )
+
+    def score(self, pair_kind: str | None = None) -> float:
+        """
+        Returns the mean pair score, over the pairs of one kind if given (e.g.
+        "horizontal" and "vertical" compare siblings), NaN without pairs.
+        """
+        scores = self.pair_scores()
+        if pair_kind is not None:
+            scores = scores[self._pair_kinds == PAIR_KIND_CODES[pair_kind]]
+        if not len(scores):
+            return float("nan")
+        return float(scores.mean())
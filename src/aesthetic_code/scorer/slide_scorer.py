@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Callable, NamedTuple, TypeVar
+
+from aesthetic_code.scorer.alignment_scorer import SlideAlignmentScorer
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.font_hierarchy_scorer import PowerPointFontHierarchyScorer
+from aesthetic_code.scorer.group_spacing_scorer import GroupSpacingScorer
+from aesthetic_code.scorer.size_comparison_scorer import SlideSizeComparisonScorer
+from aesthetic_code.scorer.white_space_scorer import MarginWhiteSpaceScorer
+from aesthetic_code.segmenter.fingerprint import LayoutCache, slide_fingerprint
+from aesthetic_code.segmenter.segmenter import Segmenter, iter_neighbor_pairs
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+
+T = TypeVar("T")
+
+SLIDE_SCORES = (
+    "group_spacing",
+    "alignment",
+    "size_comparison",
+    "white_space",
+    "font_hierarchy",
+)
+
+
+class ScorerError(NamedTuple):
+    """
+    An exception raised by one stage of scoring, recorded instead of raised.
+    `stage` is a scorer name from `SLIDE_SCORES`, or "fingerprint",
+    "segmenter", "slide" or "open".
+    """
+
+    stage: str
+    error_type: str
+    message: str
+
+    @classmethod
+    def from_exception(cls, stage: str, error: Exception) -> ScorerError:
+        return cls(stage, type(error).__name__, str(error))
+
+
+class PowerPointScorer:
+    """
+    Runs the segmenter and all five scorers over the slides of a presentation.
+
+    Each slide is summarised as a flat dict with one entry per name in
+    `SLIDE_SCORES`; scores that do not apply to a slide (no shapes, a single
+    segment, fewer than two text roles) are None.
+
+    Geometric scores are cached by layout fingerprint, so slides repeating a
+    layout are only segmented and scored once. Pass the same `layout_cache` to
+    the scorers of several decks to reuse them across a corpus; scorers with
+    different configs keep apart entries in a shared cache.
+
+    `config` holds the thresholds and tolerances of the geometric scorers,
+    resolved once for the slide size; the default gives the discrete scores.
+
+    With `isolate_errors`, an exception in one scorer, such as the segmenter
+    rejecting a slide or a division by zero, is recorded in the slide's
+    "errors" and leaves that score None instead of aborting the deck.
+    """
+
+    def __init__(
+        self,
+        presentation: Presentation,
+        measurement_unit: str = "pt",
+        layout_cache: LayoutCache | None = None,
+        isolate_errors: bool = False,
+        config: ScoringConfig | None = None,
+    ):
+        self._presentation = presentation
+        self._measurement_unit = measurement_unit
+        slide_width, slide_height = presentation.slide_width, presentation.slide_height
+        if slide_width is None or slide_height is None:
+            raise ValueError("Presentation has no slide size")
+        self._slide_width = slide_width
+        self._slide_height = slide_height
+        self._layout_cache = LayoutCache() if layout_cache is None else layout_cache
+        self._isolate_errors = isolate_errors
+        self._config = ScoringConfig() if config is None else config
+        self._plan = self._config.plan(
+            unit_conversion(slide_width, measurement_unit),
+            unit_conversion(slide_height, measurement_unit),
+        )
+        # Entries of the default config keep the bare fingerprint as their key
+        self._cache_suffix = "" if config in (None, ScoringConfig()) else repr(config)
+        self._font_hierarchy_scorer = PowerPointFontHierarchyScorer(
+            presentation, measurement_unit
+        )
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._presentation.slides)
+
+    @property
+    def layout_cache(self) -> LayoutCache:
+        return self._layout_cache
+
+    @property
+    def isolate_errors(self) -> bool:
+        return self._isolate_errors
+
+    @property
+    def config(self) -> ScoringConfig:
+        return self._config
+
+    def _guarded(
+        self, stage: str, errors: list[ScorerError], compute: Callable[[], T]
+    ) -> T | None:
+        # Runs one stage; in isolated mode a failure is recorded and gives None
+        if not self._isolate_errors:
+            return compute()
+        try:
+            return compute()
+        except Exception as error:
+            errors.append(ScorerError.from_exception(stage, error))
+            return None
+
+    def _score_geometry(self, slide) -> tuple[dict, list[ScorerError]]:
+        scores: dict[str, float | None] = {name: None for name in SLIDE_SCORES[:4]}
+        errors: list[ScorerError] = []
+        shapes = list(slide.shapes)
+        if not shapes:
+            return scores, errors
+
+        scores["white_space"] = self._guarded(
+            "white_space",
+            errors,
+            lambda: MarginWhiteSpaceScorer(
+                slide,
+                self._slide_width,
+                self._slide_height,
+                self._measurement_unit,
+                plan=self._plan,
+            ).calculate_white_space_score(),
+        )
+
+        segment_tree = self._guarded(
+            "segmenter",
+            errors,
+            lambda: Segmenter(
+                shapes, self._slide_width, self._slide_height, self._measurement_unit
+            ).segment(),
+        )
+        if segment_tree is None:
+            return scores, errors
+        neighbor_pairs = list(iter_neighbor_pairs(segment_tree))
+        if not neighbor_pairs:
+            return scores, errors
+
+        scores["group_spacing"] = self._guarded(
+            "group_spacing",
+            errors,
+            lambda: GroupSpacingScorer(
+                self._slide_width,
+                self._slide_height,
+                segment_tree,
+                unit_measurement=self._measurement_unit,
+                plan=self._plan,
+            ).score(),
+        )
+        scores["alignment"] = self._guarded(
+            "alignment",
+            errors,
+            lambda: SlideAlignmentScorer(
+                segment_tree,
+                neighbor_pairs=neighbor_pairs,
+                measurement_unit=self._measurement_unit,
+                plan=self._plan,
+            ).score(),
+        )
+        scores["size_comparison"] = self._guarded(
+            "size_comparison",
+            errors,
+            lambda: SlideSizeComparisonScorer(
+                segment_tree, neighbor_pairs=neighbor_pairs, plan=self._plan
+            ).score(),
+        )
+        return scores, errors
+
+    def _cached_geometry_scores(
+        self, slide, fingerprint: str
+    ) -> tuple[dict, list[ScorerError]]:
+        # Errors depend on the geometry alone too, so they are cached with scores
+        fingerprint += self._cache_suffix
+        cached = self._layout_cache.get(fingerprint)
+        # A layout that failed in isolated mode raises again when not isolated
+        if cached is not None and cached[1] and not self._isolate_errors:
+            cached = None
+        if cached is None:
+            cached = self._score_geometry(slide)
+            self._layout_cache.put(fingerprint, cached)
+        scores, errors = cached
+        return dict(scores), list(errors)
+
+    def score_slide(self, slide_index: int) -> dict:
+        """
+        Returns the scores of a slide. With `isolate_errors`, the result also
+        has an "errors" list of `ScorerError` dicts, and the scores of the
+        stages that failed are None.
+        """
+        slide = self._presentation.slides[slide_index]
+        errors: list[ScorerError] = []
+        fingerprint = self._guarded(
+            "fingerprint",
+            errors,
+            lambda: slide_fingerprint(
+                slide, self._slide_width, self._slide_height, self._measurement_unit
+            ),
+        )
+        if fingerprint is None:
+            geometry_scores = {name: None for name in SLIDE_SCORES[:4]}
+        else:
+            geometry_scores, geometry_errors = self._cached_geometry_scores(
+                slide, fingerprint
+            )
+            errors.extend(geometry_errors)
+        font_hierarchy = self._guarded(
+            "font_hierarchy",
+            errors,
+            lambda: self._font_hierarchy_scorer.score_slide(slide_index),
+        )
+        result = {
+            "slide_index": slide_index,
+            "slide_id": slide.slide_id,
+            "shape_count": len(slide.shapes),
+            "layout_fingerprint": fingerprint,
+            **geometry_scores,
+            "font_hierarchy": (
+                None
+                if font_hierarchy is None or math.isnan(font_hierarchy)
+                else font_hierarchy
+            ),
+        }
+        if self._isolate_errors:
+            result["errors"] = [error._asdict() for error in errors]
+        return result
+
+    def score_all(self) -> list[dict]:
+        return [self.score_slide(i) for i in range(self.slide_count)]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from aesthetic_code.extractors.text_metrics import TextMetrics, text_metrics
+from aesthetic_code.extractors.text_styles import TextStyleCache
+from aesthetic_code.scorer.graded_scoring import band_scores, check_scoring_mode
+
+if TYPE_CHECKING:
+    from pptx.slide import Slide
+
+
+class TextDensityScorer:
+    """
+    This class is responsible for scoring how densely the text shapes of a slide
+    are filled: text overflowing its box or crammed into it scores low, as does
+    a box far larger than its text.
+    """
+
+    def __init__(
+        self,
+        slide: Slide,
+        fill_threshold: tuple = (0.2, 0.9),
+        mode: str = "discrete",
+        tolerance: float = 0.1,
+        text_styles: TextStyleCache | None = None,
+    ):
+        """
+        Args:
+            fill_threshold (tuple): band of acceptable fill ratios, the estimated
+                height of a shape's text over the height of its box.
+            mode (str): "discrete" scores fill ratios inside the band as 1,
+                "graded" scores fill ratios outside it smoothly.
+            tolerance (float): graded falloff width, in fill ratio.
+            text_styles (TextStyleCache | None): cache of the font sizes inherited
+                from the slide layout and master, shared across slides.
+        """
+        self._slide = slide
+        self._fill_threshold = fill_threshold
+        self._mode = check_scoring_mode(mode)
+        self._tolerance = tolerance
+        self._text_styles = TextStyleCache() if text_styles is None else text_styles
+        self._metrics: list[TextMetrics] | None = None
+
+    def shape_metrics(self) -> list[TextMetrics]:
+        """
+        Returns the text metrics of every shape of the slide that holds text.
+        """
+        if self._metrics is None:
+            self._metrics = []
+            for shape in self._slide.shapes:
+                metrics = text_metrics(shape, self._text_styles)
+                if metrics is not None and metrics.character_count:
+                    self._metrics.append(metrics)
+        return self._metrics
+
+    def shape_scores(self) -> np.ndarray:
+        fill_ratios = np.array([metrics.fill_ratio for metrics in self.shape_metrics()])
+        low, high = self._fill_threshold
+        tolerance = self._tolerance if self._mode == "graded" else 0.0
+        return band_scores(fill_ratios, low, high, tolerance)
+
+    def score(self) -> float:
+        """
+        Returns the mean score of the slide's text shapes, NaN if it has no text.
+        """
+        scores = self.shape_scores()
+        return float(scores.mean()) if len(scores) else float("nan")
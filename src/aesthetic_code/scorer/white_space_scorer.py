@@ -1,8 +1,27 @@
-from pptx.slide import Slide
-from pptx.util import Length
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from aesthetic_code.scorer.config import ScoringPlan, score_margins
+from aesthetic_code.scorer.free_space import (
+    maximal_empty_rectangles,
+    occupancy_grid,
+    white_space_balance,
+    white_space_distribution,
+)
+from aesthetic_code.scorer.graded_scoring import (
+    bounding_box_array,
+    check_scoring_mode,
+    margin_scores,
+)
 from aesthetic_code.utils import unit_conversion
 
+if TYPE_CHECKING:
+    from pptx.slide import Slide
+    from pptx.util import Length
+
 
 class MarginWhiteSpaceScorer:
     """
@@ -15,8 +34,22 @@ class MarginWhiteSpaceScorer:
         slide_width: Length,
         slide_height: Length,
         measurement_unit: str = "pt",
+        mode: str = "discrete",
+        tolerance: float = 0.05,
+        plan: ScoringPlan | None = None,
     ):
+        """
+        Args:
+            mode (str): "discrete" counts the margins inside the thresholds,
+                "graded" scores margins outside them smoothly.
+            tolerance (float): graded falloff width, relative to the slide size.
+            plan (ScoringPlan | None): margin bands and tolerances resolved for
+                the slide size, used instead of `mode` and `tolerance`.
+        """
         self._slide = slide
+        self._mode = check_scoring_mode(mode)
+        self._tolerance = tolerance
+        self._plan = plan
         self._measurement_unit = measurement_unit
         self._width = unit_conversion(slide_width, self._measurement_unit)
         self._height = unit_conversion(slide_height, self._measurement_unit)
@@ -63,6 +96,19 @@ class MarginWhiteSpaceScorer:
         }
 
     def calculate_white_space_score(self) -> float:
+        if self._plan is not None:
+            return float(
+                score_margins(self._plan, bounding_box_array(self._get_bounding_box()))
+            )
+        if self._mode == "graded":
+            return float(
+                margin_scores(
+                    bounding_box_array(self._get_bounding_box()),
+                    self._width,
+                    self._height,
+                    tolerance=self._tolerance,
+                )
+            )
         margins = self._calculate_margins()
         horizontal_margin_score = 0
         vertical_margin_score = 0
@@ -87,3 +133,94 @@ class MarginWhiteSpaceScorer:
         ):
             vertical_margin_score += 1
         return float((horizontal_margin_score + vertical_margin_score) / 4)
+
+
+class InnerWhiteSpaceScorer:
+    """
+    This class is responsible for scoring the white space inside a slide, between
+    and around its shapes, where `MarginWhiteSpaceScorer` only looks at the
+    margins of their bounding box.
+    """
+
+    def __init__(
+        self,
+        slide: Slide,
+        slide_width: Length,
+        slide_height: Length,
+        measurement_unit: str = "pt",
+        regions: tuple[int, int] = (3, 3),
+        resolution: int = 100,
+        min_size: float = 0.0,
+    ):
+        """
+        Args:
+            regions (tuple[int, int]): (rows, columns) of the slide split over
+                which the distribution of white space is compared.
+            resolution (int): occupancy grid cells along the slide's long side.
+            min_size (float): smallest width and height of an empty rectangle,
+                in the measurement unit.
+        """
+        self._slide = slide
+        self._measurement_unit = measurement_unit
+        self._width = unit_conversion(slide_width, measurement_unit)
+        self._height = unit_conversion(slide_height, measurement_unit)
+        self._regions = regions
+        self._resolution = resolution
+        self._min_size = min_size
+        self._boxes: np.ndarray | None = None
+        self._grid: np.ndarray | None = None
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """
+        The (n_shapes, 4) boxes of the slide's shapes, clipped to the slide.
+        """
+        if self._boxes is None:
+            boxes = []
+            for shape in self._slide.shapes:
+                left = unit_conversion(shape.left, self._measurement_unit)
+                top = unit_conversion(shape.top, self._measurement_unit)
+                width = unit_conversion(shape.width, self._measurement_unit)
+                height = unit_conversion(shape.height, self._measurement_unit)
+                boxes.append([left, top, left + width, top + height])
+            self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        return self._boxes
+
+    @property
+    def grid(self) -> np.ndarray:
+        if self._grid is None:
+            self._grid = occupancy_grid(
+                self.boxes, self._width, self._height, self._resolution
+            )
+        return self._grid
+
+    def empty_rectangles(self) -> np.ndarray:
+        """
+        Returns the maximal empty rectangles of the slide, largest first.
+        """
+        return maximal_empty_rectangles(
+            self.boxes, self._width, self._height, self._min_size
+        )
+
+    def largest_empty_fraction(self) -> float:
+        """
+        Returns the area of the largest empty rectangle over the slide's area.
+        """
+        rectangles = self.empty_rectangles()
+        if len(rectangles) == 0:
+            return 0.0
+        largest = rectangles[0]
+        area = (largest[2] - largest[0]) * (largest[3] - largest[1])
+        return float(area / (self._width * self._height))
+
+    def balance_score(self) -> float:
+        return white_space_balance(self.grid)
+
+    def distribution_score(self) -> float:
+        return white_space_distribution(self.grid, self._regions)
+
+    def calculate_white_space_score(self) -> float:
+        """
+        Averages the balance and distribution scores of the inner white space.
+        """
+        return (self.balance_score() + self.distribution_score()) / 2
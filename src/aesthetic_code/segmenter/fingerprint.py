@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable
+
+import numpy as np
+
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.slide import Slide
+    from pptx.util import Length
+
+# Shape edges are snapped to a grid of 1/FINGERPRINT_PRECISION of the slide size
+FINGERPRINT_PRECISION = 1000
+
+
+def quantize_boxes(
+    boxes: np.ndarray,
+    slide_width: float,
+    slide_height: float,
+    precision: int = FINGERPRINT_PRECISION,
+) -> np.ndarray:
+    """
+    Snaps (n, 4) boxes of (left, top, width, height) to an integer grid relative
+    to the slide size.
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    scale = np.array([slide_width, slide_height, slide_width, slide_height])
+    return np.rint(boxes / scale * precision).astype(np.int64)
+
+
+def layout_fingerprint(
+    boxes: Iterable,
+    slide_width: float,
+    slide_height: float,
+    precision: int = FINGERPRINT_PRECISION,
+) -> str:
+    """
+    Returns a hex digest of the quantized geometry of a slide's shapes, given as
+    (left, top, width, height) in the same unit as the slide size.
+
+    Slides with the same fingerprint have the same segment tree shape and the
+    same geometric scores, up to the quantization. Text, names and shape types do
+    not contribute. Shape order does, as it is the order the segmenter sees.
+    """
+    grid = quantize_boxes(
+        np.array(list(boxes), dtype=float), slide_width, slide_height, precision
+    )
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.array([precision, len(grid)], dtype=np.int64).tobytes())
+    # The scores depend on the slide size itself, not only on relative positions
+    digest.update(
+        np.array([slide_width, slide_height], dtype=np.float64).round(2).tobytes()
+    )
+    digest.update(grid.tobytes())
+    return digest.hexdigest()
+
+
+def slide_fingerprint(
+    slide: Slide,
+    slide_width: Length,
+    slide_height: Length,
+    measurement_unit: str = "pt",
+    precision: int = FINGERPRINT_PRECISION,
+) -> str:
+    """
+    `layout_fingerprint` of the top-level shapes of a pptx slide.
+    """
+    boxes = [
+        [
+            unit_conversion(shape.left, measurement_unit),
+            unit_conversion(shape.top, measurement_unit),
+            unit_conversion(shape.width, measurement_unit),
+            unit_conversion(shape.height, measurement_unit),
+        ]
+        for shape in slide.shapes
+    ]
+    return layout_fingerprint(
+        boxes,
+        unit_conversion(slide_width, measurement_unit),
+        unit_conversion(slide_height, measurement_unit),
+        precision,
+    )
+
+
+class LayoutCache:
+    """
+    Least-recently-used map from layout fingerprints to results computed from
+    geometry alone, such as geometric scores. One cache can be shared by every
+    deck of a corpus to reuse results across decks.
+    """
+
+    def __init__(self, max_size: int | None = 100_000):
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._entries
+
+    def get(self, fingerprint: str) -> Any | None:
+        if fingerprint not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(fingerprint)
+        return self._entries[fingerprint]
+
+    def put(self, fingerprint: str, value: Any) -> None:
+        self._entries[fingerprint] = value
+        self._entries.move_to_end(fingerprint)
+        if self._max_size is not None and len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,27 +1,15 @@
-from typing import TypeAlias, Union, cast
-
-from pptx.presentation import Presentation
-from pptx.shapes.autoshape import Shape as AutoShape
-from pptx.shapes.base import BaseShape
-from pptx.shapes.connector import Connector
-from pptx.shapes.graphfrm import GraphicFrame
-from pptx.shapes.group import GroupShape
-from pptx.shapes.picture import Movie, Picture
-from pptx.shapes.placeholder import BasePlaceholder
-from pptx.util import Length
+from __future__ import annotations
 
+import itertools
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterator, NamedTuple, TypeAlias, Union, cast
+
+from aesthetic_code.shape_types import Shape
 from aesthetic_code.utils import intervals_minus_interval, unit_conversion
 
-Shape: TypeAlias = Union[
-    BaseShape,
-    AutoShape,
-    Connector,
-    GraphicFrame,
-    GroupShape,
-    Picture,
-    Movie,
-    BasePlaceholder,
-]
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+    from pptx.util import Length
 
 Subregion: TypeAlias = Union[Shape, "SegmentTreeNode"]
 
@@ -162,15 +150,19 @@ class Segmenter:
             },
         )
 
+    def _get_shape_bounds(self, shape: Shape) -> tuple[float, float, float, float]:
+        """
+        Returns the (left, top, right, bottom) edges of a shape in the measurement unit.
+        """
+        left = unit_conversion(shape.left, self._measurement_unit)
+        top = unit_conversion(shape.top, self._measurement_unit)
+        right = left + unit_conversion(shape.width, self._measurement_unit)
+        bottom = top + unit_conversion(shape.height, self._measurement_unit)
+        return left, top, right, bottom
+
     def _generate_bounding_box_from_shapes(self, shape: Shape) -> dict:
-        return {
-            "left": unit_conversion(shape.left, self._measurement_unit),
-            "top": unit_conversion(shape.top, self._measurement_unit),
-            "right": unit_conversion(shape.left, self._measurement_unit)
-            + unit_conversion(shape.width, self._measurement_unit),
-            "bottom": unit_conversion(shape.top, self._measurement_unit)
-            + unit_conversion(shape.height, self._measurement_unit),
-        }
+        left, top, right, bottom = self._get_shape_bounds(shape)
+        return {"left": left, "top": top, "right": right, "bottom": bottom}
 
     def _generate_bounding_box(
         self, left: Length, top: Length, right: Length, bottom: Length
@@ -215,65 +207,26 @@ class Segmenter:
     def _define_grid_lines(self, shapes: list[Shape], direction: str) -> list[float]:
         if not shapes:
             return []  # Return empty list if no shapes to define grid lines
-        lines = []
         if direction == "horizontal":
-            top_y_position = min(
-                [unit_conversion(shape.top, self._measurement_unit) for shape in shapes]
-            )
-            bottom_y_position = max(
-                [
-                    unit_conversion(shape.top, self._measurement_unit)
-                    + unit_conversion(shape.height, self._measurement_unit)
-                    for shape in shapes
-                ]
-            )
-            # print(f"Top: {top_y_position}, Bottom: {bottom_y_position}")
-            intervals = [(top_y_position, bottom_y_position)]
-            # print(f"Intervals: {intervals}")
-            for shape in shapes:
-                top = unit_conversion(shape.top, self._measurement_unit)
-                height = unit_conversion(shape.height, self._measurement_unit)
-                intervals = intervals_minus_interval(intervals, (top, top + height))
-                # print(f"Intervals: {intervals}")
-            # print(f"Intervals: {intervals}")
-            for interval in intervals:
-                line = (interval[0] + interval[1]) / 2
-                # print(f"Line: {line}")
-                lines.append(line)
-
-            # print(f"Horizontal lines: {lines}")
-            return sorted(lines)
-
+            start, end = 1, 3  # top, bottom
         elif direction == "vertical":
-            left_x_position = min(
-                [
-                    unit_conversion(shape.left, self._measurement_unit)
-                    for shape in shapes
-                ]
-            )
-            right_x_position = max(
-                [
-                    unit_conversion(shape.left, self._measurement_unit)
-                    + unit_conversion(shape.width, self._measurement_unit)
-                    for shape in shapes
-                ]
-            )
-            intervals = [(left_x_position, right_x_position)]
-            for shape in shapes:
-                left = unit_conversion(shape.left, self._measurement_unit)
-                width = unit_conversion(shape.width, self._measurement_unit)
-                intervals = intervals_minus_interval(intervals, (left, left + width))
-
-            for interval in intervals:
-                line = (interval[0] + interval[1]) / 2
-                lines.append(line)
-
-            # print(f"Vertical lines: {lines}")
-            return sorted(lines)
-
+            start, end = 0, 2  # left, right
         else:
             raise ValueError(f"Invalid direction: {direction}")
 
+        bounds = [self._get_shape_bounds(shape) for shape in shapes]
+        intervals = [
+            (
+                min([bound[start] for bound in bounds]),
+                max([bound[end] for bound in bounds]),
+            )
+        ]
+        for bound in bounds:
+            intervals = intervals_minus_interval(intervals, (bound[start], bound[end]))
+
+        lines = [(interval[0] + interval[1]) / 2 for interval in intervals]
+        return sorted(lines)
+
     def _valid_split(
         self, group1: list[Shape], group2: list[Shape], shapes_number: int
     ) -> bool:
@@ -292,37 +245,79 @@ class Segmenter:
 
     def _split_by_line(self, shapes: list[Shape], line: float, direction: str) -> tuple:
         if direction == "horizontal":
-            top = [
-                shape
-                for shape in shapes
-                if unit_conversion(shape.top, self._measurement_unit)
-                + unit_conversion(shape.height, self._measurement_unit)
-                <= line
-            ]
-            bottom = [
-                shape
-                for shape in shapes
-                if unit_conversion(shape.top, self._measurement_unit) >= line
-            ]
+            bounds = [self._get_shape_bounds(shape) for shape in shapes]
+            top = [shape for shape, bound in zip(shapes, bounds) if bound[3] <= line]
+            bottom = [shape for shape, bound in zip(shapes, bounds) if bound[1] >= line]
             return top, bottom
         elif direction == "vertical":
-            left = [
-                shape
-                for shape in shapes
-                if unit_conversion(shape.left, self._measurement_unit)
-                + unit_conversion(shape.width, self._measurement_unit)
-                < line
-            ]
-            right = [
-                shape
-                for shape in shapes
-                if unit_conversion(shape.left, self._measurement_unit) >= line
-            ]
+            bounds = [self._get_shape_bounds(shape) for shape in shapes]
+            left = [shape for shape, bound in zip(shapes, bounds) if bound[2] < line]
+            right = [shape for shape, bound in zip(shapes, bounds) if bound[0] >= line]
             return left, right
         else:
             raise ValueError(f"Invalid direction: {direction}")
 
 
+class LayoutBox:
+    """
+    Lightweight stand-in for a shape in a candidate layout, carrying the shape's
+    identity and a box already expressed in the measurement unit.
+    """
+
+    __slots__ = ("name", "shape_id", "shape_type", "left", "top", "width", "height")
+
+    def __init__(
+        self,
+        left: float,
+        top: float,
+        width: float,
+        height: float,
+        name: str = "",
+        shape_id: int | None = None,
+        shape_type=None,
+    ):
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.name = name
+        self.shape_id = shape_id
+        self.shape_type = shape_type
+
+    def __repr__(self) -> str:
+        return (
+            f"LayoutBox(name={self.name!r}, left={self.left}, top={self.top}, "
+            f"width={self.width}, height={self.height})"
+        )
+
+
+class BoxSegmenter(Segmenter):
+    """
+    Segmenter over `LayoutBox` objects, whose geometry needs no unit conversion.
+    Used to segment candidate layouts without materialising pptx shapes.
+    """
+
+    def __init__(
+        self,
+        boxes: list[LayoutBox],
+        slide_width: float,
+        slide_height: float,
+        measurement_unit: str = "pt",
+    ):
+        self._shapes = boxes  # type: ignore[assignment]
+        self._measurement_unit = measurement_unit
+        self._slide_width = slide_width
+        self._slide_height = slide_height
+
+    def _get_shape_bounds(self, shape) -> tuple[float, float, float, float]:
+        return (
+            shape.left,
+            shape.top,
+            shape.left + shape.width,
+            shape.top + shape.height,
+        )
+
+
 class PowerPointSegmenter:
     def __init__(self, presentation: Presentation, measurement_unit: str = "pt"):
         self._presentation = presentation
@@ -343,32 +338,85 @@ class PowerPointSegmenter:
         return {i: self.segment(i) for i in range(len(self._presentation.slides))}
 
 
-def get_all_neighbor_pairs(
-    node: SegmentTreeNode,
-) -> list[tuple[str, Subregion, Subregion]]:
+class PairKind(IntEnum):
+    """
+    How the members of a neighbour pair relate: a child and its parent node, or
+    adjacent children of a node split horizontally or vertically.
+    """
+
+    BELONGS_TO = 0
+    HORIZONTAL = 1
+    VERTICAL = 2
+
+    @property
+    def label(self) -> str:
+        # The kind strings of `get_all_neighbor_pairs`
+        return self.name.lower()
+
+    @classmethod
+    def from_label(cls, label: str) -> PairKind:
+        return cls[label.upper()]
+
+
+class NeighborPair(NamedTuple):
+    """
+    A neighbour pair of a segment tree. Node indices number the tree's nodes and
+    subregions in depth-first pre-order, the root being 0.
+    """
+
+    kind: PairKind
+    first: Subregion
+    second: Subregion
+    first_index: int
+    second_index: int
+
+
+def iter_neighbor_pairs(node: SegmentTreeNode) -> Iterator[NeighborPair]:
     """
-    Get all pairs of neighboring subregions in the segment tree.
-    The segment tree is a binary tree.
-    get all (left child, parent), (right child, parent), (left child, right child) pairs
+    Yields the neighbour pairs of a segment tree in one depth-first pass, in the
+    order of `get_all_neighbor_pairs`: for each node, every child with its
+    parent followed by that child's own pairs, then each pair of adjacent
+    children. Nodes may have any number of children.
     """
-    directions = ["belongs_to", "horizontal", "vertical"]
-    pairs: list[tuple[str, Subregion, Subregion]] = []
-    if node.is_leaf():
-        return pairs
-
-    if node.subregions[0]:
-        pairs.append((directions[0], node.subregions[0], node))
-        if isinstance(node.subregions[0], SegmentTreeNode):
-            pairs.extend(
-                get_all_neighbor_pairs(cast(SegmentTreeNode, node.subregions[0]))
+    counter = itertools.count()
+    # Frames of (node, node index, next child position, child indices so far)
+    stack: list[tuple[SegmentTreeNode, int, int, list[int]]] = [
+        (node, next(counter), 0, [])
+    ]
+    while stack:
+        parent, parent_index, position, child_indices = stack.pop()
+        if parent.is_leaf():
+            continue
+        children = parent.subregions
+        if position < len(children):
+            stack.append((parent, parent_index, position + 1, child_indices))
+            child = children[position]
+            if child is None:
+                continue
+            child_index = next(counter)
+            child_indices.append(child_index)
+            yield NeighborPair(
+                PairKind.BELONGS_TO, child, parent, child_index, parent_index
             )
-    if node.subregions[1]:
-        pairs.append((directions[0], node.subregions[1], node))
-        if isinstance(node.subregions[1], SegmentTreeNode):
-            pairs.extend(
-                get_all_neighbor_pairs(cast(SegmentTreeNode, node.subregions[1]))
+            if isinstance(child, SegmentTreeNode):
+                stack.append((child, child_index, 0, []))
+            continue
+        kind = PairKind.from_label(parent.direction)
+        present = [child for child in children if child is not None]
+        for i in range(len(present) - 1):
+            yield NeighborPair(
+                kind, present[i], present[i + 1], child_indices[i], child_indices[i + 1]
             )
-    if node.subregions[0] and node.subregions[1]:
-        pairs.append((node.direction, node.subregions[0], node.subregions[1]))
 
-    return pairs
+
+def get_all_neighbor_pairs(
+    node: SegmentTreeNode,
+) -> list[tuple[str, Subregion, Subregion]]:
+    """
+    Get all pairs of neighboring subregions in the segment tree, as
+    (kind, subregion, subregion) tuples with the kind as a string; see
+    `iter_neighbor_pairs`.
+    """
+    return [
+        (pair.kind.label, pair.first, pair.second) for pair in iter_neighbor_pairs(node)
+    ]
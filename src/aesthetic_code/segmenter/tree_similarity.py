@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple, Sequence
+
+import numpy as np
+
+from aesthetic_code.segmenter.segmenter import PowerPointSegmenter, SegmentTreeNode
+from aesthetic_code.utils import unit_conversion
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+
+# Node boxes are snapped to a grid of 1/TREE_PRECISION of the slide size
+TREE_PRECISION = 100
+
+
+class Subtree(NamedTuple):
+    """
+    A subtree interned by `TreeComparator` under its hash `key`. The box is
+    quantized to the comparator's precision. Identical subtrees are the same
+    object, so they compare by identity.
+    """
+
+    key: bytes
+    direction: str
+    shape_count: int
+    box: tuple[int, int, int, int]
+    children: tuple[Subtree, ...]
+    size: int
+
+
+class TreeComparator:
+    """
+    Compares the segment trees of slides of one deck.
+
+    Every subtree is interned under a Merkle hash of its direction, its
+    quantized box, the number of shapes of a leaf and the hashes of its
+    children, so identical subtrees, within a slide or across slides, are
+    stored once and compared in constant time.
+
+    Other subtrees are compared with a top-down tree edit distance: roots are
+    matched to roots, children are aligned in order, and unmatched subtrees
+    cost their size. Subtrees whose boxes are further apart than the position
+    tolerance cover different regions of the slide and are never matched,
+    which prunes most comparisons between unrelated layouts. Distances are
+    memoised by hash pair across the whole deck, so subtrees repeated by a
+    template are compared once.
+
+    The edit distance of two subtrees takes up to the product of their sizes
+    in work. Pairs for which it exceeds `max_pair_size` are instead estimated
+    from the histograms of their nodes' directions and shape counts, which is
+    approximate: neither a lower nor an upper bound. Whether a pair is
+    estimated depends on the pair alone, and pairs are compared in hash order,
+    so distances do not depend on the order trees are added or compared in.
+    """
+
+    def __init__(
+        self,
+        slide_width: float,
+        slide_height: float,
+        precision: int = TREE_PRECISION,
+        position_tolerance: float = 0.1,
+        max_pair_size: int = 4096,
+    ):
+        """
+        Args:
+            slide_width (float), slide_height (float): slide size, in the unit of
+                the segment trees' bounding boxes.
+            position_tolerance (float): offset, relative to the slide size, at
+                which two nodes' boxes count as entirely different.
+            max_pair_size (int): largest product of two subtrees' sizes whose
+                distance is computed exactly rather than estimated.
+        """
+        self._scale = np.array([slide_width, slide_height, slide_width, slide_height])
+        self._precision = precision
+        self._tolerance_cells = position_tolerance * precision
+        self._max_pair_size = max_pair_size
+        self._subtrees: dict[bytes, Subtree] = {}
+        self._labels: dict[bytes, Counter[tuple[str, int]]] = {}
+        self._distances: dict[bytes, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._subtrees)
+
+    def subtree(self, tree_hash: bytes) -> Subtree:
+        return self._subtrees[tree_hash]
+
+    def _quantize(self, bounding_box: dict[str, float]) -> tuple[int, int, int, int]:
+        box = np.array(
+            [
+                bounding_box["left"],
+                bounding_box["top"],
+                bounding_box["right"],
+                bounding_box["bottom"],
+            ]
+        )
+        left, top, right, bottom = np.rint(box / self._scale * self._precision)
+        return int(left), int(top), int(right), int(bottom)
+
+    def add(self, tree: SegmentTreeNode) -> bytes:
+        """
+        Interns every subtree of a segment tree and returns the root's hash.
+        """
+        hashes: dict[int, bytes] = {}
+        # Post-order with an explicit stack, so deep trees do not recurse
+        stack: list[tuple[SegmentTreeNode, bool]] = [(tree, False)]
+        while stack:
+            node, expanded = stack.pop()
+            children = (
+                []
+                if node.is_leaf()
+                else [child for child in node.subregions if child is not None]
+            )
+            if not expanded:
+                stack.append((node, True))
+                stack.extend(
+                    (child, False) for child in reversed(children)  # type: ignore
+                )
+                continue
+
+            child_subtrees = tuple(
+                self._subtrees[hashes[id(child)]] for child in children
+            )
+            shape_count = len(node.subregions) if node.is_leaf() else 0
+            box = self._quantize(node.bounding_box)
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{node.direction}:{shape_count}:{box}".encode())
+            for child_subtree in child_subtrees:
+                digest.update(child_subtree.key)
+            node_hash = digest.digest()
+            if node_hash not in self._subtrees:
+                # Directions and shape counts of the descendants, for estimates
+                labels: Counter[tuple[str, int]] = Counter()
+                for child_subtree in child_subtrees:
+                    labels[(child_subtree.direction, child_subtree.shape_count)] += 1
+                    labels.update(self._labels[child_subtree.key])
+                self._labels[node_hash] = labels
+                self._subtrees[node_hash] = Subtree(
+                    key=node_hash,
+                    direction=node.direction,
+                    shape_count=shape_count,
+                    box=box,
+                    children=child_subtrees,
+                    size=1 + sum(child.size for child in child_subtrees),
+                )
+            hashes[id(node)] = node_hash
+        return hashes[id(tree)]
+
+    def _offset(self, subtree1: Subtree, subtree2: Subtree) -> float:
+        """
+        Mean offset of the box edges of two nodes, relative to the tolerance.
+        """
+        # Unrolled: this runs for every pair of nodes compared
+        left1, top1, right1, bottom1 = subtree1.box
+        left2, top2, right2, bottom2 = subtree2.box
+        offset = (
+            abs(left1 - left2)
+            + abs(top1 - top2)
+            + abs(right1 - right2)
+            + abs(bottom1 - bottom2)
+        )
+        return offset / 4 / self._tolerance_cells
+
+    def _node_cost(self, subtree1: Subtree, subtree2: Subtree, offset: float) -> float:
+        """
+        Cost in [0, 1] of matching two nodes: half for a different direction or
+        leaf shape count, half growing with the offset of their boxes.
+        """
+        cost = 0.5 * min(1.0, offset)
+        if (
+            subtree1.direction != subtree2.direction
+            or subtree1.shape_count != subtree2.shape_count
+        ):
+            cost += 0.5
+        return cost
+
+    def _estimate(self, subtree1: Subtree, subtree2: Subtree, offset: float) -> float:
+        """
+        Approximate distance of two subtrees too large to compare exactly: the
+        cost of matching the roots plus the number of descendants left over
+        when they are paired by direction and shape count alone.
+        """
+        labels1 = self._labels[subtree1.key]
+        labels2 = self._labels[subtree2.key]
+        unpaired = sum(
+            abs(labels1[label] - labels2[label]) for label in labels1.keys() | labels2
+        )
+        return self._node_cost(subtree1, subtree2, offset) + unpaired
+
+    def _distance(self, subtree1: Subtree, subtree2: Subtree) -> float:
+        """
+        Returns the top-down edit distance of two interned subtrees, estimated
+        for pairs beyond `max_pair_size`.
+        """
+        if subtree1 is subtree2:
+            return 0.0
+        # One order for either argument order, so the result is symmetric
+        if subtree2.key < subtree1.key:
+            subtree1, subtree2 = subtree2, subtree1
+        offset = self._offset(subtree1, subtree2)
+        if offset >= 1.0:
+            # Regions in different places of the slide are never matched: as
+            # costly as removing one and inserting the other
+            return float(subtree1.size + subtree2.size)
+        if not subtree1.children and not subtree2.children:
+            # Two leaves cost no more to compare than to look up
+            return self._node_cost(subtree1, subtree2, offset)
+        key = subtree1.key + subtree2.key
+        if key in self._distances:
+            return self._distances[key]
+
+        if subtree1.size * subtree2.size > self._max_pair_size:
+            distance = self._estimate(subtree1, subtree2, offset)
+            self._distances[key] = distance
+            return distance
+
+        # Ordered alignment of the children, unmatched subtrees costing their size
+        children2 = subtree2.children
+        previous = [0.0]
+        for child2 in children2:
+            previous.append(previous[-1] + child2.size)
+        for child1 in subtree1.children:
+            size1 = child1.size
+            current = [previous[0] + size1]
+            for j, child2 in enumerate(children2):
+                best = min(previous[j + 1] + size1, current[j] + child2.size)
+                # Far apart children are skipped: matching them never beats
+                # removing one and inserting the other
+                if child1 is child2:
+                    best = min(best, previous[j])
+                elif self._offset(child1, child2) < 1.0:
+                    best = min(best, previous[j] + self._distance(child1, child2))
+                current.append(best)
+            previous = current
+
+        distance = self._node_cost(subtree1, subtree2, offset) + previous[-1]
+        self._distances[key] = distance
+        return distance
+
+    def distance(self, hash1: bytes, hash2: bytes) -> float:
+        return self._distance(self._subtrees[hash1], self._subtrees[hash2])
+
+    def similarity(self, hash1: bytes, hash2: bytes) -> float:
+        """
+        Returns the similarity in [0, 1] of two interned trees: 1 for identical
+        trees, falling with their edit distance relative to their total size.
+        """
+        total_size = self._subtrees[hash1].size + self._subtrees[hash2].size
+        return max(0.0, 1.0 - self.distance(hash1, hash2) / total_size)
+
+    def compare(self, tree1: SegmentTreeNode, tree2: SegmentTreeNode) -> float:
+        return self.similarity(self.add(tree1), self.add(tree2))
+
+    def similarity_matrix(self, trees: Sequence[SegmentTreeNode | None]) -> np.ndarray:
+        """
+        Returns the (n, n) similarities of all pairs of trees, NaN for slides
+        without a tree. Trees with the same root hash are compared once.
+        """
+        roots = [None if tree is None else self.add(tree) for tree in trees]
+        unique = list(dict.fromkeys(root for root in roots if root is not None))
+        position = {root: i for i, root in enumerate(unique)}
+        unique_similarities = np.eye(len(unique))
+        for i in range(len(unique)):
+            for j in range(i + 1, len(unique)):
+                similarity = self.similarity(unique[i], unique[j])
+                unique_similarities[i, j] = unique_similarities[j, i] = similarity
+
+        present = [i for i, root in enumerate(roots) if root is not None]
+        indices = [position[root] for root in roots if root is not None]
+        similarities = np.full((len(roots), len(roots)), np.nan)
+        similarities[np.ix_(present, present)] = unique_similarities[
+            np.ix_(indices, indices)
+        ]
+        return similarities
+
+
+def consistency_scores(similarities: np.ndarray) -> np.ndarray:
+    """
+    Returns, for every slide, its similarity to the most similar other slide of
+    the deck: high when the slide follows a layout used elsewhere. NaN for
+    slides without a tree or without another slide to compare with.
+    """
+    similarities = np.array(similarities, dtype=float)
+    np.fill_diagonal(similarities, np.nan)
+    scores = np.full(len(similarities), np.nan)
+    comparable = ~np.isnan(similarities).all(axis=1)
+    scores[comparable] = np.nanmax(similarities[comparable], axis=1)
+    return scores
+
+
+def deck_similarity_matrix(
+    presentation: Presentation, measurement_unit: str = "pt", **kwargs
+) -> np.ndarray:
+    """
+    Segments every slide of a presentation and returns the similarities of all
+    pairs of slides, see `TreeComparator.similarity_matrix`. Keyword arguments
+    go to `TreeComparator`.
+    """
+    slide_width, slide_height = presentation.slide_width, presentation.slide_height
+    if slide_width is None or slide_height is None:
+        raise ValueError("Presentation has no slide size")
+    trees = PowerPointSegmenter(presentation, measurement_unit).segment_all()
+    comparator = TreeComparator(
+        unit_conversion(slide_width, measurement_unit),
+        unit_conversion(slide_height, measurement_unit),
+        **kwargs,
+    )
+    return comparator.similarity_matrix([trees[index] for index in sorted(trees)])
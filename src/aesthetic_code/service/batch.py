@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections import Counter
+
+
+class BatchSummary:
+    """
+    Running totals of a fault-isolated batch: decks and slides scored, decks
+    that could not be opened, and error counts per (stage, error type) with the
+    first `max_examples` occurrences of each.
+    """
+
+    def __init__(self, max_examples: int = 5):
+        self.decks = 0
+        self.slides = 0
+        self.slides_with_errors = 0
+        self.failed_decks: dict[str, dict] = {}
+        self.error_counts: Counter[tuple[str, str]] = Counter()
+        self.examples: dict[tuple[str, str], list[dict]] = {}
+        self._max_examples = max_examples
+
+    def _record(self, deck: str, slide_index: int | None, error: dict) -> None:
+        key = (error["stage"], error["error_type"])
+        self.error_counts[key] += 1
+        examples = self.examples.setdefault(key, [])
+        if len(examples) < self._max_examples:
+            examples.append({"deck": deck, "slide_index": slide_index, **error})
+
+    def add(self, deck: str, deck_result: dict) -> None:
+        """
+        Adds the result of `score_deck_isolated` for a deck.
+        """
+        self.decks += 1
+        if deck_result["error"] is not None:
+            self.failed_decks[deck] = deck_result["error"]
+            self._record(deck, None, deck_result["error"])
+        for result in deck_result["results"]:
+            self.slides += 1
+            if result["errors"]:
+                self.slides_with_errors += 1
+            for error in result["errors"]:
+                self._record(deck, result["slide_index"], error)
+
+    def to_dict(self) -> dict:
+        return {
+            "decks": self.decks,
+            "failed_decks": len(self.failed_decks),
+            "slides": self.slides,
+            "slides_with_errors": self.slides_with_errors,
+            "errors": [
+                {"stage": stage, "error_type": error_type, "count": count}
+                for (stage, error_type), count in self.error_counts.most_common()
+            ],
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"{self.decks} decks ({len(self.failed_decks)} failed to open), "
+            f"{self.slides} slides ({self.slides_with_errors} with errors)"
+        ]
+        for (stage, error_type), count in self.error_counts.most_common():
+            example = self.examples[(stage, error_type)][0]
+            lines.append(
+                f"  {count:>8}  {stage}: {error_type}, "
+                f"e.g. {example['deck']} slide {example['slide_index']}: "
+                f"{example['message']}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from typing import Iterable, Iterator, Mapping
+
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.slide_scorer import ScorerError
+from aesthetic_code.service.batch import BatchSummary
+from aesthetic_code.service.worker_pool import (
+    WarmWorkerPool,
+    open_scorer,
+    score_slides_isolated,
+)
+from aesthetic_code.storage.score_index import ScoreIndex
+
+MANIFEST_NAME = "manifest.json"
+COMPLETE_MARKER = "complete.json"
+FAILED_MARKER = "failed.json"
+
+
+def write_atomic(path: str, text: str) -> None:
+    """
+    Writes a file so that readers, and a rerun after a crash, see either the
+    previous content or the new one in full, never a partial file.
+    """
+    temporary = f"{path}.tmp-{os.getpid()}"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def deck_directory(directory: str, name: str) -> str:
+    # Readable and unique, whatever characters the deck name holds
+    digest = hashlib.sha1(name.encode()).hexdigest()[:12]
+    readable = re.sub(r"[^\w.-]", "_", name)[-60:]
+    return os.path.join(directory, "decks", f"{readable}-{digest}")
+
+
+def shard_path(deck_dir: str, first_slide: int) -> str:
+    return os.path.join(deck_dir, f"shard-{first_slide:06d}.jsonl")
+
+
+def read_shards(deck_dir: str) -> list[dict]:
+    """
+    Returns the slide results of every shard of a deck, in slide order.
+    Temporary files left by an interrupted write are ignored.
+    """
+    if not os.path.isdir(deck_dir):
+        return []
+    results: list[dict] = []
+    for file_name in os.listdir(deck_dir):
+        if file_name.startswith("shard-") and file_name.endswith(".jsonl"):
+            with open(os.path.join(deck_dir, file_name), encoding="utf-8") as file:
+                results.extend(json.loads(line) for line in file if line.strip())
+    return sorted(results, key=lambda result: result["slide_index"])
+
+
+def process_deck(
+    directory: str,
+    name: str,
+    source: str,
+    shard_size: int,
+    config: ScoringConfig | None = None,
+) -> tuple[str, dict]:
+    """
+    Worker task: scores the slides of a deck that no shard holds yet, writing
+    a shard every `shard_size` slides and the completion marker at the end.
+    Returns the deck name and the newly scored results, as
+    `score_deck_isolated` does.
+    """
+    deck_dir = deck_directory(directory, name)
+    os.makedirs(deck_dir, exist_ok=True)
+    done = {result["slide_index"] for result in read_shards(deck_dir)}
+    try:
+        scorer = open_scorer(source, isolate_errors=True, config=config)
+    except Exception as error:
+        failure = ScorerError.from_exception("open", error)._asdict()
+        write_atomic(os.path.join(deck_dir, FAILED_MARKER), json.dumps(failure))
+        return name, {"results": [], "error": failure}
+
+    pending = [index for index in range(scorer.slide_count) if index not in done]
+    results: list[dict] = []
+    for start in range(0, len(pending), shard_size):
+        chunk = pending[start : start + shard_size]
+        chunk_results = score_slides_isolated(scorer, chunk)
+        write_atomic(
+            shard_path(deck_dir, chunk[0]),
+            "".join(json.dumps(result) + "\n" for result in chunk_results),
+        )
+        results.extend(chunk_results)
+
+    write_atomic(
+        os.path.join(deck_dir, COMPLETE_MARKER),
+        json.dumps({"slides": scorer.slide_count}),
+    )
+    if os.path.exists(os.path.join(deck_dir, FAILED_MARKER)):
+        os.remove(os.path.join(deck_dir, FAILED_MARKER))
+    return name, {"results": results, "error": None}
+
+
+class ScoringJob:
+    """
+    Resumable scoring of a corpus of deck files, checkpointed in a directory:
+
+        manifest.json              deck names and paths, the shard size and
+                                   the scoring config
+        decks/<deck>/shard-*.jsonl slide results, one JSON line per slide
+        decks/<deck>/complete.json written once every slide is scored
+        decks/<deck>/failed.json   the error if the deck could not be opened
+
+    Every file is written atomically, so after a crash or preemption a rerun
+    skips completed decks and scores only the slides of a partial deck that no
+    shard holds, losing at most one shard of work per deck in progress.
+
+    Usage:
+        job = ScoringJob("job", {"a.pptx": "/corpus/a.pptx"})
+        with WarmWorkerPool() as pool:
+            print(job.run(pool).format())
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        decks: Mapping[str, str] | None = None,
+        shard_size: int = 64,
+        config: ScoringConfig | None = None,
+    ):
+        """
+        Args:
+            directory (str): job directory, created if needed. An existing job
+                is reopened with its manifest.
+            decks (Mapping[str, str] | None): deck names mapped to file paths,
+                added to the manifest.
+            shard_size (int): slides per shard for a new job.
+            config (ScoringConfig | None): scoring config of a new job, the
+                default if None. A job is resumed under its own config.
+
+        Raises:
+            ValueError: if a deck is already in the job with another path, or
+                the job was started with another config.
+        """
+        self._directory = directory
+        os.makedirs(os.path.join(directory, "decks"), exist_ok=True)
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        manifest: dict = {
+            "shard_size": shard_size,
+            "config": (config or ScoringConfig())._asdict(),
+            "decks": {},
+        }
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        job_config = ScoringConfig.from_dict(manifest.get("config", {}))
+        if config is not None and config != job_config:
+            raise ValueError("The job was started with another scoring config")
+        manifest["config"] = job_config._asdict()
+        for name, source in (decks or {}).items():
+            if manifest["decks"].get(name, source) != source:
+                raise ValueError(f"Deck {name} is already in the job with another path")
+            manifest["decks"][name] = source
+        write_atomic(manifest_path, json.dumps(manifest, indent=2))
+        self._shard_size: int = manifest["shard_size"]
+        self._config = job_config
+        self._decks: dict[str, str] = manifest["decks"]
+
+    @property
+    def decks(self) -> dict[str, str]:
+        return dict(self._decks)
+
+    @property
+    def shard_size(self) -> int:
+        return self._shard_size
+
+    @property
+    def config(self) -> ScoringConfig:
+        return self._config
+
+    def _marker(self, name: str, marker: str) -> str:
+        return os.path.join(deck_directory(self._directory, name), marker)
+
+    def is_complete(self, name: str) -> bool:
+        return os.path.exists(self._marker(name, COMPLETE_MARKER))
+
+    def is_failed(self, name: str) -> bool:
+        return os.path.exists(self._marker(name, FAILED_MARKER))
+
+    def pending(self, retry_failed: bool = False) -> list[str]:
+        """
+        Returns the decks still to be processed, partial ones included.
+        """
+        return [
+            name
+            for name in self._decks
+            if not self.is_complete(name) and (retry_failed or not self.is_failed(name))
+        ]
+
+    def status(self) -> dict[str, int]:
+        counts = {"complete": 0, "failed": 0, "partial": 0, "pending": 0}
+        for name in self._decks:
+            if self.is_complete(name):
+                counts["complete"] += 1
+            elif self.is_failed(name):
+                counts["failed"] += 1
+            elif read_shards(deck_directory(self._directory, name)):
+                counts["partial"] += 1
+            else:
+                counts["pending"] += 1
+        return counts
+
+    def results(self, name: str) -> list[dict]:
+        """
+        Returns the slide results of a deck checkpointed so far.
+        """
+        return read_shards(deck_directory(self._directory, name))
+
+    def iter_results(self) -> Iterator[tuple[str, list[dict]]]:
+        for name in self._decks:
+            yield name, self.results(name)
+
+    def run(
+        self,
+        pool: WarmWorkerPool | None = None,
+        retry_failed: bool = False,
+        index: ScoreIndex | None = None,
+    ) -> BatchSummary:
+        """
+        Processes the pending decks, in the pool's workers if given, and
+        returns a summary of the slides scored by this run.
+
+        Args:
+            index (ScoreIndex | None): receives all the results of each deck
+                as it completes, including slides scored by earlier runs.
+        """
+        tasks: Iterable[tuple] = [
+            (
+                self._directory,
+                name,
+                self._decks[name],
+                self._shard_size,
+                self._config,
+            )
+            for name in self.pending(retry_failed)
+        ]
+        if pool is None:
+            outcomes: Iterable[tuple[str, dict]] = (
+                process_deck(*task) for task in tasks
+            )
+        else:
+            outcomes = pool.imap_tasks(process_deck, tasks)
+
+        summary = BatchSummary()
+        for name, deck_result in outcomes:
+            summary.add(name, deck_result)
+            if index is not None and deck_result["error"] is None:
+                index.add_deck(name, self.results(name))
+        return summary
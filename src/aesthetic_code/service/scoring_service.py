@@ -0,0 +1,326 @@
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import AsyncGenerator
+
+from aesthetic_code.extractors.ingest import (
+    DeckSource,
+    SharedDeck,
+    SharedDeckHandle,
+    open_presentation,
+)
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.slide_scorer import PowerPointScorer
+from aesthetic_code.segmenter.fingerprint import LayoutCache
+
+# Per worker process, so repeated layouts are scored once across tasks and decks
+_layout_cache = LayoutCache()
+# Per worker process, the decks parsed for the latest shared decks, as every
+# chunk task of a deck would otherwise parse it again
+_open_decks: OrderedDict[
+    tuple[SharedDeckHandle, ScoringConfig | None], PowerPointScorer
+] = OrderedDict()
+MAX_OPEN_DECKS = 4
+
+
+class ServiceOverloaded(Exception):
+    """Raised when a deck arrives while the request queue is full."""
+
+
+def deck_scorer(
+    deck: DeckSource, config: ScoringConfig | None = None
+) -> PowerPointScorer:
+    """
+    Returns a scorer for a deck in a worker. Scoring only needs geometry and
+    text, so media parts are never loaded. A shared deck is parsed once per
+    worker: its scorer is kept for the following tasks of the same handle and
+    config.
+    """
+    key = (deck, config) if isinstance(deck, SharedDeckHandle) else None
+    if key is not None and key in _open_decks:
+        _open_decks.move_to_end(key)
+        return _open_decks[key]
+    scorer = PowerPointScorer(
+        open_presentation(deck, skip_media=True),
+        layout_cache=_layout_cache,
+        config=config,
+    )
+    if key is not None:
+        _open_decks[key] = scorer
+        if len(_open_decks) > MAX_OPEN_DECKS:
+            _open_decks.popitem(last=False)
+    return scorer
+
+
+def count_slides(deck: DeckSource, config: ScoringConfig | None = None) -> int:
+    """
+    Worker task: returns the number of slides in a deck.
+    """
+    return deck_scorer(deck, config).slide_count
+
+
+def score_slides(
+    deck: DeckSource, slide_indices: list[int], config: ScoringConfig | None = None
+) -> list[dict]:
+    """
+    Worker task: scores a chunk of slides of a deck.
+    """
+    scorer = deck_scorer(deck, config)
+    return [scorer.score_slide(index) for index in slide_indices]
+
+
+class ScoringService:
+    """
+    Asyncio front-end that scores uploaded decks on a bounded process pool.
+
+    Parsing, segmenting and scoring all run in worker processes so the event loop
+    only moves bytes. At most `max_concurrent_decks` decks are processed at once,
+    up to `max_queued_decks` more wait for a slot and anything beyond that is
+    rejected with `ServiceOverloaded`. Each deck must finish within
+    `request_timeout` seconds; a deck that times out keeps its slot until the
+    chunks its workers already started are done.
+
+    With `share_decks`, a deck being scored is copied once into shared memory
+    and workers read it from there, instead of every chunk task pickling its
+    own copy of the upload. Decks are scored under `config`, the default
+    `ScoringConfig` if None.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_concurrent_decks: int = 4,
+        max_queued_decks: int = 16,
+        request_timeout: float = 60.0,
+        chunk_size: int = 4,
+        max_body_size: int = 200 * 1024 * 1024,
+        executor: Executor | None = None,
+        share_decks: bool = True,
+        config: ScoringConfig | None = None,
+    ):
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self._owns_executor = executor is None
+        self._slots = asyncio.Semaphore(max_concurrent_decks)
+        self._max_queued_decks = max_queued_decks
+        self._queued_decks = 0
+        self._request_timeout = request_timeout
+        self._chunk_size = chunk_size
+        self._max_body_size = max_body_size
+        self._share_decks = share_decks
+        self._config = config
+
+    async def score_deck(self, deck: bytes) -> AsyncGenerator[dict, None]:
+        """
+        Yields the score dict of every slide of a deck as soon as its chunk is
+        done, so results do not come back in slide order.
+
+        Raises:
+            ServiceOverloaded: if the request queue is full.
+            TimeoutError: if the deck takes longer than the request timeout.
+        """
+        if self._queued_decks >= self._max_queued_decks:
+            raise ServiceOverloaded("Too many decks waiting to be scored")
+
+        loop = asyncio.get_running_loop()
+        # Every await gets its own deadline-bound timeout, as a timeout spanning
+        # the yields would also fire while the caller is busy with a result
+        deadline = loop.time() + self._request_timeout
+        self._queued_decks += 1
+        try:
+            async with asyncio.timeout_at(deadline):
+                await self._slots.acquire()
+        finally:
+            self._queued_decks -= 1
+
+        # Executor futures, so that the ones already running can be waited for
+        pending: list[Future] = []
+        shared_deck = None
+        try:
+            source: DeckSource = deck
+            if self._share_decks:
+                shared_deck = SharedDeck(deck)
+                source = shared_deck.handle
+            pending.append(self._executor.submit(count_slides, source, self._config))
+            async with asyncio.timeout_at(deadline):
+                slide_count = await asyncio.wrap_future(pending[0])
+            chunks = []
+            for start in range(0, slide_count, self._chunk_size):
+                slide_indices = list(
+                    range(start, min(start + self._chunk_size, slide_count))
+                )
+                chunks.append(
+                    self._executor.submit(
+                        score_slides, source, slide_indices, self._config
+                    )
+                )
+            pending.extend(chunks)
+            for chunk in asyncio.as_completed(map(asyncio.wrap_future, chunks)):
+                async with asyncio.timeout_at(deadline):
+                    results = await chunk
+                for result in results:
+                    yield result
+        finally:
+            # Chunks not started yet are dropped; the slot is held until the
+            # running ones are done, so at most `max_concurrent_decks` decks
+            # occupy the pool even after a timeout
+            for future in pending:
+                future.cancel()
+            try:
+                await asyncio.gather(
+                    *map(asyncio.wrap_future, pending), return_exceptions=True
+                )
+            finally:
+                if shared_deck is not None:
+                    shared_deck.close()
+                self._slots.release()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves one HTTP/1.1 request: POST /score with the deck as the body streams
+        back one JSON line per slide using chunked transfer encoding.
+        """
+        try:
+            method, path, body = await self._read_request(reader)
+            if method == "GET" and path == "/health":
+                await self._write_response(writer, 200, {"status": "ok"})
+            elif method == "POST" and path == "/score":
+                await self._stream_scores(writer, body)
+            else:
+                await self._write_response(writer, 404, {"error": "Not found"})
+        except ValueError as error:
+            await self._write_response(writer, 400, {"error": str(error)})
+        except OverflowError as error:
+            await self._write_response(writer, 413, {"error": str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise ValueError("Malformed request line")
+        method, path, _ = request_line
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        content_length = int(headers.get("content-length", 0))
+        if content_length > self._max_body_size:
+            raise OverflowError("Deck too large")
+        body = await reader.readexactly(content_length) if content_length else b""
+        return method, path, body
+
+    async def _write_response(
+        self, writer: asyncio.StreamWriter, status: int, payload: dict
+    ) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _stream_scores(self, writer: asyncio.StreamWriter, deck: bytes) -> None:
+        if not deck:
+            raise ValueError("Empty deck")
+        results = self.score_deck(deck)
+        try:
+            first = await anext(results, None)
+        except ServiceOverloaded as error:
+            await self._write_response(writer, 503, {"error": str(error)})
+            return
+        except TimeoutError:
+            await self._write_response(writer, 504, {"error": "Scoring timed out"})
+            return
+        except Exception as error:
+            await self._write_response(writer, 422, {"error": repr(error)})
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        try:
+            if first is not None:
+                await self._write_chunk(writer, first)
+            async for result in results:
+                await self._write_chunk(writer, result)
+        except TimeoutError:
+            await self._write_chunk(writer, {"error": "Scoring timed out"})
+        except Exception as error:
+            await self._write_chunk(writer, {"error": repr(error)})
+        finally:
+            await results.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _write_chunk(self, writer: asyncio.StreamWriter, payload: dict) -> None:
+        data = json.dumps(payload).encode() + b"\n"
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        # Waits for slow clients instead of buffering their results in memory
+        await writer.drain()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.Server:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+async def request_scores(
+    host: str, port: int, deck: bytes, path: str = "/score"
+) -> tuple[int, list[dict]]:
+    """
+    Minimal client for the service: posts a deck and returns the status code and
+    the decoded JSON lines of the response.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Length: {len(deck)}\r\n\r\n".encode() + deck
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while line := (await reader.readline()).strip():
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        body = b""
+        while size := int((await reader.readline()).strip(), 16):
+            body += await reader.readexactly(size)
+            await reader.readline()
+        await reader.readline()
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    writer.close()
+    await writer.wait_closed()
+
+    return status, [json.loads(line) for line in body.splitlines() if line]
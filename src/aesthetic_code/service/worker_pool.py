@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import multiprocessing
+from functools import partial
+from multiprocessing.pool import AsyncResult
+from typing import Any, Callable, Iterable, Iterator
+
+from aesthetic_code.extractors.ingest import DeckSource, open_presentation
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.slide_scorer import (
+    SLIDE_SCORES,
+    PowerPointScorer,
+    ScorerError,
+)
+from aesthetic_code.segmenter.fingerprint import LayoutCache
+from aesthetic_code.service.batch import BatchSummary
+from aesthetic_code.storage.score_index import ScoreIndex
+
+# Per worker process, so repeated layouts are scored once across tasks and decks
+_layout_cache = LayoutCache()
+
+
+def warm_up() -> None:
+    """
+    Pays the one-off costs of the first deck: imports python-pptx and lxml,
+    builds the shape extractor map and opens the default template once, which
+    loads every part class and the XML parser it registers.
+    """
+    from pptx import Presentation
+
+    from aesthetic_code.extractors.factories import get_shape_extractor_map
+
+    get_shape_extractor_map()
+    Presentation()
+
+
+def open_scorer(
+    deck: DeckSource,
+    isolate_errors: bool = False,
+    config: ScoringConfig | None = None,
+) -> PowerPointScorer:
+    """
+    Opens a deck for scoring in a worker. Scoring only needs geometry and text,
+    so media parts are never loaded.
+    """
+    return PowerPointScorer(
+        open_presentation(deck, skip_media=True),
+        layout_cache=_layout_cache,
+        isolate_errors=isolate_errors,
+        config=config,
+    )
+
+
+def score_slides_isolated(
+    scorer: PowerPointScorer, slide_indices: Iterable[int]
+) -> list[dict]:
+    """
+    Scores slides with an error-isolating scorer; a slide that fails outside
+    the scorers is returned with every score None and the error recorded.
+    """
+    results = []
+    for slide_index in slide_indices:
+        try:
+            results.append(scorer.score_slide(slide_index))
+        except Exception as error:
+            results.append(
+                {
+                    "slide_index": slide_index,
+                    **{name: None for name in SLIDE_SCORES},
+                    "errors": [ScorerError.from_exception("slide", error)._asdict()],
+                }
+            )
+    return results
+
+
+def score_deck(
+    deck: DeckSource,
+    slide_indices: list[int] | None = None,
+    config: ScoringConfig | None = None,
+) -> list[dict]:
+    """
+    Worker task: scores the given slides of a deck, or all of them.
+    """
+    scorer = open_scorer(deck, config=config)
+    if slide_indices is None:
+        return scorer.score_all()
+    return [scorer.score_slide(index) for index in slide_indices]
+
+
+def score_deck_isolated(
+    deck: DeckSource,
+    slide_indices: list[int] | None = None,
+    config: ScoringConfig | None = None,
+) -> dict:
+    """
+    Worker task: `score_deck` that never raises. Returns {"results", "error"}:
+    the slide results, each with its "errors", and the error that kept the
+    deck from being opened, if any.
+    """
+    try:
+        scorer = open_scorer(deck, isolate_errors=True, config=config)
+        if slide_indices is None:
+            slide_indices = list(range(scorer.slide_count))
+    except Exception as error:
+        return {
+            "results": [],
+            "error": ScorerError.from_exception("open", error)._asdict(),
+        }
+    return {"results": score_slides_isolated(scorer, slide_indices), "error": None}
+
+
+def _score_named_deck(
+    named_deck: tuple[str, DeckSource], config: ScoringConfig | None = None
+) -> tuple[str, list[dict]]:
+    name, deck = named_deck
+    return name, score_deck(deck, config=config)
+
+
+def _call(task: tuple[Callable, tuple]) -> Any:
+    function, arguments = task
+    return function(*arguments)
+
+
+def _score_named_deck_isolated(
+    named_deck: tuple[str, DeckSource], config: ScoringConfig | None = None
+) -> tuple[str, dict]:
+    name, deck = named_deck
+    return name, score_deck_isolated(deck, config=config)
+
+
+class WarmWorkerPool:
+    """
+    Process pool whose workers start with python-pptx already imported and warm.
+
+    The parent warms up before forking, so every worker, including the ones
+    forked later to replace recycled workers, inherits the loaded modules
+    instead of importing them again. Workers exit after `max_tasks_per_child`
+    tasks to bound the memory held by lxml trees and caches. Where fork is not
+    available, workers warm up in their initializer instead.
+
+    Decks are file paths, .pptx bytes or the handle of a `SharedDeck`; the
+    latter avoids pickling a large deck into every task that reads it. Every
+    deck is scored under `config`, the default `ScoringConfig` if None.
+
+    Usage:
+        with WarmWorkerPool(processes=4) as pool:
+            scores = pool.map(["a.pptx", "b.pptx"])
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        max_tasks_per_child: int | None = 100,
+        config: ScoringConfig | None = None,
+    ):
+        self._config = config
+        fork = "fork" in multiprocessing.get_all_start_methods()
+        if fork:
+            warm_up()
+        context = multiprocessing.get_context("fork" if fork else None)
+        self._pool = context.Pool(
+            processes,
+            # Forked workers inherit the warm parent, so they skip the warm-up
+            initializer=None if fork else warm_up,
+            maxtasksperchild=max_tasks_per_child,
+        )
+
+    def __enter__(self) -> WarmWorkerPool:
+        return self
+
+    @property
+    def config(self) -> ScoringConfig | None:
+        return self._config
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(
+        self, deck: DeckSource, slide_indices: list[int] | None = None
+    ) -> AsyncResult:
+        """
+        Schedules a deck, or some of its slides, and returns the pending result,
+        whose `get()` gives the list of slide score dicts.
+        """
+        return self._pool.apply_async(score_deck, (deck, slide_indices, self._config))
+
+    def map(self, decks: Iterable[DeckSource]) -> list[list[dict]]:
+        """
+        Scores every deck, one task per deck, and returns the results in order.
+        """
+        return self._pool.map(
+            partial(score_deck, config=self._config), decks, chunksize=1
+        )
+
+    def imap_unordered(self, decks: Iterable[DeckSource]) -> Iterator[list[dict]]:
+        """
+        Yields the scores of each deck as soon as it is done.
+        """
+        return self._pool.imap_unordered(
+            partial(score_deck, config=self._config), decks, chunksize=1
+        )
+
+    def index_decks(
+        self, named_decks: Iterable[tuple[str, DeckSource]], index: ScoreIndex
+    ) -> int:
+        """
+        Scores (name, deck) pairs and writes each deck's results to a score index
+        as soon as it is done. Returns the number of decks indexed.
+        """
+        count = 0
+        for name, results in self._pool.imap_unordered(
+            partial(_score_named_deck, config=self._config), named_decks, chunksize=1
+        ):
+            index.add_deck(name, results)
+            count += 1
+        return count
+
+    def run_batch(
+        self,
+        named_decks: Iterable[tuple[str, DeckSource]],
+        index: ScoreIndex | None = None,
+        summary: BatchSummary | None = None,
+    ) -> BatchSummary:
+        """
+        Scores (name, deck) pairs in fault-isolated mode: a failing scorer,
+        slide or deck is recorded in the summary and the batch carries on. The
+        partial results of each deck are written to `index`, if given.
+        """
+        summary = BatchSummary() if summary is None else summary
+        for name, deck_result in self._pool.imap_unordered(
+            partial(_score_named_deck_isolated, config=self._config),
+            named_decks,
+            chunksize=1,
+        ):
+            if index is not None and deck_result["results"]:
+                index.add_deck(name, deck_result["results"])
+            summary.add(name, deck_result)
+        return summary
+
+    def imap_tasks(self, function: Callable, tasks: Iterable[tuple]) -> Iterator[Any]:
+        """
+        Calls a module-level function with each tuple of arguments in the warm
+        workers, yielding the results as they finish. For work other than
+        scoring whole decks, such as checkpointed jobs.
+        """
+        return self._pool.imap_unordered(
+            _call, ((function, arguments) for arguments in tasks), chunksize=1
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING, TypeAlias, Union
+
+if TYPE_CHECKING:
+    from pptx.shapes.autoshape import Shape as AutoShape
+    from pptx.shapes.base import BaseShape
+    from pptx.shapes.connector import Connector
+    from pptx.shapes.graphfrm import GraphicFrame
+    from pptx.shapes.group import GroupShape
+    from pptx.shapes.picture import Movie, Picture
+    from pptx.shapes.placeholder import BasePlaceholder
+
+# The pptx shape classes are only imported for type checking, importing pptx
+# costs more than everything else a short-lived process does before its first deck
+Shape: TypeAlias = Union[
+    "BaseShape",
+    "AutoShape",
+    "Connector",
+    "GraphicFrame",
+    "GroupShape",
+    "Picture",
+    "Movie",
+    "BasePlaceholder",
+]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable
+
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    embedding BLOB NOT NULL
+);
+"""
+
+# Keys per query, below SQLite's default limit on bound parameters
+_QUERY_SIZE = 500
+
+
+class EmbeddingCache:
+    """
+    On-disk SQLite map from thumbnail keys to float32 image embeddings, so each
+    unique thumbnail is embedded once across runs and worker processes. Keys
+    should name the embedder too, as `ThumbnailEmbedder`'s do.
+
+    Usage:
+        with EmbeddingCache("embeddings.sqlite") as cache:
+            found = cache.get_many(keys)
+            cache.put_many({key: embedding for key, embedding in computed})
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> EmbeddingCache:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        row = self._connection.execute(
+            "SELECT 1 FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        return row is not None
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, np.ndarray]:
+        """
+        Returns the cached embeddings of the keys that have one.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), _QUERY_SIZE):
+            batch = keys[start : start + _QUERY_SIZE]
+            rows = self._connection.execute(
+                "SELECT key, embedding FROM embeddings "
+                f"WHERE key IN ({', '.join('?' for _ in batch)})",
+                batch,
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, embeddings: dict[str, np.ndarray]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                [
+                    (key, np.asarray(embedding, dtype=np.float32).tobytes())
+                    for key, embedding in embeddings.items()
+                ],
+            )
+
+    def close(self) -> None:
+        self._connection.close()
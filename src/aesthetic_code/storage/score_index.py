@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterator
+
+from aesthetic_code.scorer.slide_scorer import SLIDE_SCORES
+
+SLIDE_FIELDS = ("slide_id", "shape_count", "layout_fingerprint")
+
+# Columns that can be filtered and sorted on
+INDEX_COLUMNS = ("deck", "slide_index", *SLIDE_FIELDS, *SLIDE_SCORES)
+
+_SCORE_COLUMNS = ",\n".join(f"    {score} REAL" for score in SLIDE_SCORES)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS slides (
+    deck TEXT NOT NULL,
+    slide_index INTEGER NOT NULL,
+    slide_id INTEGER,
+    shape_count INTEGER,
+    layout_fingerprint TEXT,
+{_SCORE_COLUMNS},
+    PRIMARY KEY (deck, slide_index)
+);
+""" + "".join(
+    f"CREATE INDEX IF NOT EXISTS slides_{column} ON slides ({column});\n"
+    for column in ("shape_count", *SLIDE_SCORES)
+)
+
+
+def _check_column(column: str) -> str:
+    # Column names are interpolated into SQL, so only known names get through
+    if column not in INDEX_COLUMNS:
+        raise ValueError(f"Unknown score index column: {column}")
+    return column
+
+
+class ScoreIndex:
+    """
+    On-disk SQLite index of per-slide scores, one row per slide as returned by
+    `PowerPointScorer.score_slide`, with an index on the shape count and on
+    every score so filtered top-k queries do not scan the whole corpus.
+
+    Usage:
+        with ScoreIndex("scores.sqlite") as index:
+            index.add_deck("deck.pptx", PowerPointScorer(ppt).score_all())
+            index.lowest("group_spacing", 100, shape_count=(21, None))
+    """
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> ScoreIndex:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM slides").fetchone()[0]
+
+    def add_deck(self, deck: str, results: list[dict]) -> None:
+        """
+        Stores the slide results of a deck in one transaction, replacing any
+        earlier results for the deck: slides the deck no longer has are gone.
+        """
+        columns = ("deck", "slide_index", *SLIDE_FIELDS, *SLIDE_SCORES)
+        rows = [
+            (deck, result["slide_index"], *(result.get(c) for c in columns[2:]))
+            for result in results
+        ]
+        with self._connection:
+            self._connection.execute("DELETE FROM slides WHERE deck = ?", (deck,))
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO slides ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                rows,
+            )
+
+    def decks(self) -> list[str]:
+        rows = self._connection.execute(
+            "SELECT DISTINCT deck FROM slides ORDER BY deck"
+        )
+        return [row[0] for row in rows]
+
+    def query(
+        self,
+        order_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        **filters,
+    ) -> list[dict]:
+        """
+        Returns the slides matching every filter as dicts, sorted on a column.
+
+        Args:
+            order_by (str | None): column to sort on. Slides where it is NULL,
+                e.g. a score that does not apply, are left out.
+            descending (bool): sort from the highest value.
+            limit (int | None): maximum number of slides.
+            **filters: a column name mapped to an exact value, or to an inclusive
+                (low, high) range where None leaves a side open, e.g.
+                `shape_count=(21, None)` or `deck="a.pptx"`.
+        """
+        clauses, parameters = [], []
+        for column, value in filters.items():
+            _check_column(column)
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append(f"{column} >= ?")
+                    parameters.append(low)
+                if high is not None:
+                    clauses.append(f"{column} <= ?")
+                    parameters.append(high)
+            else:
+                clauses.append(f"{column} = ?")
+                parameters.append(value)
+
+        sql = "SELECT * FROM slides"
+        if order_by is not None:
+            clauses.append(f"{_check_column(order_by)} IS NOT NULL")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by is not None:
+            direction = "DESC" if descending else "ASC"
+            sql += f" ORDER BY {order_by} {direction}, deck, slide_index"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [dict(row) for row in self._connection.execute(sql, parameters)]
+
+    def iter_batches(self, batch_size: int = 10_000) -> Iterator[list[dict]]:
+        """
+        Yields every slide in (deck, slide_index) order, `batch_size` rows at a
+        time, so a corpus can be processed without loading it whole.
+        """
+        cursor = self._connection.execute(
+            "SELECT * FROM slides ORDER BY deck, slide_index"
+        )
+        while rows := cursor.fetchmany(batch_size):
+            yield [dict(row) for row in rows]
+
+    def lowest(self, score: str, count: int, **filters) -> list[dict]:
+        """
+        Returns the `count` slides with the lowest value of a score.
+        """
+        if score not in SLIDE_SCORES:
+            raise ValueError(f"Invalid score: {score}")
+        return self.query(order_by=score, limit=count, **filters)
+
+    def close(self) -> None:
+        self._connection.close()
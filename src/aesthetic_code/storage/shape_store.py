@@ -0,0 +1,289 @@
+import json
+import os
+
+import numpy as np
+
+SHAPE_COLUMNS = {
+    "deck_index": np.int32,
+    "slide_index": np.int32,
+    "slide_id": np.int64,
+    "shape_id": np.int64,
+    "shape_type": np.int16,
+    "left": np.float64,
+    "top": np.float64,
+    "width": np.float64,
+    "height": np.float64,
+}
+SLIDE_COLUMNS = {
+    "slide_shape_offset": np.int64,
+    "slide_deck_index": np.int32,
+}
+DECK_COLUMNS = {
+    "deck_slide_offset": np.int64,
+    "deck_slide_width": np.float64,
+    "deck_slide_height": np.float64,
+}
+BLOB_COLUMNS = ("name", "text")
+
+METADATA_FILE = "metadata.json"
+
+
+def _column_path(path: str, column: str) -> str:
+    return os.path.join(path, f"{column}.bin")
+
+
+class ShapeStoreWriter:
+    """
+    Appends extracted decks to a columnar shape store on disk.
+
+    Numeric fields go to fixed-width column files, names and texts to a byte blob
+    with an offsets column, and the measurement unit and shape type names are
+    stored once in the metadata. Rows are streamed to disk deck by deck, so
+    memory use does not grow with the size of the corpus.
+
+    Usage:
+        with ShapeStoreWriter(path) as writer:
+            writer.add_deck("deck.pptx", PowerPointShapeExtractor(ppt).extract_ppt())
+    """
+
+    def __init__(self, path: str, measurement_unit: str = "pt"):
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, METADATA_FILE)):
+            raise FileExistsError(f"Shape store already exists at {path}")
+        self._path = path
+        self._measurement_unit = measurement_unit
+        self._shape_types: dict[str, int] = {}
+        self._deck_names: list[str] = []
+        self._shape_count = 0
+        self._slide_count = 0
+        self._blob_sizes = {column: 0 for column in BLOB_COLUMNS}
+
+        columns = [*SHAPE_COLUMNS, *SLIDE_COLUMNS, *DECK_COLUMNS]
+        columns += [f"{column}_offset" for column in BLOB_COLUMNS]
+        columns += [f"{column}_blob" for column in BLOB_COLUMNS]
+        self._files = {
+            column: open(_column_path(path, column), "wb") for column in columns
+        }
+        for column in BLOB_COLUMNS:
+            self._write(f"{column}_offset", np.zeros(1, dtype=np.int64))
+
+    def __enter__(self) -> "ShapeStoreWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _write(self, column: str, values: np.ndarray) -> None:
+        values.tofile(self._files[column])
+
+    def _shape_type_code(self, shape_type: str) -> int:
+        if shape_type not in self._shape_types:
+            self._shape_types[shape_type] = len(self._shape_types)
+        return self._shape_types[shape_type]
+
+    def _write_blob(self, column: str, values: list[str]) -> None:
+        encoded = [value.encode("utf-8") for value in values]
+        lengths = np.array([len(value) for value in encoded], dtype=np.int64)
+        offsets = self._blob_sizes[column] + np.cumsum(lengths)
+        self._files[f"{column}_blob"].write(b"".join(encoded))
+        self._write(f"{column}_offset", offsets)
+        if len(offsets):
+            self._blob_sizes[column] = int(offsets[-1])
+
+    def add_deck(self, name: str, ppt_data: dict) -> int:
+        """
+        Appends a deck as returned by `PowerPointShapeExtractor.extract_ppt` and
+        returns its deck index.
+
+        The deck's rows are built and validated in memory before anything is
+        written, so a rejected deck leaves the store unchanged.
+
+        Raises:
+            ValueError: if a shape is measured in another unit than the store.
+        """
+        deck_index = len(self._deck_names)
+        # Shape types are coded once the deck is accepted, see below
+        rows: dict[str, list] = {
+            column: [] for column in SHAPE_COLUMNS if column != "shape_type"
+        }
+        blobs: dict[str, list[str]] = {column: [] for column in BLOB_COLUMNS}
+        shape_types: list[str] = []
+        slide_offsets = []
+        for slide_index, slide in enumerate(ppt_data["slides"]):
+            slide_offsets.append(self._shape_count + len(rows["shape_id"]))
+            for shape in slide["shapes"]:
+                if shape.get("measurement_unit", self._measurement_unit) != (
+                    self._measurement_unit
+                ):
+                    raise ValueError(
+                        f"Shape measured in {shape['measurement_unit']}, "
+                        f"store uses {self._measurement_unit}"
+                    )
+                rows["deck_index"].append(deck_index)
+                rows["slide_index"].append(slide_index)
+                rows["slide_id"].append(slide["slide_id"])
+                rows["shape_id"].append(shape["shape_id"])
+                shape_types.append(shape["shape_type"])
+                for column in ("left", "top", "width", "height"):
+                    rows[column].append(shape[column])
+                blobs["name"].append(shape.get("name", ""))
+                blobs["text"].append(shape.get("text", ""))
+
+        columns = {
+            column: np.array(values, dtype=SHAPE_COLUMNS[column])
+            for column, values in rows.items()
+        }
+        deck_columns = {
+            "deck_slide_offset": np.array([self._slide_count], np.int64),
+            "deck_slide_width": np.array([ppt_data["slide_width"]], np.float64),
+            "deck_slide_height": np.array([ppt_data["slide_height"]], np.float64),
+        }
+
+        # Validated: from here on the deck is written in full
+        columns["shape_type"] = np.array(
+            [self._shape_type_code(shape_type) for shape_type in shape_types],
+            dtype=SHAPE_COLUMNS["shape_type"],
+        )
+        self._deck_names.append(name)
+        for column, values in deck_columns.items():
+            self._write(column, values)
+        for column in SHAPE_COLUMNS:
+            self._write(column, columns[column])
+        for column in BLOB_COLUMNS:
+            self._write_blob(column, blobs[column])
+        self._write("slide_shape_offset", np.array(slide_offsets, dtype=np.int64))
+        self._write(
+            "slide_deck_index", np.full(len(slide_offsets), deck_index, np.int32)
+        )
+
+        self._shape_count += len(shape_types)
+        self._slide_count += len(slide_offsets)
+        return deck_index
+
+    def close(self) -> None:
+        if not self._files:
+            return
+        # Closing sentinels, so row ranges are offsets[i]:offsets[i + 1]
+        self._write("slide_shape_offset", np.array([self._shape_count], np.int64))
+        self._write("deck_slide_offset", np.array([self._slide_count], np.int64))
+        for column_file in self._files.values():
+            column_file.close()
+        self._files = {}
+
+        metadata = {
+            "measurement_unit": self._measurement_unit,
+            "shape_count": self._shape_count,
+            "slide_count": self._slide_count,
+            "deck_names": self._deck_names,
+            "shape_types": list(self._shape_types),
+        }
+        with open(os.path.join(self._path, METADATA_FILE), "w") as metadata_file:
+            json.dump(metadata, metadata_file)
+
+
+class ShapeStore:
+    """
+    Read-only, memory-mapped view of a store written by `ShapeStoreWriter`.
+
+    Columns are numpy memmaps, so slicing the rows of a deck or a slide only
+    touches the pages they live on and nothing is deserialised up front.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, METADATA_FILE)) as file:
+            self._metadata = json.load(file)
+        self._path = path
+        self._columns: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self._metadata["shape_count"]
+
+    @property
+    def measurement_unit(self) -> str:
+        return self._metadata["measurement_unit"]
+
+    @property
+    def deck_names(self) -> list[str]:
+        return self._metadata["deck_names"]
+
+    @property
+    def shape_types(self) -> list[str]:
+        """
+        Shape type names, indexed by the codes in the shape_type column.
+        """
+        return self._metadata["shape_types"]
+
+    @property
+    def slide_count(self) -> int:
+        return self._metadata["slide_count"]
+
+    def column(self, column: str) -> np.ndarray:
+        if column not in self._columns:
+            dtypes = {**SHAPE_COLUMNS, **SLIDE_COLUMNS, **DECK_COLUMNS}
+            for blob_column in BLOB_COLUMNS:
+                dtypes[f"{blob_column}_offset"] = np.int64
+                dtypes[f"{blob_column}_blob"] = np.uint8
+            if column not in dtypes:
+                raise KeyError(f"Unknown column: {column}")
+            file_path = _column_path(self._path, column)
+            if os.path.getsize(file_path) == 0:
+                self._columns[column] = np.zeros(0, dtype=dtypes[column])
+            else:
+                self._columns[column] = np.memmap(
+                    file_path, dtype=dtypes[column], mode="r"
+                )
+        return self._columns[column]
+
+    def geometry(self, rows: slice = slice(None)) -> np.ndarray:
+        """
+        Returns an (n, 4) array of (left, top, width, height) for the given rows.
+        """
+        return np.stack(
+            [self.column(name)[rows] for name in ("left", "top", "width", "height")],
+            axis=-1,
+        )
+
+    def deck_slides(self, deck_index: int) -> slice:
+        """
+        Returns the global slide numbers of a deck as a slice.
+        """
+        offsets = self.column("deck_slide_offset")
+        return slice(int(offsets[deck_index]), int(offsets[deck_index + 1]))
+
+    def deck_rows(self, deck_index: int) -> slice:
+        slides = self.deck_slides(deck_index)
+        offsets = self.column("slide_shape_offset")
+        return slice(int(offsets[slides.start]), int(offsets[slides.stop]))
+
+    def slide_rows(self, deck_index: int, slide_index: int) -> slice:
+        slides = self.deck_slides(deck_index)
+        slide = slides.start + slide_index
+        if not slides.start <= slide < slides.stop:
+            raise IndexError(f"Deck {deck_index} has no slide {slide_index}")
+        offsets = self.column("slide_shape_offset")
+        return slice(int(offsets[slide]), int(offsets[slide + 1]))
+
+    def slide_size(self, deck_index: int) -> tuple[float, float]:
+        return (
+            float(self.column("deck_slide_width")[deck_index]),
+            float(self.column("deck_slide_height")[deck_index]),
+        )
+
+    def _blob_values(self, column: str, rows: slice) -> list[str]:
+        start, stop, _ = rows.indices(len(self))
+        offsets = self.column(f"{column}_offset")[start : stop + 1]
+        if len(offsets) < 2:
+            return []
+        blob = self.column(f"{column}_blob")[int(offsets[0]) : int(offsets[-1])]
+        data = blob.tobytes()
+        base = int(offsets[0])
+        return [
+            data[begin - base : end - base].decode("utf-8")
+            for begin, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+        ]
+
+    def names(self, rows: slice = slice(None)) -> list[str]:
+        return self._blob_values("name", rows)
+
+    def texts(self, rows: slice = slice(None)) -> list[str]:
+        return self._blob_values("text", rows)
@@ -1,4 +1,9 @@
-from pptx.util import Length
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pptx.util import Length
 
 
 def unit_conversion(value: Length | None, unit: str) -> int | float:
@@ -0,0 +1,31 @@
+import io
+from typing import Callable
+
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+
+def make_deck_bytes(n_slides: int = 3, shift: int = 20) -> bytes:
+    """
+    Returns a deck of three rectangles per slide, the second moving right by
+    `shift` points from one slide to the next so every slide has its own layout.
+    """
+    prs = Presentation()
+    for i in range(n_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        for left, top in [(100, 100), (300 + shift * i, 100), (100, 300)]:
+            slide.shapes.add_shape(1, Pt(left), Pt(top), Pt(150), Pt(100))
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def deck_factory() -> Callable[..., bytes]:
+    return make_deck_bytes
+
+
+@pytest.fixture(scope="module")
+def deck(deck_factory) -> bytes:
+    return deck_factory()
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from aesthetic_code.scorer.alignment_index import AlignmentIndex
+from aesthetic_code.scorer.alignment_scorer import AlignmentScorer, SlideAlignmentScorer
+from aesthetic_code.segmenter.segmenter import (
+    BoxSegmenter,
+    LayoutBox,
+    get_all_neighbor_pairs,
+)
+
+
+def test_alignment_index():
+    boxes = np.array(
+        [
+            [0, 0, 100, 50],
+            [0.4, 60, 100, 110],
+            [200, 0, 300, 49.8],
+            [500, 500, 600, 600],
+        ]
+    )
+    exact = AlignmentIndex(boxes)
+    assert exact.aligned_with(0, "left") == []
+    assert exact.aligned_with(0, "right") == [1]
+    assert exact.shared_edges(0, 2) == ("top",)
+
+    index = AlignmentIndex(boxes, tolerance=0.5)
+    assert index.aligned_with(0, "left") == [1]
+    assert index.shared_edges(0, 2) == ("top", "bottom", "center_y")
+    assert list(index.aligned([0, 0], [1, 3], "left")) == [True, False]
+    lines = index.lines("left")
+    assert [line.members for line in lines] == [(0, 1)]
+    assert lines[0].position == pytest.approx(0.2)
+    assert {line.edge for line in index.lines()} == {
+        "left",
+        "right",
+        "center_x",
+        "top",
+        "bottom",
+        "center_y",
+    }
+    assert len(AlignmentIndex(np.empty((0, 4))).lines()) == 0
+    with pytest.raises(ValueError):
+        index.buckets("middle")
+
+
+def test_alignment_index_does_not_chain_staggered_edges():
+    # Left edges every 2pt over 40pt, with a 3pt tolerance
+    lefts = np.arange(0, 42, 2, dtype=float)
+    boxes = np.stack([lefts, np.zeros_like(lefts), lefts + 100, lefts + 50], axis=1)
+    index = AlignmentIndex(boxes, tolerance=3.0)
+    lines = index.lines("left")
+    assert len(lines) > 1
+    for line in lines:
+        positions = lefts[list(line.members)]
+        assert positions.max() - positions.min() <= 3.0
+    assert not index.aligned([0], [20], "left")[0]
+
+
+def test_slide_alignment_scorer_matches_pairwise_scorer():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        # Shapes on a coarse grid so that some edges coincide
+        corners = rng.integers(0, 8, size=(8, 2)) * 100
+        sizes = rng.integers(1, 3, size=(8, 2)) * 50
+        boxes = [
+            LayoutBox(left, top, width, height)
+            for (left, top), (width, height) in zip(corners.tolist(), sizes.tolist())
+        ]
+        tree = BoxSegmenter(boxes, 1000, 1000).segment()
+        pairs = get_all_neighbor_pairs(tree)
+        scorer = SlideAlignmentScorer(tree)
+        if not pairs:
+            assert np.isnan(scorer.score())
+            continue
+        expected = [AlignmentScorer(pair[1], pair[2]).score() for pair in pairs]
+        np.testing.assert_array_equal(scorer.pair_scores(), expected)
+        assert scorer.score() == pytest.approx(np.mean(expected))
+        assert 0.0 <= scorer.global_score() <= 1.0
+        for line in scorer.lines():
+            assert set(line.members) <= set(scorer.elements)
+
+
+def test_slide_alignment_scorer_indexes_shapes_of_multi_shape_leaves():
+    boxes = [
+        LayoutBox(0, 0, 100, 100),
+        LayoutBox(50, 50, 100, 100),  # Overlaps the first: one leaf of two shapes
+        LayoutBox(300, 0, 100, 100),
+        LayoutBox(50, 300, 100, 100),
+    ]
+    scorer = SlideAlignmentScorer(BoxSegmenter(boxes, 1000, 1000).segment())
+    assert len(scorer.shapes) == 2
+    second_shape = len(scorer.nodes) + scorer.shapes.index(boxes[1])
+    last_leaf = next(
+        i for i, node in enumerate(scorer.nodes) if node.subregions == [boxes[3]]
+    )
+    assert scorer.index.aligned_with(second_shape, "left") == [last_leaf]
+    assert (last_leaf, second_shape) in [
+        line.members for line in scorer.lines() if line.edge == "left"
+    ]
+    assert scorer.global_score() == 1.0
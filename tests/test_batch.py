@@ -0,0 +1,68 @@
+import io
+
+import pytest
+from pptx import Presentation
+
+from aesthetic_code.scorer.font_hierarchy_scorer import PowerPointFontHierarchyScorer
+from aesthetic_code.scorer.slide_scorer import PowerPointScorer
+from aesthetic_code.service.batch import BatchSummary
+from aesthetic_code.service.worker_pool import WarmWorkerPool, score_deck_isolated
+from aesthetic_code.storage.score_index import ScoreIndex
+
+
+def test_scorer_errors_are_isolated(deck, monkeypatch):
+    score_slide = PowerPointFontHierarchyScorer.score_slide
+
+    def failing_score_slide(self, slide_index):
+        if slide_index == 1:
+            raise ZeroDivisionError("float division by zero")
+        return score_slide(self, slide_index)
+
+    monkeypatch.setattr(
+        PowerPointFontHierarchyScorer, "score_slide", failing_score_slide
+    )
+    prs = Presentation(io.BytesIO(deck))
+    with pytest.raises(ZeroDivisionError):
+        PowerPointScorer(prs).score_all()
+
+    results = PowerPointScorer(prs, isolate_errors=True).score_all()
+    assert [len(result["errors"]) for result in results] == [0, 1, 0]
+    assert results[1]["errors"][0] == {
+        "stage": "font_hierarchy",
+        "error_type": "ZeroDivisionError",
+        "message": "float division by zero",
+    }
+    # The other scores of the failing slide are kept
+    assert results[1]["alignment"] is not None
+    assert results[1]["font_hierarchy"] is None
+
+
+def test_batch_summary(deck):
+    summary = BatchSummary(max_examples=1)
+    summary.add("good.pptx", score_deck_isolated(deck))
+    summary.add("bad.pptx", score_deck_isolated(b"not a deck"))
+    summary.add("short.pptx", score_deck_isolated(deck, [0, 7]))
+
+    assert summary.to_dict() == {
+        "decks": 3,
+        "failed_decks": 1,
+        "slides": 5,
+        "slides_with_errors": 1,
+        "errors": [
+            {"stage": "open", "error_type": "ValueError", "count": 1},
+            {"stage": "slide", "error_type": "IndexError", "count": 1},
+        ],
+    }
+    assert list(summary.failed_decks) == ["bad.pptx"]
+    assert summary.examples[("slide", "IndexError")][0]["slide_index"] == 7
+    assert "3 decks (1 failed to open), 5 slides (1 with errors)" in summary.format()
+
+
+def test_run_batch(deck, tmp_path):
+    with WarmWorkerPool(processes=2) as pool:
+        with ScoreIndex(str(tmp_path / "scores.sqlite")) as index:
+            summary = pool.run_batch(
+                [("a", deck), ("bad", b"not a deck"), ("b", deck)], index
+            )
+            assert index.decks() == ["a", "b"]
+    assert (summary.decks, summary.slides, len(summary.failed_decks)) == (3, 6, 1)
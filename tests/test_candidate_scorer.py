@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.scorer.alignment_scorer import AlignmentScorer
+from aesthetic_code.scorer.candidate_scorer import CandidateLayoutScorer
+from aesthetic_code.scorer.group_spacing_scorer import GroupSpacingScorer
+from aesthetic_code.scorer.size_comparison_scorer import SizeComparisonScorer
+from aesthetic_code.scorer.slide_scorer import PowerPointScorer
+from aesthetic_code.scorer.white_space_scorer import MarginWhiteSpaceScorer
+from aesthetic_code.segmenter.segmenter import (
+    PowerPointSegmenter,
+    get_all_neighbor_pairs,
+)
+
+
+@pytest.fixture
+def presentation():
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Pt(800), Pt(600)
+    slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
+    for left, top, width, height in [
+        (100, 80, 250, 100),
+        (450, 80, 250, 100),
+        (100, 300, 600, 150),
+        (100, 480, 150, 40),
+    ]:
+        slide.shapes.add_shape(1, Pt(left), Pt(top), Pt(width), Pt(height))
+    return prs
+
+
+def test_base_layout_matches_scorers(presentation):
+    slide = presentation.slides[0]
+    scorer = CandidateLayoutScorer(
+        slide, presentation.slide_width, presentation.slide_height
+    )
+    components = scorer.score_components(scorer.base_boxes[np.newaxis])
+
+    segment_tree = PowerPointSegmenter(presentation).segment(0)
+    pairs = get_all_neighbor_pairs(segment_tree)
+    expected = [
+        GroupSpacingScorer(
+            presentation.slide_width, presentation.slide_height, segment_tree
+        ).score(),
+        np.mean([AlignmentScorer(pair[1], pair[2]).score() for pair in pairs]),
+        np.mean([SizeComparisonScorer(pair[1], pair[2]).score() for pair in pairs]),
+        MarginWhiteSpaceScorer(
+            slide, presentation.slide_width, presentation.slide_height
+        ).calculate_white_space_score(),
+    ]
+    assert components[0].tolist() == pytest.approx(expected)
+
+
+def test_candidate_scores(presentation):
+    slide = presentation.slides[0]
+    scorer = CandidateLayoutScorer(
+        slide, presentation.slide_width, presentation.slide_height, mode="graded"
+    )
+    base_boxes = scorer.base_boxes
+    rng = np.random.default_rng(0)
+    offsets = rng.normal(scale=20.0, size=(16, len(base_boxes), 2))
+    candidates = base_boxes + np.concatenate([offsets, offsets], axis=-1)
+    candidates[0] = base_boxes
+
+    scores = scorer.score(candidates)
+    assert scores.shape == (16,)
+    assert np.all((scores >= 0.0) & (scores <= 1.0))
+    assert scores[0] == pytest.approx(scorer.score(base_boxes)[0])
+
+    with pytest.raises(ValueError):
+        scorer.score(candidates[:, :2])
+
+
+def test_candidate_snaps_near_aligned_boxes(presentation):
+    slide = presentation.slides[0]
+    scorer = CandidateLayoutScorer(
+        slide, presentation.slide_width, presentation.slide_height
+    )
+    # Move the top right box 1pt down, inside the 3pt alignment snap
+    shifted = scorer.base_boxes.copy()
+    shifted[1, [1, 3]] += 1.0
+    components = scorer.score_components(np.stack([scorer.base_boxes, shifted]))
+    assert components[1, 1] == pytest.approx(components[0, 1])
+
+    slide.shapes[1].top += Pt(1)
+    result = PowerPointScorer(presentation).score_all()[0]
+    assert components[1, 1] == pytest.approx(result["alignment"])
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+from pptx import Presentation
+
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.slide_scorer import PowerPointScorer
+from aesthetic_code.service import checkpoint
+from aesthetic_code.service.checkpoint import ScoringJob, deck_directory
+from aesthetic_code.service.worker_pool import WarmWorkerPool
+from aesthetic_code.storage.score_index import ScoreIndex
+
+
+@pytest.fixture
+def decks(tmp_path, deck_factory) -> dict[str, str]:
+    paths = {}
+    for name, n_slides in [("a.pptx", 3), ("b.pptx", 2)]:
+        path = tmp_path / name
+        path.write_bytes(deck_factory(n_slides))
+        paths[name] = str(path)
+    paths["broken.pptx"] = str(tmp_path / "missing.pptx")
+    return paths
+
+
+def expected_results(path: str) -> list[dict]:
+    return PowerPointScorer(Presentation(path), isolate_errors=True).score_all()
+
+
+def test_job_resumes_after_crash(decks, tmp_path, monkeypatch):
+    directory = str(tmp_path / "job")
+    job = ScoringJob(directory, decks, shard_size=1)
+
+    score_slides = checkpoint.score_slides_isolated
+    calls = []
+
+    def crashing_score_slides(scorer, slide_indices):
+        calls.append(slide_indices)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return score_slides(scorer, slide_indices)
+
+    monkeypatch.setattr(checkpoint, "score_slides_isolated", crashing_score_slides)
+    with pytest.raises(KeyboardInterrupt):
+        job.run()
+    monkeypatch.undo()
+
+    # A temporary file from an interrupted write is ignored
+    deck_dir = deck_directory(directory, "a.pptx")
+    with open(os.path.join(deck_dir, "shard-000001.jsonl.tmp-1"), "w") as file:
+        file.write('{"slide_index": 1')
+    assert job.status() == {"complete": 0, "failed": 0, "partial": 1, "pending": 2}
+
+    # Reopened from its manifest, the job scores only the missing slides
+    job = ScoringJob(directory)
+    assert job.decks == decks and job.shard_size == 1
+    with ScoreIndex(str(tmp_path / "scores.sqlite")) as index:
+        summary = job.run(index=index)
+        assert len(index) == 5
+    assert (summary.decks, summary.slides) == (3, 4)
+    assert list(summary.failed_decks) == ["broken.pptx"]
+    assert job.status() == {"complete": 2, "failed": 1, "partial": 0, "pending": 0}
+    assert job.results("a.pptx") == expected_results(decks["a.pptx"])
+    assert job.pending() == []
+    assert job.pending(retry_failed=True) == ["broken.pptx"]
+
+    with pytest.raises(ValueError):
+        ScoringJob(directory, {"a.pptx": decks["b.pptx"]})
+
+
+def test_job_in_worker_pool(decks, tmp_path):
+    job = ScoringJob(str(tmp_path / "job"), decks)
+    with WarmWorkerPool(processes=2) as pool:
+        summary = job.run(pool)
+        assert (summary.decks, summary.slides) == (3, 5)
+        assert job.run(pool).decks == 0
+    assert job.results("b.pptx") == expected_results(decks["b.pptx"])
+
+
+def test_job_keeps_its_config(decks, tmp_path):
+    directory = str(tmp_path / "job")
+    config = ScoringConfig(margin_threshold=(0.0, 0.1), size_thresholds=(0.9, 1.1))
+    ScoringJob(directory, {"a.pptx": decks["a.pptx"]}, config=config)
+
+    # Reopened without a config, the job resumes under its own
+    job = ScoringJob(directory)
+    assert job.config == config
+    job.run()
+    expected = PowerPointScorer(
+        Presentation(decks["a.pptx"]), isolate_errors=True, config=config
+    ).score_all()
+    assert job.results("a.pptx") == expected
+    with pytest.raises(ValueError):
+        ScoringJob(directory, config=ScoringConfig())
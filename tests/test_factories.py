@@ -0,0 +1,70 @@
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.util import Inches
+
+from aesthetic_code.extractors import factories
+from aesthetic_code.extractors.factories import (
+    ShapeExtractorDispatcher,
+    extract_many,
+    resolve_shape_type,
+    shape_extractor_factory,
+)
+
+
+def _mixed_slide():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Title"
+    slide.shapes.add_shape(1, Inches(1), Inches(1), Inches(1), Inches(1))
+    slide.shapes.add_textbox(Inches(2), Inches(1), Inches(1), Inches(1))
+    slide.shapes.add_connector(1, 0, 0, Inches(1), Inches(1))
+    slide.shapes.add_table(2, 2, Inches(3), Inches(3), Inches(2), Inches(1))
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_shape(1, 0, 0, Inches(1), Inches(1))
+    return slide
+
+
+def test_resolve_shape_type_caches_fixed_types_per_class():
+    slide = _mixed_slide()
+    for shape in slide.shapes:
+        assert resolve_shape_type(shape) == shape.shape_type
+
+    connector = next(
+        shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.LINE
+    )
+    assert factories._class_shape_types[type(connector)] == MSO_SHAPE_TYPE.LINE
+    # Auto shapes and text boxes share a class, so their type is read per shape
+    auto_shape, text_box = list(slide.shapes)[2:4]
+    assert type(auto_shape) is type(text_box)
+    assert type(auto_shape) not in factories._class_shape_types
+
+
+def test_extract_many_matches_factory():
+    slide = _mixed_slide()
+    expected = [
+        shape_extractor_factory(shape).extract_shape() for shape in slide.shapes
+    ]
+    assert extract_many(slide.shapes) == expected
+
+
+def test_dispatcher_reuses_extractors():
+    slide = _mixed_slide()
+    dispatcher = ShapeExtractorDispatcher("inches")
+    shapes = [
+        shape
+        for shape in slide.shapes
+        if shape.shape_type in (MSO_SHAPE_TYPE.AUTO_SHAPE, MSO_SHAPE_TYPE.TEXT_BOX)
+    ]
+    extractors = [dispatcher.extractor_for(shape) for shape in shapes]
+    assert extractors[0] is extractors[1]
+    assert extractors[1].extract_shape()["shape_type"] == "TEXT_BOX"
+    assert extractors[1].extract_shape()["left"] == 2.0
+
+
+def test_group_shapes_extracted_recursively():
+    slide = _mixed_slide()
+    group = next(
+        shape for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.GROUP
+    )
+    nested = shape_extractor_factory(group).extract_group_shapes()
+    assert [shape["shape_type"] for shape in nested] == ["AUTO_SHAPE"]
@@ -0,0 +1,66 @@
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.extractors.ppt_extractor import PowerPointShapeExtractor
+from aesthetic_code.scorer.slide_scorer import PowerPointScorer
+from aesthetic_code.segmenter.fingerprint import (
+    LayoutCache,
+    layout_fingerprint,
+    slide_fingerprint,
+)
+
+
+@pytest.fixture
+def presentation():
+    prs = Presentation()
+    for offset, text in [(0, "First"), (0, "Second"), (0.2, "Third"), (40, "Moved")]:
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        for left, top in [(100, 100), (300, 100), (100, 300)]:
+            shape = slide.shapes.add_shape(
+                1, Pt(left + offset), Pt(top), Pt(150), Pt(100)
+            )
+            shape.text = text
+    return prs
+
+
+def test_layout_fingerprint(presentation):
+    fingerprints = [
+        slide_fingerprint(slide, presentation.slide_width, presentation.slide_height)
+        for slide in presentation.slides
+    ]
+    # Text is ignored and sub-grid offsets are quantized away
+    assert fingerprints[0] == fingerprints[1] == fingerprints[2]
+    assert fingerprints[3] != fingerprints[0]
+
+    boxes = [(100, 100, 150, 100), (300, 100, 150, 100)]
+    assert layout_fingerprint(boxes, 720, 540) != layout_fingerprint(boxes, 960, 540)
+    assert layout_fingerprint(boxes, 720, 540) != layout_fingerprint(
+        boxes[::-1], 720, 540
+    )
+
+    slides = PowerPointShapeExtractor(presentation).extract_ppt()["slides"]
+    assert [slide["layout_fingerprint"] for slide in slides] == fingerprints
+
+
+def test_scores_reused_across_decks(presentation):
+    layout_cache = LayoutCache()
+    results = PowerPointScorer(presentation, layout_cache=layout_cache).score_all()
+    assert (layout_cache.hits, layout_cache.misses, len(layout_cache)) == (2, 2, 2)
+    assert results[0]["alignment"] == results[1]["alignment"]
+
+    PowerPointScorer(presentation, layout_cache=layout_cache).score_all()
+    assert (layout_cache.hits, layout_cache.misses) == (6, 2)
+
+    # Cached scores match scoring every slide from scratch
+    uncached = PowerPointScorer(presentation, layout_cache=LayoutCache(max_size=0))
+    assert uncached.score_all() == results
+
+
+def test_layout_cache_evicts_least_recently_used():
+    cache = LayoutCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and len(cache) == 2
@@ -1,8 +1,17 @@
+import numpy as np
 import pytest
 from pptx import Presentation
-from pptx.util import Inches
+from pptx.util import Inches, Pt
 
-from aesthetic_code.scorer.font_hierarchy_scorer import FontHierarchyScorer
+from aesthetic_code.extractors.text_styles import (
+    TextStyleCache,
+    effective_run_font_sizes,
+)
+from aesthetic_code.scorer.font_hierarchy_scorer import (
+    FontHierarchyScorer,
+    PowerPointFontHierarchyScorer,
+    score_font_sizes,
+)
 
 
 @pytest.fixture
@@ -33,3 +42,88 @@ def test_font_hierarchy_scorer(scorer, mock_slide):
     scorer._title_node = mock_slide.shapes.title
     scorer._subtitle_node = mock_slide.placeholders[1]
     assert scorer.score() == 1.0
+
+
+@pytest.fixture
+def mock_presentation():
+    prs = Presentation()
+
+    # Sizes inherited from the master: title 44pt, subtitle 32pt
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = "Inherited"
+    title_slide.placeholders[1].text = "sizes"
+
+    # Run-level sizes inverting the hierarchy
+    content_slide = prs.slides.add_slide(prs.slide_layouts[1])
+    content_slide.shapes.title.text = "Small title"
+    content_slide.shapes.title.text_frame.paragraphs[0].runs[0].font.size = Pt(12)
+    content_slide.placeholders[1].text = "Large body"
+    content_slide.placeholders[1].text_frame.paragraphs[0].runs[0].font.size = Pt(40)
+
+    # Title only, nothing to compare against
+    title_only_slide = prs.slides.add_slide(prs.slide_layouts[5])
+    title_only_slide.shapes.title.text = "Alone"
+
+    return prs
+
+
+def test_power_point_font_hierarchy_scorer(mock_presentation):
+    scorer = PowerPointFontHierarchyScorer(mock_presentation)
+
+    font_sizes = scorer.extract_font_sizes()
+    assert font_sizes.shape == (3, 3)
+    assert font_sizes[0, :2].tolist() == [44.0, 32.0]
+    assert font_sizes[1, [0, 2]].tolist() == [12.0, 40.0]
+
+    scores = scorer.score_all()
+    assert scores[:2].tolist() == [1.0, 0.0]
+    assert np.isnan(scores[2])
+
+
+def test_score_font_sizes():
+    font_sizes = np.array(
+        [
+            [40.0, 30.0, 20.0],
+            [40.0, 50.0, 20.0],
+            [40.0, np.nan, 20.0],
+            [np.nan, 30.0, 40.0],
+            [np.nan, np.nan, 20.0],
+        ]
+    )
+    scores = score_font_sizes(font_sizes)
+    assert scores[:4].tolist() == [1.0, 0.0, 1.0, 0.0]
+    assert np.isnan(scores[4])
+
+
+def test_font_hierarchy_scorer_inherited_sizes():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = "Inherited title"
+    slide.placeholders[1].text = "Inherited subtitle"
+
+    scorer = FontHierarchyScorer(text_styles=TextStyleCache())
+    scorer._title_node = slide.shapes.title
+    scorer._subtitle_node = slide.placeholders[1]
+    assert scorer.score() == 1.0
+
+
+def test_text_style_cache():
+    prs = Presentation()
+    for _ in range(10):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = "Title"
+        slide.placeholders[1].text_frame.text = "Level 0"
+        paragraph = slide.placeholders[1].text_frame.add_paragraph()
+        paragraph.text = "Level 1"
+        paragraph.level = 1
+
+    text_styles = TextStyleCache()
+    sizes = [
+        [size.pt for size in effective_run_font_sizes(shape, text_styles)]
+        for slide in prs.slides
+        for shape in slide.placeholders
+    ]
+    assert sizes[:2] == [[44.0], [32.0, 28.0]]
+    assert sizes == sizes[:2] * 10
+    # One entry per (layout, placeholder idx, level), shared by all slides
+    assert len(text_styles) == 3
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from aesthetic_code.scorer.alignment_scorer import AlignmentScorer
+from aesthetic_code.scorer.graded_scoring import (
+    PAIR_KIND_CODES,
+    alignment_scores,
+    band_scores,
+    margin_scores,
+    size_comparison_scores,
+    spacing_scores,
+)
+from aesthetic_code.scorer.size_comparison_scorer import SizeComparisonScorer
+from aesthetic_code.segmenter.segmenter import SegmentTreeNode
+
+
+def make_node(left, top, right, bottom):
+    return SegmentTreeNode(
+        bounding_box={"left": left, "top": top, "right": right, "bottom": bottom}
+    )
+
+
+def test_band_scores():
+    values = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    assert band_scores(values, 1.0, 3.0).tolist() == [0, 1, 1, 1, 0]
+    assert band_scores(values, 1.0, 3.0, inclusive=False).tolist() == [0, 0, 1, 0, 0]
+
+    graded = band_scores(values, 1.0, 3.0, tolerance=1.0)
+    assert graded[1:4].tolist() == [1.0, 1.0, 1.0]
+    assert graded[0] == pytest.approx(np.exp(-0.5))
+    assert graded[0] == graded[4]
+
+
+def test_discrete_mode_matches_scorers():
+    node1 = make_node(0, 0, 100, 100)
+    node2 = make_node(0, 150, 100, 250)
+    node3 = make_node(200, 0, 700, 50)
+
+    for first, second in [(node1, node2), (node1, node3), (node2, node3)]:
+        boxes1 = np.array([[*first.bounding_box.values()]])
+        boxes2 = np.array([[*second.bounding_box.values()]])
+        assert alignment_scores(boxes1, boxes2)[0] == (
+            AlignmentScorer(first, second).score()
+        )
+        assert size_comparison_scores(boxes1, boxes2)[0] == (
+            SizeComparisonScorer(first, second).score()
+        )
+
+
+def test_graded_mode_is_smooth():
+    node1 = make_node(0, 0, 100, 100)
+    near = make_node(1, 150, 101, 250)
+    far = make_node(30, 150, 130, 250)
+
+    assert AlignmentScorer(node1, near).score() == 0.0
+    near_score = AlignmentScorer(node1, near, mode="graded").score()
+    far_score = AlignmentScorer(node1, far, mode="graded").score()
+    assert 0.0 < far_score < near_score < 1.0
+
+    small = make_node(0, 0, 20, 20)
+    assert SizeComparisonScorer(node1, small).score() == 0.0
+    assert 0.0 < SizeComparisonScorer(node1, small, mode="graded").score() < 1.0
+
+    with pytest.raises(ValueError):
+        AlignmentScorer(node1, near, mode="fuzzy")
+
+
+def test_candidate_broadcasting():
+    # 3 candidate layouts of 2 pairs each
+    boxes1 = np.array(
+        [
+            [[0, 0, 100, 100], [0, 0, 100, 100]],
+            [[0, 0, 100, 100], [0, 0, 200, 100]],
+            [[0, 0, 100, 100], [0, 0, 100, 100]],
+        ],
+        dtype=float,
+    )
+    boxes2 = boxes1 + [[[0, 150, 0, 150], [300, 0, 300, 0]]]
+    pair_kinds = np.array([PAIR_KIND_CODES["horizontal"], PAIR_KIND_CODES["vertical"]])
+
+    scores = spacing_scores(boxes1, boxes2, pair_kinds, 800, 600, tolerance=0.05)
+    assert scores.shape == (3, 2)
+    assert scores[0].tolist() == scores[2].tolist()
+
+    margins = margin_scores(
+        np.array([[80, 60, 720, 540], [0, 0, 800, 600]]), 800, 600, tolerance=0.05
+    )
+    assert margins[0] == 1.0
+    assert 0.0 < margins[1] < 1.0
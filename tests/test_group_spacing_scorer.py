@@ -102,3 +102,30 @@ def test_segmenter(mock_pptx_presentation):
     assert (
         segment_tree.is_leaf() or segment_tree.subregions
     )  # Expected behavior is context-dependent
+
+
+def test_graded_group_spacing(mock_pptx_presentation):
+    presentation = mock_pptx_presentation
+    segment_tree = PowerPointSegmenter(presentation, "pt").segment_all()[0]
+    scorer = GroupSpacingScorer(
+        slide_height=presentation.slide_height,
+        slide_width=presentation.slide_width,
+        segment_tree=segment_tree,
+        mode="graded",
+        tolerance=0.0,
+    )
+    discrete_scorer = GroupSpacingScorer(
+        slide_height=presentation.slide_height,
+        slide_width=presentation.slide_width,
+        segment_tree=segment_tree,
+    )
+    # A zero tolerance reduces the graded scores to the discrete ones
+    assert scorer.score() == pytest.approx(discrete_scorer.score())
+
+    scorer = GroupSpacingScorer(
+        slide_height=presentation.slide_height,
+        slide_width=presentation.slide_width,
+        segment_tree=segment_tree,
+        mode="graded",
+    )
+    assert discrete_scorer.score() <= scorer.score() <= 1.0
@@ -0,0 +1,85 @@
+import json
+import subprocess
+import sys
+
+# Generous wall-clock budget for importing every module of the package in a fresh
+# interpreter; numpy is the only heavy dependency allowed at import time
+IMPORT_TIME_BUDGET = 1.0
+
+MODULES = [
+    "aesthetic_code.extractors.factories",
+    "aesthetic_code.extractors.ingest",
+    "aesthetic_code.extractors.ppt_extractor",
+    "aesthetic_code.extractors.shape_extractors",
+    "aesthetic_code.extractors.text_styles",
+    "aesthetic_code.extractors.text_metrics",
+    "aesthetic_code.scorer.alignment_scorer",
+    "aesthetic_code.scorer.candidate_scorer",
+    "aesthetic_code.scorer.font_hierarchy_scorer",
+    "aesthetic_code.scorer.graded_scoring",
+    "aesthetic_code.scorer.group_spacing_scorer",
+    "aesthetic_code.scorer.size_comparison_scorer",
+    "aesthetic_code.scorer.config",
+    "aesthetic_code.scorer.preference_model",
+    "aesthetic_code.scorer.alignment_index",
+    "aesthetic_code.scorer.report",
+    "aesthetic_code.service.checkpoint",
+    "aesthetic_code.render.thumbnail",
+    "aesthetic_code.render.embedding",
+    "aesthetic_code.storage.embedding_cache",
+    "aesthetic_code.scorer.slide_scorer",
+    "aesthetic_code.scorer.white_space_scorer",
+    "aesthetic_code.scorer.free_space",
+    "aesthetic_code.scorer.text_density_scorer",
+    "aesthetic_code.segmenter.fingerprint",
+    "aesthetic_code.segmenter.segmenter",
+    "aesthetic_code.segmenter.tree_similarity",
+    "aesthetic_code.service.scoring_service",
+    "aesthetic_code.service.worker_pool",
+    "aesthetic_code.storage.score_index",
+    "aesthetic_code.storage.shape_store",
+]
+
+
+def _import_in_fresh_interpreter(modules: list[str]) -> dict:
+    script = (
+        "import importlib, json, sys, time\n"
+        "import numpy\n"
+        "start = time.perf_counter()\n"
+        f"for module in {modules!r}:\n"
+        "    importlib.import_module(module)\n"
+        "print(json.dumps({\n"
+        "    'seconds': time.perf_counter() - start,\n"
+        "    'pptx': sorted(m for m in sys.modules if m.split('.')[0] == 'pptx'),\n"
+        "}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={"PYTHONPATH": ":".join(sys.path)},
+    ).stdout
+    return json.loads(output)
+
+
+def test_package_import_does_not_load_pptx():
+    result = _import_in_fresh_interpreter(MODULES)
+    assert result["pptx"] == []
+    assert result["seconds"] < IMPORT_TIME_BUDGET
+
+
+def test_pptx_loaded_on_first_use():
+    from pptx import Presentation
+
+    from aesthetic_code.extractors.factories import (
+        SHAPE_EXTRACTOR_MAP,
+        shape_extractor_factory,
+    )
+    from aesthetic_code.extractors.shape_extractors import BaseAutoShapeExtractor
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shape = slide.shapes.add_textbox(0, 0, 100, 100)
+    assert isinstance(shape_extractor_factory(shape), BaseAutoShapeExtractor)
+    assert SHAPE_EXTRACTOR_MAP[shape.shape_type] is BaseAutoShapeExtractor
@@ -0,0 +1,86 @@
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import PIL.Image
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.extractors.factories import shape_extractor_factory
+from aesthetic_code.extractors.ingest import (
+    MemoryViewReader,
+    SharedDeck,
+    media_hashes,
+    open_presentation,
+)
+
+
+@pytest.fixture(scope="module")
+def deck() -> bytes:
+    prs = Presentation()
+    for i in range(3):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_shape(1, Pt(100 + 50 * i), Pt(100), Pt(150), Pt(100))
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def slide_lefts(source) -> list[float]:
+    return [slide.shapes[0].left.pt for slide in open_presentation(source).slides]
+
+
+def test_memory_view_reader():
+    with MemoryViewReader(bytearray(b"0123456789")) as reader:
+        assert reader.read(3) == b"012"
+        assert reader.seek(-2, io.SEEK_END) == 8
+        assert reader.read() == b"89"
+        assert reader.read(1) == b""
+        reader.seek(4)
+        assert reader.tell() == 4
+        with pytest.raises(ValueError):
+            reader.seek(-1)
+
+
+def test_open_presentation_in_place(deck, tmp_path):
+    path = tmp_path / "deck.pptx"
+    path.write_bytes(deck)
+    expected = [100.0, 150.0, 200.0]
+    assert slide_lefts(deck) == expected
+    assert slide_lefts(memoryview(deck)) == expected
+    assert slide_lefts(str(path)) == expected
+
+
+def test_shared_deck_across_processes(deck):
+    with SharedDeck(deck) as shared_deck:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(slide_lefts, [shared_deck.handle] * 2))
+        assert results == [[100.0, 150.0, 200.0]] * 2
+        # The parent can still read it after the workers detached
+        assert slide_lefts(shared_deck.handle) == [100.0, 150.0, 200.0]
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=shared_deck.handle.name)
+
+
+def test_skip_media():
+    image = io.BytesIO()
+    PIL.Image.new("RGB", (64, 48), "red").save(image, "PNG")
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_picture(io.BytesIO(image.getvalue()), Pt(10), Pt(20))
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    deck = buffer.getvalue()
+
+    picture = open_presentation(deck, skip_media=True).slides[0].shapes[0]
+    assert picture.part.related_part(picture._element.blip_rId).blob == b""
+    shape_data = shape_extractor_factory(picture).extract_shape()
+    assert shape_data["media_partname"] == "/ppt/media/image1.png"
+    assert (shape_data["left"], shape_data["top"]) == (10.0, 20.0)
+
+    assert media_hashes(deck, chunk_size=16) == {
+        "/ppt/media/image1.png": hashlib.sha256(image.getvalue()).hexdigest()
+    }
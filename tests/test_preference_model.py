@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from aesthetic_code.scorer.preference_model import (
+    FEATURE_NAMES,
+    PreferenceModel,
+    slide_features,
+)
+from aesthetic_code.storage.score_index import ScoreIndex
+
+
+def make_results(n_slides: int) -> list[dict]:
+    return [
+        {
+            "slide_index": i,
+            "shape_count": i,
+            "group_spacing": i / n_slides,
+            "alignment": 1.0,
+            "size_comparison": 0.5,
+            "white_space": None if i == 0 else 0.25,
+            "font_hierarchy": None,
+        }
+        for i in range(n_slides)
+    ]
+
+
+def test_slide_features():
+    features = slide_features(make_results(3))
+    assert features.shape == (3, len(FEATURE_NAMES))
+    row = dict(zip(FEATURE_NAMES, features[0]))
+    assert row["white_space"] == 0.0 and row["white_space_missing"] == 1.0
+    assert row["font_hierarchy_missing"] == 1.0
+    assert features[2, FEATURE_NAMES.index("log_shape_count")] == pytest.approx(
+        np.log(3)
+    )
+
+
+def test_batched_inference(tmp_path):
+    weights = np.zeros(len(FEATURE_NAMES) + 2)
+    weights[FEATURE_NAMES.index("group_spacing")] = 4.0
+    weights[-1] = 1.0
+    model = PreferenceModel(weights, bias=-2.0, embedding_dim=2)
+
+    features = slide_features(make_results(10))
+    embeddings = np.zeros((10, 2))
+    embeddings[1] = np.nan
+    embeddings[2, 1] = 3.0
+    scores = model.predict(features, embeddings, batch_size=3)
+    logits = 4.0 * np.arange(10) / 10 - 2.0
+    logits[2] += 3.0
+    np.testing.assert_allclose(scores, 1 / (1 + np.exp(-logits)))
+    with pytest.raises(ValueError):
+        model.predict(features, np.zeros((10, 3)))
+
+    model.save(str(tmp_path / "model.npz"))
+    loaded = PreferenceModel.load(str(tmp_path / "model.npz"))
+    np.testing.assert_allclose(loaded.predict(features, embeddings), scores)
+
+    with ScoreIndex(str(tmp_path / "scores.sqlite")) as index:
+        index.add_deck("a.pptx", make_results(10))
+        scored = list(
+            model.score_index(
+                index,
+                embed=lambda rows: embeddings[[row["slide_index"] for row in rows]],
+                batch_size=4,
+            )
+        )
+    assert [score for _, _, score in scored] == pytest.approx(scores)
+
+
+def test_fit():
+    pytest.importorskip("sklearn")
+    rng = np.random.default_rng(0)
+    features = rng.uniform(size=(200, len(FEATURE_NAMES)))
+    alignment = FEATURE_NAMES.index("alignment")
+    labels = (features[:, alignment] > 0.5).astype(int)
+    model = PreferenceModel.fit(features, labels)
+    assert ((model.predict(features) > 0.5) == labels).mean() > 0.9
+
+    preferred, rejected = features[:100], features[100:]
+    swap = preferred[:, alignment] < rejected[:, alignment]
+    preferred[swap], rejected[swap] = rejected[swap], preferred[swap].copy()
+    model = PreferenceModel.fit_pairs(preferred, rejected)
+    assert (model.predict(preferred) > model.predict(rejected)).mean() > 0.9
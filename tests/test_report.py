@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.scorer.report import SlideReportBuilder
+from aesthetic_code.scorer.slide_scorer import SLIDE_SCORES, PowerPointScorer
+
+
+@pytest.fixture
+def presentation():
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Pt(800), Pt(600)
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = "Title"
+    title_slide.placeholders[1].text = "Subtitle"
+
+    shapes_slide = prs.slides.add_slide(prs.slide_layouts[6])
+    for name, (left, top, width) in {
+        "left": (100, 100, 150),
+        "right": (450, 100, 250),
+        "bottom": (100, 300, 20),
+    }.items():
+        shape = shapes_slide.shapes.add_shape(1, Pt(left), Pt(top), Pt(width), Pt(100))
+        shape.name = name
+
+    prs.slides.add_slide(prs.slide_layouts[6])  # Empty slide
+    return prs
+
+
+def test_report_matches_slide_scores(presentation):
+    reports = SlideReportBuilder(presentation).report_all()
+    results = PowerPointScorer(presentation).score_all()
+    for report, result in zip(reports, results):
+        for name in SLIDE_SCORES:
+            assert report.scores[name] == pytest.approx(result[name])
+
+    title_report, shapes_report, empty_report = reports
+    assert title_report.font_sizes == {"title": 44.0, "subtitle": 32.0, "body": None}
+    assert empty_report.pairs == [] and empty_report.margins is None
+
+    assert shapes_report.margins == pytest.approx(
+        {"left": 100.0, "top": 100.0, "right": 100.0, "bottom": 200.0}
+    )
+    assert len(shapes_report.pairs) == 6
+    json.dumps(shapes_report.to_dict())
+
+
+def test_worst_pairs(presentation):
+    report = SlideReportBuilder(presentation).report(1)
+    worst = report.worst_pairs("size_comparison", count=1)[0]
+    # The narrow shape is the only one far outside the size ratio thresholds
+    assert worst.size_comparison < 1.0
+    assert "bottom" in worst.shapes1 + worst.shapes2
+    with pytest.raises(ValueError):
+        report.worst_pairs("white_space")
+
+
+def test_report_snaps_near_aligned_shapes():
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Pt(800), Pt(600)
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    # Tops and bottoms 1pt apart, inside the 3pt alignment snap of the slide
+    for name, top in {"left": 100, "right": 101}.items():
+        shape = slide.shapes.add_shape(
+            1, Pt(100 + 300 * (name == "right")), Pt(top), Pt(200), Pt(100)
+        )
+        shape.name = name
+
+    report = SlideReportBuilder(prs).report(0)
+    result = PowerPointScorer(prs).score_all()[0]
+    assert report.scores["alignment"] == pytest.approx(result["alignment"])
+    pair = next(
+        pair
+        for pair in report.pairs
+        if {"left", "right"} <= set(pair.shapes1 + pair.shapes2)
+    )
+    assert pair.alignment == 1.0
@@ -0,0 +1,65 @@
+import pytest
+
+from aesthetic_code.storage.score_index import ScoreIndex
+
+
+def make_results(n_slides: int, offset: float) -> list[dict]:
+    return [
+        {
+            "slide_index": i,
+            "slide_id": 256 + i,
+            "shape_count": i * 10,
+            "layout_fingerprint": f"layout-{i % 2}",
+            "group_spacing": (i + offset) / 10,
+            "alignment": 1.0,
+            "size_comparison": 0.5,
+            "white_space": 0.25,
+            "font_hierarchy": None if i else 1.0,
+        }
+        for i in range(n_slides)
+    ]
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ScoreIndex(str(tmp_path / "scores.sqlite")) as index:
+        index.add_deck("a.pptx", make_results(5, 0.5))
+        index.add_deck("b.pptx", make_results(4, 0.0))
+        yield index
+
+
+def test_score_index_queries(index):
+    assert len(index) == 9
+    assert index.decks() == ["a.pptx", "b.pptx"]
+
+    lowest = index.lowest("group_spacing", 3, shape_count=(21, None))
+    assert [(row["deck"], row["slide_index"]) for row in lowest] == [
+        ("b.pptx", 3),
+        ("a.pptx", 3),
+        ("a.pptx", 4),
+    ]
+    assert lowest[0]["group_spacing"] == pytest.approx(0.3)
+
+    highest = index.query(order_by="group_spacing", descending=True, limit=1)
+    assert (highest[0]["deck"], highest[0]["slide_index"]) == ("a.pptx", 4)
+
+    # Slides where a score does not apply are left out of its ranking
+    assert len(index.lowest("font_hierarchy", 10)) == 2
+    assert len(index.query(deck="b.pptx", layout_fingerprint="layout-1")) == 2
+
+    with pytest.raises(ValueError):
+        index.query(order_by="shape_count; DROP TABLE slides")
+    with pytest.raises(ValueError):
+        index.lowest("shape_count", 1)
+
+
+def test_score_index_persists_and_replaces(index, tmp_path):
+    index.add_deck("b.pptx", make_results(1, 5.0))
+    index.close()
+
+    with ScoreIndex(str(tmp_path / "scores.sqlite")) as reopened:
+        # The replaced deck's slides 1-3 are gone, not left stale
+        assert len(reopened) == 6
+        rows = reopened.query(deck="b.pptx")
+        assert [row["slide_index"] for row in rows] == [0]
+        assert rows[0]["group_spacing"] == pytest.approx(0.5)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from aesthetic_code.scorer.config import (
+    ScoringConfig,
+    resolve_plan,
+    score_margins,
+    score_pairs,
+    sweep_margin_scores,
+    sweep_pair_scores,
+)
+from aesthetic_code.scorer.graded_scoring import (
+    alignment_scores,
+    margin_scores,
+    size_comparison_scores,
+    spacing_scores,
+)
+
+SLIDE_WIDTH, SLIDE_HEIGHT = 800.0, 600.0
+
+
+@pytest.fixture
+def pairs():
+    rng = np.random.default_rng(0)
+    corners = rng.uniform(0, 700, size=(2, 50, 2))
+    sizes = rng.uniform(10, 200, size=(2, 50, 2))
+    boxes1, boxes2 = np.concatenate([corners, corners + sizes], axis=-1)
+    pair_kinds = rng.integers(0, 3, size=50)
+    return boxes1, boxes2, pair_kinds
+
+
+def test_plan_is_resolved_once():
+    config = ScoringConfig(spacing_threshold=(0.05, 0.2))
+    plan = config.plan(SLIDE_WIDTH, SLIDE_HEIGHT)
+    assert plan is resolve_plan(config, SLIDE_WIDTH, SLIDE_HEIGHT)
+    assert plan.horizontal_spacing == pytest.approx((40.0, 160.0))
+    assert plan.vertical_margin == pytest.approx((60.0, 180.0))
+    assert plan.alignment_snap == pytest.approx(3.0)
+
+    graded = ScoringConfig.from_mode("graded", {"alignment": 0.2})
+    assert (graded.alignment_tolerance, graded.spacing_tolerance) == (0.2, 0.05)
+    snapped = ScoringConfig.from_mode(spacing_threshold=[0.05, 0.2], alignment_snap=0)
+    assert snapped.spacing_threshold == (0.05, 0.2) and snapped.alignment_snap == 0
+    with pytest.raises(ValueError):
+        ScoringConfig.from_mode("fuzzy")
+
+
+def test_plan_matches_scoring_functions(pairs):
+    boxes1, boxes2, pair_kinds = pairs
+    config = ScoringConfig.from_mode("graded")
+    scores = score_pairs(config.plan(SLIDE_WIDTH, SLIDE_HEIGHT), *pairs)
+    np.testing.assert_allclose(
+        scores["group_spacing"],
+        spacing_scores(
+            boxes1, boxes2, pair_kinds, SLIDE_WIDTH, SLIDE_HEIGHT, (0.1, 0.3), 0.05
+        ),
+    )
+    np.testing.assert_allclose(
+        scores["alignment"], alignment_scores(boxes1, boxes2, 0.05)
+    )
+    np.testing.assert_allclose(
+        scores["size_comparison"],
+        size_comparison_scores(boxes1, boxes2, (0.25, 4), 0.1),
+    )
+
+
+def test_threshold_sweep(pairs):
+    boxes1, boxes2, pair_kinds = pairs
+    configs = [
+        ScoringConfig(
+            spacing_threshold=(low, low + 0.2),
+            margin_threshold=(low, 0.3),
+            spacing_tolerance=tolerance,
+        )
+        for low in (0.0, 0.05, 0.1)
+        for tolerance in (0.0, 0.05)
+    ]
+    swept = sweep_pair_scores(configs, *pairs, SLIDE_WIDTH, SLIDE_HEIGHT)
+    assert swept["group_spacing"].shape == (len(configs), len(pair_kinds))
+
+    bounding_boxes = np.concatenate([boxes1.min(axis=0), boxes1.max(axis=0)])[
+        [0, 1, 4, 5]
+    ].reshape(1, 4)
+    swept_margins = sweep_margin_scores(
+        configs, bounding_boxes, SLIDE_WIDTH, SLIDE_HEIGHT
+    )
+    assert swept_margins.shape == (len(configs), 1)
+
+    for config, spacing, margin in zip(configs, swept["group_spacing"], swept_margins):
+        plan = config.plan(SLIDE_WIDTH, SLIDE_HEIGHT)
+        np.testing.assert_allclose(spacing, score_pairs(plan, *pairs)["group_spacing"])
+        np.testing.assert_allclose(
+            margin,
+            margin_scores(
+                bounding_boxes, SLIDE_WIDTH, SLIDE_HEIGHT, config.margin_threshold
+            ),
+        )
+        np.testing.assert_allclose(margin, score_margins(plan, bounding_boxes))
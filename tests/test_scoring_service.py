@@ -0,0 +1,109 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from aesthetic_code.extractors.ingest import SharedDeck
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.service import scoring_service
+from aesthetic_code.service.scoring_service import (
+    ScoringService,
+    count_slides,
+    deck_scorer,
+    request_scores,
+    score_slides,
+)
+
+
+@pytest.fixture(scope="module")
+def deck(deck_factory) -> bytes:
+    return deck_factory(n_slides=6, shift=10)
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+async def serve_and_request(service: ScoringService, deck: bytes, path="/score"):
+    server = await service.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await request_scores("127.0.0.1", port, deck, path)
+
+
+def test_scoring_service_streams_all_slides(deck, executor):
+    service = ScoringService(executor=executor, chunk_size=2)
+    status, results = asyncio.run(serve_and_request(service, deck))
+    assert status == 200
+    assert sorted(result["slide_index"] for result in results) == list(range(6))
+    assert all(result["shape_count"] == 3 for result in results)
+
+
+def test_scoring_service_concurrent_requests(deck, executor):
+    async def run():
+        service = ScoringService(
+            executor=executor, max_concurrent_decks=1, max_queued_decks=1
+        )
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(
+                *[request_scores("127.0.0.1", port, deck) for _ in range(3)]
+            )
+
+    statuses = sorted(status for status, _ in asyncio.run(run()))
+    # One deck is scored, one waits for its slot and one is turned away
+    assert statuses == [200, 200, 503]
+
+
+def test_scoring_service_errors(deck, executor):
+    service = ScoringService(executor=executor, request_timeout=0.0)
+    assert asyncio.run(serve_and_request(service, deck))[0] == 504
+
+    service = ScoringService(executor=executor)
+    assert asyncio.run(serve_and_request(service, b"not a deck"))[0] == 422
+    assert asyncio.run(serve_and_request(service, deck, "/other"))[0] == 404
+
+    service = ScoringService(executor=executor, max_body_size=10)
+    assert asyncio.run(serve_and_request(service, deck))[0] == 413
+
+
+def test_timed_out_deck_holds_its_slot_until_its_tasks_finish(deck):
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            future = super().submit(*args, **kwargs)
+            futures.append(future)
+            return future
+
+    async def run(service):
+        with pytest.raises(TimeoutError):
+            async for _ in service.score_deck(deck):
+                pass
+
+    futures: list = []
+    with RecordingExecutor(max_workers=1) as executor:
+        service = ScoringService(
+            executor=executor, request_timeout=0.0, share_decks=False
+        )
+        asyncio.run(run(service))
+        assert futures and all(future.done() for future in futures)
+
+
+def test_shared_deck_is_parsed_once_per_worker(deck):
+    with SharedDeck(deck) as shared_deck:
+        handle = shared_deck.handle
+        assert count_slides(handle) == 6
+        scorer = deck_scorer(handle)
+        assert deck_scorer(handle) is scorer
+        results = score_slides(handle, [0, 1])
+        assert [result["slide_index"] for result in results] == [0, 1]
+        assert deck_scorer(handle) is scorer
+        config = ScoringConfig(margin_threshold=(0.0, 0.1))
+        assert deck_scorer(handle, config) is not scorer
+        assert deck_scorer(handle, config).config == config
+        assert score_slides(handle, [0], config) != results[:1]
+    # Decks sent as bytes have no identity to cache them under
+    assert deck_scorer(deck) is not deck_scorer(deck)
+    assert len(scoring_service._open_decks) <= scoring_service.MAX_OPEN_DECKS
@@ -4,7 +4,13 @@ import pytest
 from pptx.presentation import Presentation
 from pptx.util import Pt
 
-from aesthetic_code.segmenter.segmenter import PowerPointSegmenter, SegmentTreeNode
+from aesthetic_code.segmenter.segmenter import (
+    PairKind,
+    PowerPointSegmenter,
+    SegmentTreeNode,
+    get_all_neighbor_pairs,
+    iter_neighbor_pairs,
+)
 
 
 # Mock the unit_conversion function to simply return the Pt in points
@@ -94,3 +100,43 @@ def test_segmenter(mock_pptx_presentation):
     assert (
         segment_tree.is_leaf() or segment_tree.subregions
     )  # Expected behavior is context-dependent
+
+
+def node(direction="leaf", subregions=(), box=(0, 0, 1, 1)):
+    left, top, right, bottom = box
+    return SegmentTreeNode(
+        direction=direction,
+        subregions=list(subregions),
+        bounding_box={"left": left, "top": top, "right": right, "bottom": bottom},
+    )
+
+
+def test_iter_neighbor_pairs():
+    a, b, c, d = node(), node(), node(), node()
+    inner = node("horizontal", [c, d])
+    root = node("vertical", [a, b, inner])
+
+    pairs = list(iter_neighbor_pairs(root))
+    assert [(pair.kind, pair.first_index, pair.second_index) for pair in pairs] == [
+        (PairKind.BELONGS_TO, 1, 0),
+        (PairKind.BELONGS_TO, 2, 0),
+        (PairKind.BELONGS_TO, 3, 0),
+        (PairKind.BELONGS_TO, 4, 3),
+        (PairKind.BELONGS_TO, 5, 3),
+        (PairKind.HORIZONTAL, 4, 5),
+        (PairKind.VERTICAL, 1, 2),
+        (PairKind.VERTICAL, 2, 3),
+    ]
+    assert pairs[-1].first is b and pairs[-1].second is inner
+    assert get_all_neighbor_pairs(root)[5] == ("horizontal", c, d)
+    assert list(iter_neighbor_pairs(a)) == []
+
+
+def test_iter_neighbor_pairs_on_deep_trees():
+    # Deeper than the recursion limit
+    tree = node()
+    for _ in range(5000):
+        tree = node("horizontal", [tree, node()])
+    pairs = iter_neighbor_pairs(tree)
+    assert next(pairs).kind == PairKind.BELONGS_TO
+    assert sum(1 for _ in pairs) + 1 == 3 * 5000
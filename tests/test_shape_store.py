@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.extractors.ppt_extractor import PowerPointShapeExtractor
+from aesthetic_code.storage.shape_store import ShapeStore, ShapeStoreWriter
+
+
+def make_deck(n_slides: int) -> dict:
+    prs = Presentation()
+    for i in range(n_slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])  # Title only
+        slide.shapes.title.text = f"Slide {i} – ünïcode"
+        for j in range(i):
+            slide.shapes.add_shape(1, Pt(10 * j), Pt(20), Pt(30), Pt(40))
+    return PowerPointShapeExtractor(prs).extract_ppt()
+
+
+def test_shape_store_round_trip(tmp_path):
+    decks = {"a.pptx": make_deck(3), "empty.pptx": make_deck(0), "b.pptx": make_deck(2)}
+    with ShapeStoreWriter(str(tmp_path)) as writer:
+        for name, deck in decks.items():
+            writer.add_deck(name, deck)
+
+    store = ShapeStore(str(tmp_path))
+    assert store.deck_names == list(decks)
+    assert len(store) == (1 + 2 + 3) + (1 + 2)
+    assert store.slide_count == 5
+    assert isinstance(store.column("left"), np.memmap)
+
+    for deck_index, deck in enumerate(decks.values()):
+        assert store.slide_size(deck_index) == (
+            deck["slide_width"],
+            deck["slide_height"],
+        )
+        for slide_index, slide in enumerate(deck["slides"]):
+            rows = store.slide_rows(deck_index, slide_index)
+            shapes = slide["shapes"]
+            assert store.names(rows) == [shape["name"] for shape in shapes]
+            assert store.texts(rows) == [shape.get("text", "") for shape in shapes]
+            assert store.column("shape_id")[rows].tolist() == [
+                shape["shape_id"] for shape in shapes
+            ]
+            assert [
+                store.shape_types[code] for code in store.column("shape_type")[rows]
+            ] == [shape["shape_type"] for shape in shapes]
+            assert store.geometry(rows).tolist() == [
+                [shape["left"], shape["top"], shape["width"], shape["height"]]
+                for shape in shapes
+            ]
+
+    assert store.deck_rows(1) == slice(6, 6)
+    assert store.deck_rows(2) == slice(6, 9)
+    with pytest.raises(IndexError):
+        store.slide_rows(1, 0)
+
+
+def test_shape_store_rejects_mixed_units(tmp_path):
+    deck = make_deck(2)
+    with ShapeStoreWriter(str(tmp_path), measurement_unit="cm") as writer:
+        with pytest.raises(ValueError):
+            writer.add_deck("a.pptx", deck)
+    with pytest.raises(FileExistsError):
+        ShapeStoreWriter(str(tmp_path))
+
+
+def test_rejected_deck_leaves_store_unchanged(tmp_path):
+    good, other = make_deck(2), make_deck(3)
+    bad = make_deck(3)
+    bad["slides"][2]["shapes"][1].update(shape_type="NEW_TYPE", measurement_unit="cm")
+
+    with ShapeStoreWriter(str(tmp_path / "expected")) as writer:
+        writer.add_deck("good.pptx", good)
+        writer.add_deck("other.pptx", other)
+    with ShapeStoreWriter(str(tmp_path / "actual")) as writer:
+        writer.add_deck("good.pptx", good)
+        with pytest.raises(ValueError):
+            writer.add_deck("bad.pptx", bad)
+        assert writer.add_deck("other.pptx", other) == 1
+
+    for file in (tmp_path / "expected").iterdir():
+        assert (tmp_path / "actual" / file.name).read_bytes() == file.read_bytes()
+    store = ShapeStore(str(tmp_path / "actual"))
+    assert store.deck_names == ["good.pptx", "other.pptx"]
+    assert "NEW_TYPE" not in store.shape_types
@@ -1,11 +1,17 @@
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from pptx import Presentation
 from pptx.util import Pt
 
-from aesthetic_code.scorer.size_comparison_scorer import SizeComparisonScorer
+from aesthetic_code.scorer.size_comparison_scorer import (
+    SizeComparisonScorer,
+    SlideSizeComparisonScorer,
+)
 from aesthetic_code.segmenter.segmenter import (
+    BoxSegmenter,
+    LayoutBox,
     PowerPointSegmenter,
     SegmentTreeNode,
     get_all_neighbor_pairs,
@@ -104,3 +110,46 @@ def test_segmenter(mock_pptx_presentation):
     assert (
         segment_tree.is_leaf() or segment_tree.subregions
     )  # Expected behavior is context-dependent
+
+
+def test_zero_size_nodes():
+    line = SegmentTreeNode(
+        bounding_box={"left": 0.0, "top": 50.0, "right": 200.0, "bottom": 50.0}
+    )
+    rule = SegmentTreeNode(
+        bounding_box={"left": 0.0, "top": 80.0, "right": 100.0, "bottom": 80.0}
+    )
+    box = SegmentTreeNode(
+        bounding_box={"left": 0.0, "top": 100.0, "right": 100.0, "bottom": 200.0}
+    )
+    # Same width ratio band, zero heights compare as equal
+    assert SizeComparisonScorer(line, rule).score() == 1.0
+    assert SizeComparisonScorer(line, box).score() == 0.5
+    assert SizeComparisonScorer(box, line).score() == 0.5
+    assert 0.0 <= SizeComparisonScorer(line, box, mode="graded").score() <= 0.5
+
+
+def test_slide_size_comparison_scorer():
+    rng = np.random.default_rng(5)
+    for _ in range(20):
+        corners = rng.integers(0, 8, size=(6, 2)) * 100
+        # Some shapes are horizontal or vertical lines
+        sizes = rng.integers(0, 4, size=(6, 2)) * 50
+        boxes = [
+            LayoutBox(left, top, width, height)
+            for (left, top), (width, height) in zip(corners.tolist(), sizes.tolist())
+        ]
+        tree = BoxSegmenter(boxes, 1000, 1000).segment()
+        pairs = get_all_neighbor_pairs(tree)
+        scorer = SlideSizeComparisonScorer(tree)
+        if not pairs:
+            assert np.isnan(scorer.score())
+            continue
+        expected = [SizeComparisonScorer(pair[1], pair[2]).score() for pair in pairs]
+        np.testing.assert_array_equal(scorer.pair_scores(), expected)
+        assert scorer.score() == pytest.approx(np.mean(expected))
+        siblings = [
+            score for pair, score in zip(pairs, expected) if pair[0] == "horizontal"
+        ]
+        if siblings:
+            assert scorer.score("horizontal") == pytest.approx(np.mean(siblings))
@@ -0,0 +1,77 @@
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.slide_scorer import SLIDE_SCORES, PowerPointScorer
+from aesthetic_code.segmenter.fingerprint import LayoutCache
+
+
+@pytest.fixture
+def presentation():
+    prs = Presentation()
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = "Title"
+    title_slide.placeholders[1].text = "Subtitle"
+
+    shapes_slide = prs.slides.add_slide(prs.slide_layouts[6])
+    for left, top in [(100, 100), (300, 100), (100, 300)]:
+        shapes_slide.shapes.add_shape(1, Pt(left), Pt(top), Pt(150), Pt(100))
+
+    prs.slides.add_slide(prs.slide_layouts[6])  # Empty slide
+    return prs
+
+
+def test_power_point_scorer(presentation):
+    results = PowerPointScorer(presentation).score_all()
+    assert [result["slide_index"] for result in results] == [0, 1, 2]
+    assert [result["shape_count"] for result in results] == [2, 3, 0]
+
+    title_result, shapes_result, empty_result = results
+    assert title_result["font_hierarchy"] == 1.0
+    assert shapes_result["font_hierarchy"] is None
+    for name in SLIDE_SCORES[:4]:
+        assert 0.0 <= shapes_result[name] <= 1.0
+    assert all(empty_result[name] is None for name in SLIDE_SCORES)
+
+
+def test_alignment_snaps_near_aligned_edges():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_shape(1, Pt(100), Pt(100), Pt(150), Pt(100))
+    slide.shapes.add_shape(1, Pt(300), Pt(101), Pt(150), Pt(100))
+
+    layout_cache = LayoutCache()
+    snapped = PowerPointScorer(prs, layout_cache=layout_cache).score_slide(0)
+    assert snapped["alignment"] == 1.0
+    exact_config = ScoringConfig(alignment_snap=0.0)
+    exact = PowerPointScorer(prs, layout_cache=layout_cache, config=exact_config)
+    assert exact.score_slide(0)["alignment"] == 0.0
+    assert len(layout_cache) == 2
+
+
+def test_config_reaches_every_geometric_scorer(presentation):
+    default = PowerPointScorer(presentation).score_slide(1)
+    assert PowerPointScorer(presentation, config=ScoringConfig()).score_slide(1) == (
+        default
+    )
+
+    thresholds = ScoringConfig(
+        spacing_threshold=(0.0, 0.05),
+        margin_threshold=(0.0, 0.1),
+        size_thresholds=(0.9, 1.1),
+    )
+    # A separate layout cache entry, not the default config's scores
+    layout_cache = LayoutCache()
+    PowerPointScorer(presentation, layout_cache=layout_cache).score_all()
+    changed = PowerPointScorer(
+        presentation, layout_cache=layout_cache, config=thresholds
+    ).score_slide(1)
+    for name in ("group_spacing", "size_comparison", "white_space"):
+        assert changed[name] != default[name], name
+
+    graded = PowerPointScorer(
+        presentation, config=ScoringConfig.from_mode("graded")
+    ).score_slide(1)
+    for name in ("group_spacing", "white_space"):
+        assert graded[name] != default[name], name
@@ -0,0 +1,105 @@
+import math
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from aesthetic_code.extractors.factories import shape_extractor_factory
+from aesthetic_code.extractors.text_metrics import text_metrics
+from aesthetic_code.extractors.text_styles import (
+    TextStyleCache,
+    effective_run_font_sizes,
+)
+from aesthetic_code.scorer.text_density_scorer import TextDensityScorer
+
+
+def _text_box(slide, text, size=Pt(20), width=Inches(4), height=Inches(1)):
+    text_box = slide.shapes.add_textbox(Inches(1), Inches(1), width, height)
+    text_frame = text_box.text_frame
+    text_frame.text = text
+    text_frame.paragraphs[0].runs[0].font.size = size
+    return text_box
+
+
+@pytest.fixture
+def blank_slide():
+    prs = Presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+
+def test_text_metrics_counts(blank_slide):
+    text_box = _text_box(blank_slide, "First line")
+    paragraph = text_box.text_frame.add_paragraph()
+    paragraph.add_run().text = "Second "
+    paragraph.add_run().text = "  "
+    paragraph.runs[0].font.size = Pt(12)
+    paragraph.runs[1].font.size = Pt(12)
+
+    metrics = text_metrics(text_box)
+    assert metrics.paragraph_count == 2
+    assert metrics.run_count == 3
+    assert metrics.character_count == len("First line") + len("Second ") + 2
+    # Whitespace-only runs have no font size, as in effective_run_font_sizes
+    assert [size.pt for size in metrics.run_font_sizes] == [20.0, 12.0]
+    assert metrics.line_count == 2
+    assert 0.0 < metrics.fill_ratio < 1.0
+
+
+def test_text_metrics_match_effective_run_font_sizes():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Title"
+    body = slide.placeholders[1].text_frame
+    body.text = "Inherited from the master"
+    paragraph = body.add_paragraph()
+    paragraph.text = "Second level"
+    paragraph.level = 1
+    paragraph.add_run().text = " explicit"
+    paragraph.runs[1].font.size = Pt(40)
+
+    text_styles = TextStyleCache()
+    for shape in slide.shapes:
+        assert list(text_metrics(shape, text_styles).run_font_sizes) == (
+            effective_run_font_sizes(shape, text_styles)
+        )
+
+
+def test_text_metrics_fill_ratio_grows_with_text(blank_slide):
+    short = text_metrics(_text_box(blank_slide, "Short"))
+    long = text_metrics(_text_box(blank_slide, "A much longer sentence. " * 20))
+    assert long.line_count > short.line_count == 1
+    assert long.fill_ratio > 1.0 > short.fill_ratio
+
+
+def test_text_metrics_without_text_frame(blank_slide):
+    shape = blank_slide.shapes.add_connector(
+        1, Inches(0), Inches(0), Inches(1), Inches(1)
+    )
+    assert text_metrics(shape) is None
+    empty = blank_slide.shapes.add_textbox(Inches(0), Inches(0), Inches(1), Inches(1))
+    assert text_metrics(empty).fill_ratio == 0.0
+
+
+def test_extract_text_metrics(blank_slide):
+    text_box = _text_box(blank_slide, "Hello")
+    metrics = shape_extractor_factory(text_box, "pt").extract_text_metrics()
+    assert metrics["run_font_sizes"] == [20.0]
+    assert metrics["character_count"] == 5
+
+
+def test_text_density_scorer(blank_slide):
+    _text_box(blank_slide, "Fits nicely in its box", height=Inches(0.5))
+    _text_box(blank_slide, "Overflowing text. " * 40)
+    blank_slide.shapes.add_textbox(Inches(0), Inches(0), Inches(1), Inches(1))
+
+    scorer = TextDensityScorer(blank_slide)
+    assert len(scorer.shape_metrics()) == 2
+    assert scorer.shape_scores().tolist() == [1.0, 0.0]
+    assert scorer.score() == 0.5
+
+    graded = TextDensityScorer(blank_slide, mode="graded").shape_scores()
+    assert graded[0] == 1.0 and 0.0 <= graded[1] < 1.0
+
+
+def test_text_density_scorer_without_text(blank_slide):
+    assert math.isnan(TextDensityScorer(blank_slide).score())
@@ -0,0 +1,133 @@
+import io
+
+import numpy as np
+import PIL.Image
+import pytest
+from pptx import Presentation
+from pptx.util import Pt
+
+from aesthetic_code.extractors.ingest import media_hashes, open_presentation
+from aesthetic_code.render import thumbnail as thumbnail_module
+from aesthetic_code.render.embedding import ThumbnailEmbedder
+from aesthetic_code.render.thumbnail import (
+    BACKGROUND_COLOR,
+    SHAPE_KIND_COLORS,
+    ThumbnailCompositor,
+)
+from aesthetic_code.storage.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture(scope="module")
+def deck() -> bytes:
+    image = io.BytesIO()
+    PIL.Image.new("RGB", (200, 100), (255, 0, 0)).save(image, "PNG")
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Pt(800), Pt(400)
+    for i in range(3):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_shape(1, Pt(40), Pt(40), Pt(200), Pt(100))
+        textbox = slide.shapes.add_textbox(Pt(400), Pt(40), Pt(300), Pt(100))
+        textbox.text_frame.text = "Title"
+        # The last slide moves its picture
+        top = 200 if i < 2 else 220
+        slide.shapes.add_picture(
+            io.BytesIO(image.getvalue()), Pt(40), Pt(top), Pt(200), Pt(100)
+        )
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def test_render(deck):
+    pytest.importorskip("cv2")
+    prs = open_presentation(deck)
+    compositor = ThumbnailCompositor(prs.slide_width, prs.slide_height, size=80)
+    assert compositor.shape == (40, 80, 3)
+
+    thumbnail = compositor.render(prs.slides[0])
+    assert thumbnail.shape == compositor.shape
+    assert tuple(thumbnail[0, 0]) == BACKGROUND_COLOR
+    assert tuple(thumbnail[7, 10]) == SHAPE_KIND_COLORS["shape"]
+    assert tuple(thumbnail[7, 50]) == SHAPE_KIND_COLORS["text"]
+    assert tuple(thumbnail[25, 10]) == (255, 0, 0)
+
+    # Without the image bytes the picture is a box
+    stripped = open_presentation(deck, skip_media=True)
+    thumbnail = compositor.render(stripped.slides[0])
+    assert tuple(thumbnail[25, 10]) == SHAPE_KIND_COLORS["picture"]
+
+
+def test_render_caches_pictures_by_hash(deck, monkeypatch):
+    pytest.importorskip("cv2")
+    prs = open_presentation(deck)
+    hashes = media_hashes(deck)
+    compositor = ThumbnailCompositor(prs.slide_width, prs.slide_height, size=80)
+    first = compositor.render(prs.slides[0], hashes)
+
+    def unexpected_read(picture):
+        raise AssertionError("Cached picture read again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(thumbnail_module, "picture_blob", unexpected_read)
+        np.testing.assert_array_equal(compositor.render(prs.slides[1], hashes), first)
+
+
+def test_thumbnail_keys(deck, monkeypatch):
+    prs = open_presentation(deck)
+    compositor = ThumbnailCompositor(prs.slide_width, prs.slide_height)
+    keys = [compositor.thumbnail_key(slide) for slide in prs.slides]
+    assert keys[0] == keys[1] != keys[2]
+    hashes = media_hashes(deck)
+
+    def unexpected_read(picture):
+        raise AssertionError("Picture read despite a known hash")
+
+    # With the hashes at hand, no picture is read, for keys or cached thumbnails
+    with monkeypatch.context() as patch:
+        patch.setattr(thumbnail_module, "picture_blob", unexpected_read)
+        assert compositor.thumbnail_key(prs.slides[0], hashes) == keys[0]
+
+    stripped = open_presentation(deck, skip_media=True)
+    assert compositor.thumbnail_key(stripped.slides[0]) != keys[0]
+
+
+def test_embedder_embeds_each_thumbnail_once(deck, tmp_path):
+    pytest.importorskip("cv2")
+    batches = []
+
+    def embed(thumbnails):
+        batches.append(len(thumbnails))
+        return thumbnails.reshape(len(thumbnails), -1, 3).mean(axis=1)
+
+    path = str(tmp_path / "embeddings.sqlite")
+    prs = open_presentation(deck)
+    with EmbeddingCache(path) as cache:
+        embeddings = ThumbnailEmbedder(embed, "mean", cache).embed_presentation(prs)
+        assert len(cache) == 2
+    assert batches == [2]
+    assert embeddings.shape == (3, 3)
+    np.testing.assert_array_equal(embeddings[0], embeddings[1])
+
+    with EmbeddingCache(path) as cache:
+        again = ThumbnailEmbedder(embed, "mean", cache).embed_presentation(prs)
+        assert (cache.hits, cache.misses) == (2, 0)
+    assert batches == [2]
+    np.testing.assert_array_equal(again, embeddings)
+
+
+def test_embedders_do_not_share_embeddings(deck):
+    pytest.importorskip("cv2")
+    prs = open_presentation(deck)
+    with EmbeddingCache() as cache:
+        means = ThumbnailEmbedder(
+            lambda thumbnails: thumbnails.reshape(len(thumbnails), -1, 3).mean(axis=1),
+            "mean",
+            cache,
+        ).embed_presentation(prs)
+        maxima = ThumbnailEmbedder(
+            lambda thumbnails: thumbnails.reshape(len(thumbnails), -1, 3).max(axis=1),
+            "max",
+            cache,
+        ).embed_presentation(prs)
+        assert len(cache) == 4
+    assert not np.array_equal(means, maxima)
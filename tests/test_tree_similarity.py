@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+from pptx import Presentation
+from pptx.util import Inches
+
+from aesthetic_code.segmenter.segmenter import BoxSegmenter, LayoutBox
+from aesthetic_code.segmenter.tree_similarity import (
+    TreeComparator,
+    consistency_scores,
+    deck_similarity_matrix,
+)
+
+WIDTH, HEIGHT = 720.0, 540.0
+
+
+def _tree(boxes):
+    layout_boxes = [
+        LayoutBox(*box, name=f"Shape {i}", shape_id=i, shape_type=1)
+        for i, box in enumerate(boxes)
+    ]
+    return BoxSegmenter(layout_boxes, WIDTH, HEIGHT, "pt").segment()
+
+
+TITLE_AND_TWO_COLUMNS = [[40, 30, 640, 60], [40, 120, 300, 380], [380, 120, 300, 380]]
+TITLE_AND_BODY = [[40, 30, 640, 60], [40, 120, 640, 380]]
+
+
+def test_identical_trees_share_subtrees():
+    comparator = TreeComparator(WIDTH, HEIGHT)
+    root1 = comparator.add(_tree(TITLE_AND_TWO_COLUMNS))
+    size = len(comparator)
+    # Moving a shape by less than the quantization gives the same tree
+    nudged = [[41, 30, 639, 60], *TITLE_AND_TWO_COLUMNS[1:]]
+    root2 = comparator.add(_tree(nudged))
+    assert root1 == root2
+    assert len(comparator) == size
+    assert comparator.similarity(root1, root2) == 1.0
+
+
+def test_similarity_orders_layouts():
+    comparator = TreeComparator(WIDTH, HEIGHT)
+    base = _tree(TITLE_AND_TWO_COLUMNS)
+    shifted = _tree([[40, 30, 640, 60], [40, 130, 300, 370], [380, 130, 300, 370]])
+    different = _tree(TITLE_AND_BODY)
+    unrelated = _tree([[500, 400, 100, 100]])
+
+    close = comparator.compare(base, shifted)
+    far = comparator.compare(base, different)
+    assert 1.0 > close > far > comparator.compare(base, unrelated) >= 0.0
+    assert comparator.compare(shifted, base) == close
+
+
+def _grid_trees(seed: int, count: int = 6) -> list:
+    rng = np.random.default_rng(seed)
+    trees = []
+    for _ in range(count):
+        boxes = [
+            [column * 115 + 10 + rng.normal(0, 3), row * 85 + 10, 90, 60]
+            for row in range(6)
+            for column in range(6)
+            if rng.random() > 0.3
+        ]
+        trees.append(_tree(boxes))
+    return trees
+
+
+def test_large_pairs_are_estimated():
+    trees = _grid_trees(0)
+    exact = TreeComparator(WIDTH, HEIGHT, max_pair_size=10**9)
+    estimated = TreeComparator(WIDTH, HEIGHT, max_pair_size=16)
+    exact_similarities = exact.similarity_matrix(trees)
+    estimated_similarities = estimated.similarity_matrix(trees)
+    assert not np.allclose(estimated_similarities, exact_similarities)
+    assert np.all((estimated_similarities >= 0) & (estimated_similarities <= 1))
+    np.testing.assert_array_equal(estimated_similarities, estimated_similarities.T)
+
+
+def test_similarity_matrix_is_order_independent():
+    trees = _grid_trees(1, count=8)
+    permutation = np.random.default_rng(2).permutation(len(trees))
+    for max_pair_size in (16, 4096):
+        warm = TreeComparator(WIDTH, HEIGHT, max_pair_size=max_pair_size)
+        similarities = warm.similarity_matrix(trees)
+        permuted = [trees[i] for i in permutation]
+        for comparator in (
+            TreeComparator(WIDTH, HEIGHT, max_pair_size=max_pair_size),
+            warm,
+        ):
+            np.testing.assert_array_equal(
+                comparator.similarity_matrix(permuted),
+                similarities[np.ix_(permutation, permutation)],
+            )
+
+
+def test_similarity_matrix_and_consistency():
+    comparator = TreeComparator(WIDTH, HEIGHT)
+    trees = [
+        _tree(TITLE_AND_TWO_COLUMNS),
+        None,
+        _tree(TITLE_AND_TWO_COLUMNS),
+        _tree(TITLE_AND_BODY),
+    ]
+    similarities = comparator.similarity_matrix(trees)
+    assert similarities.shape == (4, 4)
+    assert similarities[0, 2] == similarities[2, 0] == 1.0
+    assert np.isnan(similarities[1]).all() and np.isnan(similarities[:, 1]).all()
+    assert similarities[0, 3] == similarities[3, 0] < 1.0
+
+    scores = consistency_scores(similarities)
+    assert scores[0] == scores[2] == 1.0
+    assert math.isnan(scores[1])
+    assert scores[3] == similarities[0, 3]
+
+
+def test_deck_similarity_matrix():
+    prs = Presentation()
+    for _ in range(2):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_shape(1, Inches(1), Inches(1), Inches(3), Inches(2))
+        slide.shapes.add_shape(1, Inches(5), Inches(1), Inches(3), Inches(2))
+    prs.slides.add_slide(prs.slide_layouts[6])
+
+    similarities = deck_similarity_matrix(prs)
+    assert similarities[0, 1] == 1.0
+    assert np.isnan(similarities[2, 2])
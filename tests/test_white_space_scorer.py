@@ -1,8 +1,13 @@
+import numpy as np
 import pytest
 from pptx import Presentation
 from pptx.util import Inches
 
-from aesthetic_code.scorer.white_space_scorer import MarginWhiteSpaceScorer
+from aesthetic_code.scorer.free_space import maximal_empty_rectangles
+from aesthetic_code.scorer.white_space_scorer import (
+    InnerWhiteSpaceScorer,
+    MarginWhiteSpaceScorer,
+)
 
 
 @pytest.fixture
@@ -74,3 +79,63 @@ def test_white_space_score(scorer):
     assert score == pytest.approx(
         expected_score, 0.1
     ), f"Expected whitespace score around {expected_score}, got {score}"
+
+
+def test_maximal_empty_rectangles_around_centred_box():
+    rectangles = maximal_empty_rectangles(np.array([[40, 40, 60, 60]]), 100, 100)
+    assert sorted(rectangles.tolist()) == [
+        [0, 0, 40, 100],
+        [0, 0, 100, 40],
+        [0, 60, 100, 100],
+        [60, 0, 100, 100],
+    ]
+
+
+def test_maximal_empty_rectangles_are_maximal():
+    # Two boxes sharing a top edge: the strip above them spans the whole gap
+    boxes = np.array([[10, 12, 16, 19], [5, 12, 8, 17], [15, 7, 20, 12]])
+    rectangles = maximal_empty_rectangles(boxes, 20, 20).tolist()
+    assert [0, 0, 15, 12] in rectangles
+    assert [0, 0, 10, 12] not in rectangles
+    for left, top, right, bottom in rectangles:
+        overlaps = (
+            (boxes[:, 0] < right)
+            & (boxes[:, 2] > left)
+            & (boxes[:, 1] < bottom)
+            & (boxes[:, 3] > top)
+        )
+        assert not overlaps.any()
+
+
+def test_maximal_empty_rectangles_min_size():
+    boxes = np.array([[0, 0, 98, 100]])
+    assert maximal_empty_rectangles(boxes, 100, 100).tolist() == [[98, 0, 100, 100]]
+    assert len(maximal_empty_rectangles(boxes, 100, 100, min_size=5)) == 0
+
+
+def test_inner_white_space_scores(mock_slide):
+    scorer = InnerWhiteSpaceScorer(
+        mock_slide, Inches(10), Inches(7.5), measurement_unit="inches"
+    )
+    assert 0.0 <= scorer.balance_score() <= 1.0
+    assert 0.0 <= scorer.distribution_score() <= 1.0
+    assert 0.0 <= scorer.calculate_white_space_score() <= 1.0
+    assert 0.0 < scorer.largest_empty_fraction() < 1.0
+
+
+def test_inner_white_space_balance_prefers_centred_content():
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    centred = prs.slides.add_slide(layout)
+    centred.shapes.add_shape(1, Inches(3), Inches(2), Inches(4), Inches(3.5))
+    corner = prs.slides.add_slide(layout)
+    corner.shapes.add_shape(1, Inches(0), Inches(0), Inches(4), Inches(3.5))
+
+    def scorer(slide):
+        return InnerWhiteSpaceScorer(slide, prs.slide_width, prs.slide_height)
+
+    assert scorer(centred).balance_score() == pytest.approx(1.0, abs=0.02)
+    assert scorer(corner).balance_score() < scorer(centred).balance_score()
+    assert scorer(corner).distribution_score() < scorer(centred).distribution_score()
+    # The 6x7.5 inch column right of the corner shape is the largest free area
+    assert scorer(corner).largest_empty_fraction() == pytest.approx(45 / 75)
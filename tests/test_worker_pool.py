@@ -0,0 +1,40 @@
+import io
+
+from pptx import Presentation
+
+from aesthetic_code.scorer.config import ScoringConfig
+from aesthetic_code.scorer.slide_scorer import PowerPointScorer
+from aesthetic_code.service.worker_pool import WarmWorkerPool, score_deck_isolated
+from aesthetic_code.storage.score_index import ScoreIndex
+
+
+def test_warm_worker_pool(deck, tmp_path):
+    path = tmp_path / "deck.pptx"
+    path.write_bytes(deck)
+    expected = PowerPointScorer(Presentation(io.BytesIO(deck))).score_all()
+
+    # One task per worker, so the later decks run on recycled workers
+    with WarmWorkerPool(processes=2, max_tasks_per_child=1) as pool:
+        assert pool.map([deck, str(path), deck]) == [expected] * 3
+        assert pool.submit(deck, [2, 0]).get(timeout=30) == [
+            expected[2],
+            expected[0],
+        ]
+        assert list(pool.imap_unordered([deck])) == [expected]
+
+        with ScoreIndex(str(tmp_path / "scores.sqlite")) as index:
+            assert pool.index_decks([("a", deck), ("b", str(path))], index) == 2
+            assert len(index) == 6
+
+
+def test_warm_worker_pool_config(deck):
+    config = ScoringConfig(margin_threshold=(0.0, 0.1), size_thresholds=(0.9, 1.1))
+    prs = Presentation(io.BytesIO(deck))
+    expected = PowerPointScorer(prs, config=config).score_all()
+    assert expected != PowerPointScorer(prs).score_all()
+    with WarmWorkerPool(processes=1, config=config) as pool:
+        assert pool.map([deck]) == [expected]
+        assert list(pool.imap_unordered([deck])) == [expected]
+
+    isolated = PowerPointScorer(prs, isolate_errors=True, config=config).score_all()
+    assert score_deck_isolated(deck, config=config)["results"] == isolated